@@ -0,0 +1,98 @@
+"""
+Time of custom_table_to_df on an ISM-sized report table (dual header, merged cells), against a per-cell implementation that
+converts every cell with float() in a Python loop, as custom_table_to_df did before the vectorized conversion.
+
+    uv run python benchmarks/custom_table_to_df.py
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+from bs4.element import ResultSet
+
+from lisa.scrapers.utils import custom_table_to_df
+
+N_RUNS = 300
+ROWS = (
+    "PMI*",
+    "New Orders",
+    "Production",
+    "Employment",
+    "Supplier Deliveries",
+    "Inventories",
+    "Customers' Inventories*",
+    "Prices",
+    "Backlog of Orders",
+    "New Export Orders",
+    "Imports",
+)
+
+
+def _report_table() -> ResultSet:
+    head = (
+        '<tr><th rowspan="1">Index</th><th colspan="5">Manufacturing PMI</th><th></th></tr>'
+        "<tr><th>Index</th><th>Series Index Sep</th><th>Series Index Aug</th><th>Percentage Point Change</th>"
+        "<th>Direction</th><th>Rate of Change</th><th>Trend* (Months)</th></tr>"
+    )
+    body = "".join(
+        f"<tr><td>{row}</td><td>{48 + i / 10}</td><td>{47 + i / 10}</td><td>+{i / 10}</td>"
+        f"<td>Growing</td><td>Faster</td><td>{i + 1}</td></tr>"
+        for i, row in enumerate(ROWS)
+    )
+    body += '<tr><td colspan="3">OVERALL ECONOMY</td><td></td><td>Growing</td><td>Slower</td><td>65</td></tr>'
+    body += '<tr><td colspan="3">Manufacturing Sector</td><td></td><td>Contracting</td><td>Faster</td><td>7</td></tr>'
+    return BeautifulSoup(f"<table>{head}{body}</table>", "html.parser").find_all("table")
+
+
+def _per_cell_table_to_df(table_list: ResultSet) -> pd.DataFrame:
+    table = table_list[0]
+    rows = table.find_all("tr")
+    num_headers = 2 if any(cell.has_attr("colspan") for cell in rows[0].find_all(["th", "td"])) else 1
+
+    multi_index_arrays = []
+    for row in rows[:num_headers]:
+        header = []
+        for cell in row.find_all(["th", "td"]):
+            header += [cell.get_text(strip=True).replace("*", "")] * int(cell.get("colspan", 1))
+        multi_index_arrays.append(header)
+
+    table_data = []
+    for row in rows[num_headers:]:
+        cells = row.find_all(["th", "td"])
+        row_data = (
+            [cells[0].get_text(strip=True)]
+            + [None] * (int(cells[0].get("colspan", 1)) - 1)
+            + [cell.get_text(strip=True) for cell in cells[1:]]
+        )
+        row_data = [cell.replace("*", "") if cell else "" for cell in row_data]
+        for i, value in enumerate(row_data):
+            try:
+                row_data[i] = float(value)
+            except ValueError:
+                pass
+        table_data.append(row_data)
+
+    df = pd.DataFrame(table_data)
+    df.columns = pd.MultiIndex.from_arrays(multi_index_arrays)
+    df = df.set_index(df.columns[0])
+    df.index.name = df.index.name[-1]
+    return df.fillna("")
+
+
+def main() -> None:
+    tables = _report_table()
+    per_cell, vectorized = _per_cell_table_to_df(tables), custom_table_to_df(tables)
+    same_values = all(
+        a == b or (a == "" and (b is None or (isinstance(b, float) and np.isnan(b))))
+        for a, b in zip(per_cell.to_numpy().ravel(), vectorized.to_numpy().ravel())
+    )
+    print(f"table: {vectorized.shape}, same values (empty cells as NaN/None): {same_values}")
+    for name, func in (("per cell", _per_cell_table_to_df), ("vectorized", custom_table_to_df)):
+        seconds = timeit.timeit(lambda: func(tables), number=N_RUNS) / N_RUNS
+        print(f"{name}: {seconds * 1e3:.3f} ms per table")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Memory of a Finviz screener table of synthetic values in the dtypes of Finviz._process_df, and of its compact_table()
+copies in float64 and float32.
+
+    uv run python benchmarks/finviz_compact_table.py
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from lisa.scrapers.finviz import Finviz, FinvizScreener
+
+N_ROWS = 10_000
+N_METRICS = 85
+N_RUNS = 3
+
+
+def _raw_table(rng: np.random.Generator) -> pd.DataFrame:
+    raw = {
+        "Ticker": [f"T{i}" for i in range(N_ROWS)],
+        "Company": [f"Company {i} Inc" for i in range(N_ROWS)],
+        "Sector": rng.choice(["Technology", "Healthcare", "Energy"], N_ROWS),
+        "Industry": rng.choice([f"Industry {i}" for i in range(140)], N_ROWS),
+        "Country": rng.choice(["USA", "China", "UK"], N_ROWS),
+        "Exchange": rng.choice(["NASD", "NYSE"], N_ROWS),
+        "Index": rng.choice(["-", "S&P 500"], N_ROWS),
+        "Optionable": rng.choice(["Yes", "No"], N_ROWS),
+        "Shortable": rng.choice(["Yes", "No"], N_ROWS),
+        "Market Cap": [f"{x:.2f}B" for x in rng.random(N_ROWS) * 100],
+        "Volume": [str(x) for x in rng.integers(1, 10**7, N_ROWS)],
+        "Earnings": rng.choice(["Oct 21", "Oct 22", "Nov 03"], N_ROWS),
+    }
+    for i in range(N_METRICS):
+        raw[f"Metric {i}"] = [f"{x:.2f}" if x > 0.05 else "-" for x in rng.random(N_ROWS)]
+    return pd.DataFrame(raw)
+
+
+def _megabytes(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def main() -> None:
+    screener = FinvizScreener(Finviz._process_df(_raw_table(np.random.default_rng(0))))
+    print(f"table: {screener.table.shape}, {_megabytes(screener.table):.1f} MiB")
+    for float_dtype in ("float64", "float32"):
+        compact = screener.compact_table(float_dtype)
+        seconds = timeit.timeit(lambda: screener.compact_table(float_dtype), number=N_RUNS) / N_RUNS
+        print(f"compact_table({float_dtype}): {_megabytes(compact):.1f} MiB, built in {seconds * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Time spent compiling the upsert statement over repeated Finviz_Stocks-sized loads, with the statement cache of DBConnection
+in use and with it cleared before every load. Runs against a temporary database.
+
+    uv run python benchmarks/upsert_statement_cache.py
+"""
+
+import cProfile
+import pstats
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import sqlalchemy as db
+
+import lisa.common.db_connection as db_connection
+from lisa.common import DBConnection
+from lisa.database_model import Finviz_Stocks, GICS_Industries, GICS_Sectors
+
+N_ROWS = 2_000
+N_LOADS = 20
+
+
+def _rows(rng: np.random.Generator) -> list[dict]:
+    rows = []
+    for i in range(N_ROWS):
+        row = {}
+        for column in Finviz_Stocks.__table__.columns:
+            if column.name == "ticker":
+                row[column.name] = f"T{i:05d}"
+            elif column.type.python_type is float:
+                row[column.name] = float(rng.normal())
+            elif column.type.python_type is int:
+                row[column.name] = int(rng.integers(0, 100))
+            else:
+                row[column.name] = "text"
+        rows.append(row)
+    return rows
+
+
+def _compile_time(rows: list[dict], cached: bool) -> float:
+    profile = cProfile.Profile()
+    for _ in range(N_LOADS):
+        if not cached:
+            DBConnection._upsert_statements.clear()
+        profile.enable()
+        with DBConnection() as conn:
+            conn.upsert_rows(Finviz_Stocks.name(), rows)
+        profile.disable()
+    return sum(
+        stats[3]
+        for (path, _, name), stats in pstats.Stats(profile).stats.items()
+        if name == "compile" and "sqlalchemy" in path
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        db_connection.ENGINE = db.create_engine(f"sqlite:///{Path(directory) / 'benchmark.db'}")
+        metadata = db.MetaData()  # the models have a declarative base each; the foreign keys resolve in one metadata
+        for model in (GICS_Sectors, GICS_Industries, Finviz_Stocks):
+            model.__table__.to_metadata(metadata)
+        metadata.create_all(db_connection.ENGINE)
+        rows = _rows(np.random.default_rng(0))
+        for cached in (False, True):
+            compile_time = _compile_time(rows, cached)
+            print(
+                f"statement cache {'on' if cached else 'off'}: {compile_time / N_LOADS * 1e3:.2f} ms compiling per load"
+            )
+        db_connection.ENGINE.dispose()
+
+
+if __name__ == "__main__":
+    main()
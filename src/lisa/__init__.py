@@ -1,4 +1,23 @@
-from .common import DBConnection, TemplateLogger, WebSession
+from .analysis import (
+    Component,
+    CompositeIndex,
+    IndicatorPanel,
+    LeadLagEngine,
+    SectorRotation,
+    StockFactors,
+    StockScreener,
+    TimeSeriesStore,
+)
+from .common import (
+    ArrowMirror,
+    DBConnection,
+    DuckDBBackend,
+    Metrics,
+    ReadCache,
+    SearchIndex,
+    TemplateLogger,
+    WebSession,
+)
 from .scrapers import (
     CaixinPmi,
     ConstructionSurvey,
@@ -8,6 +27,7 @@ from .scrapers import (
     FinvizIndustries,
     FinvizScreener,
     IsmReport,
+    ReleaseScheduler,
     TradingEconomics,
 )
 from .utils import MarkDownDisplay, logs_to_df
@@ -0,0 +1,7 @@
+from .composite import Component, CompositeIndex
+from .factors import StockFactors
+from .indicators import IndicatorPanel
+from .lead_lag import LeadLagEngine
+from .screener import StockScreener
+from .sector_rotation import SectorRotation
+from .timeseries import TimeSeriesStore
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as db
+
+from lisa.common import DBConnection, TemplateLogger
+from lisa.database_model import Composite_Index
+
+from .indicators import PANEL_TABLES, REVISION_MONTHS, TRANSFORMS, IndicatorPanel, month_number
+
+DEFAULT_INDEX_NAME = "LISA Leading Index"
+DEFAULT_MIN_COVERAGE = 0.5
+
+logger = TemplateLogger(__name__).logger
+
+
+@dataclass(frozen=True)
+class Component:
+    """
+    One input of a composite index.
+
+    Attributes:
+        column: str
+        Panel column, as "<table>.<column>".
+
+        weight: float
+        Relative weight; weights are renormalised over the components available in each month.
+
+        lag: int
+        Months by which the component is shifted forward (a component leading by n months enters with lag n).
+
+        transform: str
+        "level", "mom" or "yoy"; applied before standardising, e.g. to turn trending counts into growth rates.
+
+        invert: bool
+        Whether a rise in the component is bearish, in which case its sign is flipped.
+    """
+
+    column: str
+    weight: float = 1.0
+    lag: int = 0
+    transform: str = "level"
+    invert: bool = False
+
+    def __post_init__(self) -> None:
+        if self.transform not in TRANSFORMS:
+            raise ValueError(f"Component transform must be one of {TRANSFORMS}; received: {self.transform}.")
+        if self.lag < 0 or self.weight <= 0:
+            raise ValueError(f"Component lag must be non-negative and weight positive; received: {self}.")
+
+    @property
+    def table(self) -> str:
+        return self.column.split(".", 1)[0]
+
+
+DEFAULT_COMPONENTS = (
+    Component("US_Man_Pmi_Report.new_orders_index_value"),
+    Component("US_Consumers.expectations_index"),
+    Component("US_Buildings.permits", transform="yoy"),
+    Component("Caixin_PMI.manufacturing_pmi"),
+    Component("EU_Economic_Sentiment.EU_esi"),
+)
+
+
+class CompositeIndex:
+    """
+    Class for computing a composite leading index from standardised, weighted and lagged monthly indicators, and persisting it
+    to the Composite_Index table (one series per index name) for fast reads.
+
+    Components are standardised with expanding z-scores, so a month's value only depends on data up to that month. The panel
+    keeps the z-scores and updates them from the earliest changed month on refresh, so update() only combines and upserts the
+    months from the earliest changed input onwards; the stored history is otherwise left untouched. After changing the
+    components or weights of an existing index, run update(full=True) or use a new index name.
+    The stored index is not updated by loads: call update() after loading its input tables (a long-lived instance refreshes
+    its panel incrementally; a new one re-reads the inputs and rewrites the revision window of the stored index).
+
+    Methods:
+        compute: Returns the index (value and weight coverage) from a given month onwards.
+        update: Refreshes the inputs and persists the months that changed.
+        read: Returns a stored index series.
+    """
+
+    def __init__(
+        self,
+        index_name: str = DEFAULT_INDEX_NAME,
+        components: tuple[Component] = DEFAULT_COMPONENTS,
+        min_coverage: float = DEFAULT_MIN_COVERAGE,
+    ) -> None:
+        tables = {t.name(): t for t in PANEL_TABLES}
+        unknown_tables = {c.table for c in components} - tables.keys()
+        if unknown_tables:
+            raise ValueError(
+                f"Component tables must be panel tables: {sorted(tables)}.\nReceived:\n{sorted(unknown_tables)}"
+            )
+
+        self._index_name = index_name
+        self._components = tuple(components)
+        self._min_coverage = min_coverage
+        self._tables = tuple(t for name, t in tables.items() if name in {c.table for c in components})
+        self._panel: IndicatorPanel | None = None
+
+    @property
+    def panel(self) -> IndicatorPanel:
+        if self._panel is None:
+            self._panel = IndicatorPanel(self._tables)
+        return self._panel
+
+    def compute(self, start: pd.Period | None = None) -> pd.DataFrame:
+        """Returns the index value and weight coverage of the months from start onwards (all months by default)."""
+        scores = {t: self.panel.zscore(t) for t in {c.transform for c in self._components}}
+        index = self.panel.panel.index
+        first = 0 if start is None else int(index.searchsorted(start))
+
+        # Shift each component forward by its lag (row t takes the score from row t - lag)
+        rows = np.arange(first, len(index))[:, None] - np.array([c.lag for c in self._components])[None, :]
+        lagged = np.column_stack(
+            [
+                np.where(
+                    rows[:, i] >= 0, scores[c.transform][c.column].to_numpy()[np.clip(rows[:, i], 0, None)], np.nan
+                )
+                * (-1 if c.invert else 1)
+                for i, c in enumerate(self._components)
+            ]
+        )
+
+        weights = np.array([c.weight for c in self._components])
+        available = ~np.isnan(lagged)
+        coverage = (available * weights).sum(axis=1) / weights.sum()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            value = np.where(available, lagged, 0.0) @ weights / (available * weights).sum(axis=1)
+
+        df = pd.DataFrame(
+            {"value": np.where(coverage >= self._min_coverage, value, np.nan), "coverage": coverage},
+            index=index[first:],
+        )
+        return df.dropna(subset="value")
+
+    def update(self, full: bool = False) -> pd.DataFrame:
+        """
+        Refreshes the component panel and upserts the index months that changed (or all months if full is True).
+
+        Returns:
+            df: pd.DataFrame
+            The upserted rows.
+        """
+        if full:
+            self._panel = None
+            start = None
+        else:
+            changed = self._panel.refresh() if self._panel is not None else None
+            stored_end = self._stored_end()
+            if stored_end is None:
+                start = None
+            elif changed is None and stored_end >= self.panel.panel.index[-1]:
+                return pd.DataFrame(columns=Composite_Index.columns())
+            else:
+                # Whatever the panel state, months after the stored end (or within its revision window) are written
+                start = stored_end - (REVISION_MONTHS - 1)
+                if changed is not None:
+                    start = min(start, changed)
+
+        df = self.compute(start)
+        rows = pd.DataFrame(
+            {
+                "index_name": self._index_name,
+                "year": df.index.year,
+                "month": df.index.month,
+                "value": df["value"].to_numpy(),
+                "coverage": df["coverage"].to_numpy(),
+            }
+        )
+        if rows.empty:
+            return rows
+
+        with DBConnection() as conn:
+            conn.ensure_table(Composite_Index)
+            conn.upsert_rows(Composite_Index.name(), rows.to_dict(orient="records"))
+        return rows
+
+    @staticmethod
+    def read(index_name: str = DEFAULT_INDEX_NAME) -> pd.DataFrame:
+        """Returns a stored index series as a DataFrame indexed by month."""
+        stmt = (
+            db.select(Composite_Index.year, Composite_Index.month, Composite_Index.value, Composite_Index.coverage)
+            .where(Composite_Index.index_name == index_name)
+            .order_by(Composite_Index.year, Composite_Index.month)
+        )
+        with DBConnection() as conn:
+            df = pd.read_sql(stmt, conn._connection)
+        df.index = pd.PeriodIndex.from_fields(year=df.pop("year"), month=df.pop("month"), freq="M")
+        return df
+
+    def _stored_end(self) -> pd.Period | None:
+        """Returns the latest stored month of the index; None if nothing is stored yet."""
+        with DBConnection() as conn:
+            if not db.inspect(conn._connection).has_table(Composite_Index.name()):
+                return None
+            last = conn._connection.execute(
+                db.select(db.func.max(month_number(Composite_Index.year, Composite_Index.month))).where(
+                    Composite_Index.index_name == self._index_name
+                )
+            ).scalar()
+        if last is None:
+            return None
+        return pd.Period(year=last // 12, month=last % 12 + 1, freq="M")
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as db
+
+from lisa.common import DBConnection, TemplateLogger
+from lisa.database_model import Finviz_Stocks, Stock_Factors
+
+PEER_GROUPS = MappingProxyType({"sector": "gics_sector_id", "industry": "gics_industry_id"})
+WINSOR_LIMIT = 0.025  # share of each peer group clipped at either tail before computing z-scores
+COMPOSITE = "composite"
+
+# Factor: (metric, sign) pairs; the factor score is the mean of the available signed z-scores
+FACTORS = MappingProxyType(
+    {
+        "value": (
+            ("p_e", -1),
+            ("fwd_p_e", -1),
+            ("peg", -1),
+            ("p_s", -1),
+            ("p_b", -1),
+            ("p_fcf", -1),
+            ("dividend_pct", 1),
+        ),
+        "quality": (
+            ("roa_pct", 1),
+            ("roe_pct", 1),
+            ("roic_pct", 1),
+            ("gross_m_pct", 1),
+            ("oper_m_pct", 1),
+            ("profit_m_pct", 1),
+            ("debt_eq", -1),
+        ),
+        "growth": (
+            ("eps_this_y_pct", 1),
+            ("eps_next_y_pct", 1),
+            ("eps_next_5y_pct", 1),
+            ("sales_past_5y_pct", 1),
+            ("sales_q_q_pct", 1),
+            ("eps_q_q_pct", 1),
+        ),
+        "momentum": (("perf_quart_pct", 1), ("perf_half_pct", 1), ("perf_year_pct", 1)),
+    }
+)
+
+logger = TemplateLogger(__name__).logger
+
+
+def factor_metrics() -> list[str]:
+    """Returns the numeric Finviz_Stocks columns scored by StockFactors (all numeric columns other than the GICS ids)."""
+    return [
+        str(c.name)  # plain strings: names such as 50d_high_pct are quoted_name instances
+        for c in Finviz_Stocks.__table__.columns
+        if c.type.python_type in (int, float) and c.name not in PEER_GROUPS.values()
+    ]
+
+
+class StockFactors:
+    """
+    Class for cross-sectional factor scores of the Finviz stock universe, relative to sector and industry peers.
+    For every numeric metric and peer group, all tickers are ranked in one pass: a single sort of (peer group, value) keys per
+    metric column gives percentile ranks (ties averaged) and the winsorisation bounds, and scatter-adds give the peer means and
+    standard deviations of the winsorised values. Factor scores (value, quality, growth, momentum) average the signed z-scores
+    of their metrics; the composite averages the factor scores. Results are stored in Stock_Factors in long form.
+    Scores are not refreshed by Finviz loads: call refresh() after loading Finviz_Stocks.
+
+    Methods:
+        compute: Returns percentile ranks and z-scores for one peer group.
+        refresh: Recomputes all peer groups and writes the stored results that changed.
+        read: Returns stored results as a wide table (ticker x metric) of percentile ranks or z-scores.
+    """
+
+    def __init__(self, winsor_limit: float = WINSOR_LIMIT) -> None:
+        if not 0 <= winsor_limit < 0.5:
+            raise ValueError(f"Winsor limit must be in [0, 0.5); received: {winsor_limit}.")
+        self._winsor_limit = winsor_limit
+
+    def compute(self, stocks: pd.DataFrame, peer_group: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Args:
+            stocks: pd.DataFrame
+            Finviz_Stocks rows (database column names), e.g. from DBConnection.df_from_sql.
+
+            peer_group: str
+            "sector" or "industry".
+
+        Returns:
+            pct_rank: pd.DataFrame
+            Percentile rank (0-100) of each ticker (rows) within its peer group, per metric and factor (columns).
+
+            zscore: pd.DataFrame
+            Winsorised z-score per metric, and score per factor, with the same layout.
+        """
+        if peer_group not in PEER_GROUPS:
+            raise ValueError(f"Peer group must be one of {list(PEER_GROUPS)}; received: {peer_group}.")
+
+        metrics = factor_metrics()
+        groups, _ = pd.factorize(stocks[PEER_GROUPS[peer_group]], use_na_sentinel=True)
+        values = stocks[metrics].to_numpy(dtype="float64", na_value=np.nan)
+        values[groups < 0] = np.nan
+        groups = np.maximum(groups, 0)
+        pct, z = _peer_scores(values, groups, self._winsor_limit)
+
+        signed = {m: z[:, metrics.index(m)] * sign for f in FACTORS.values() for m, sign in f}
+        scores = np.column_stack([_nanmean_rows(np.column_stack([signed[m] for m, _ in FACTORS[f]])) for f in FACTORS])
+        scores = np.column_stack([scores, _nanmean_rows(scores)])
+        score_pct, _ = _peer_scores(scores, groups, 0.0)
+
+        columns = [*metrics, *FACTORS, COMPOSITE]
+        index = pd.Index(stocks["ticker"], name="ticker")
+        return (
+            pd.DataFrame(np.hstack([pct, score_pct]), index=index, columns=columns),
+            pd.DataFrame(np.hstack([z, scores]), index=index, columns=columns),
+        )
+
+    def refresh(self) -> int:
+        """
+        Recomputes all peer groups and writes the results that differ from the stored ones: new and changed rows are upserted,
+        rows of tickers or metrics no longer scored are deleted. Returns the number of rows written or deleted.
+        """
+        keys = ["ticker", "peer_group", "metric"]
+        with DBConnection() as conn:
+            conn.ensure_table(Stock_Factors)
+            result = conn._connection.execute(db.select(Finviz_Stocks))
+            stocks = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+            frames = []
+            for peer_group in PEER_GROUPS if len(stocks) else ():
+                pct, z = self.compute(stocks, peer_group)
+                frames.append(
+                    pd.DataFrame(
+                        {
+                            "ticker": np.repeat(pct.index.to_numpy(dtype=object), pct.shape[1]),
+                            "peer_group": peer_group,
+                            "metric": np.tile(pct.columns.to_numpy(dtype=object), pct.shape[0]),
+                            "pct_rank": pct.to_numpy().ravel(),
+                            "zscore": z.to_numpy().ravel(),
+                        }
+                    ).dropna(subset=["pct_rank", "zscore"], how="all")
+                )
+            computed = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=Stock_Factors.columns())
+            stored = pd.read_sql(db.select(Stock_Factors), conn._connection)
+
+            merged = computed.merge(stored, on=keys, how="outer", suffixes=("", "_stored"), indicator=True)
+            both = merged["_merge"] == "both"
+            same = _same(merged["pct_rank"], merged["pct_rank_stored"]) & _same(
+                merged["zscore"], merged["zscore_stored"]
+            )
+            changed = (merged["_merge"] == "left_only") | (both & ~same)
+            upserts = merged.loc[changed, Stock_Factors.columns()].astype(object)
+            upserts = upserts.where(upserts.notna(), None)
+            deletes = merged.loc[merged["_merge"] == "right_only", keys]
+
+            if not upserts.empty:
+                conn.upsert_rows(Stock_Factors.name(), upserts.to_dict(orient="records"), staging=True)
+            if not deletes.empty:
+                conn.delete_rows(Stock_Factors.name(), deletes.to_dict(orient="records"))
+
+        logger.info(f"Refreshed {Stock_Factors.name()}: {len(upserts)} rows written, {len(deletes)} rows deleted.")
+        return len(upserts) + len(deletes)
+
+    @staticmethod
+    def read(peer_group: str = "sector", stat: str = "pct_rank", metrics: list[str] | None = None) -> pd.DataFrame:
+        """
+        Args:
+            peer_group: str
+            "sector" or "industry".
+
+            stat: str
+            "pct_rank" or "zscore".
+
+            metrics: list[str] | None
+            Metrics and/or factors to return; all by default.
+
+        Returns:
+            df: pd.DataFrame
+            Stored results, one row per ticker and one column per metric.
+        """
+        if stat not in ("pct_rank", "zscore"):
+            raise ValueError(f"Stat must be 'pct_rank' or 'zscore'; received: {stat}.")
+        stmt = db.select(Stock_Factors.ticker, Stock_Factors.metric, getattr(Stock_Factors, stat)).where(
+            Stock_Factors.peer_group == peer_group
+        )
+        if metrics:
+            stmt = stmt.where(Stock_Factors.metric.in_(metrics))
+        with DBConnection() as conn:
+            df = pd.read_sql(stmt, conn._connection)
+        return df.pivot(index="ticker", columns="metric", values=stat)
+
+
+def _same(values: pd.Series, stored: pd.Series) -> pd.Series:
+    return (values == stored) | (values.isna() & stored.isna())
+
+
+def _nanmean_rows(values: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(valid, values, 0.0).sum(axis=1) / valid.sum(axis=1)
+
+
+def _peer_scores(values: np.ndarray, groups: np.ndarray, winsor_limit: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Percentile ranks (0-100, ties averaged) and winsorised z-scores of every column of values within peer groups.
+    Missing values stay missing and are excluded from the peer statistics.
+    """
+    n_rows, n_cols = values.shape
+    n_groups = int(groups.max()) + 1 if n_rows else 0
+    positions = np.arange(n_rows)[:, None]
+    valid = ~np.isnan(values)
+
+    # Tie-aware global rank keys (equal values share the position of the first of them); missing values get the largest key
+    order = np.argsort(values, axis=0, kind="stable")
+    sorted_values = np.take_along_axis(values, order, axis=0)
+    run_start = np.maximum.accumulate(np.where(_run_starts(sorted_values), positions, 0), axis=0)
+    keys = np.empty_like(order)
+    np.put_along_axis(keys, order, run_start, axis=0)
+    keys[~valid] = n_rows
+
+    # One sort by (peer group, key) per column; peer groups form contiguous blocks of equal size in every column
+    peer_keys = groups[:, None].astype("int64") * (n_rows + 1) + keys
+    order = np.argsort(peer_keys, axis=0, kind="stable")
+    sorted_keys = np.take_along_axis(peer_keys, order, axis=0)
+    sorted_values = np.take_along_axis(values, order, axis=0)
+    sorted_groups = groups[order]
+
+    starts = _run_starts(sorted_keys)
+    first = np.maximum.accumulate(np.where(starts, positions, 0), axis=0)
+    ends = np.vstack([starts[1:], np.ones((1, n_cols), dtype=bool)])
+    last = np.minimum.accumulate(np.where(ends, positions, n_rows)[::-1], axis=0)[::-1]
+
+    group_start = np.concatenate([[0], np.cumsum(np.bincount(groups, minlength=n_groups))[:-1]])
+    count = np.zeros((n_groups, n_cols))
+    np.add.at(count, groups, valid)
+    columns = np.arange(n_cols)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rank = (first + last) / 2 - group_start[sorted_groups] + 1
+        sorted_pct = 100 * rank / count[sorted_groups, columns]
+    pct = np.empty_like(values)
+    np.put_along_axis(pct, order, sorted_pct, axis=0)
+    pct[~valid] = np.nan
+
+    # Winsorisation bounds: the values at the lower and upper limit quantiles of each peer group
+    low_pos = group_start[:, None] + np.floor(winsor_limit * (count - 1)).clip(0)
+    high_pos = group_start[:, None] + np.ceil((1 - winsor_limit) * (count - 1)).clip(0)
+    low = sorted_values[low_pos.astype("int64").clip(0, max(n_rows - 1, 0)), columns]
+    high = sorted_values[high_pos.astype("int64").clip(0, max(n_rows - 1, 0)), columns]
+    clipped = np.clip(values, low[groups], high[groups])
+
+    filled = np.where(valid, clipped, 0.0)
+    total, total_sq = np.zeros((n_groups, n_cols)), np.zeros((n_groups, n_cols))
+    np.add.at(total, groups, filled)
+    np.add.at(total_sq, groups, filled**2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        std = np.sqrt((total_sq - count * mean**2).clip(0) / (count - 1))
+        z = (clipped - mean[groups]) / std[groups]
+    z[~valid | ~np.isfinite(z)] = np.nan
+    return pct, z
+
+
+def _run_starts(sorted_values: np.ndarray) -> np.ndarray:
+    """Flags the first row of every run of equal values in each column of a sorted array."""
+    starts = np.ones(sorted_values.shape, dtype=bool)
+    starts[1:] = sorted_values[1:] != sorted_values[:-1]
+    return starts
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import date
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as db
+
+from lisa.common import DBConnection, Metrics, TemplateLogger
+from lisa.common.read_cache import table_version
+from lisa.database_model import (
+    Caixin_PMI,
+    EU_Economic_Sentiment,
+    US_Buildings,
+    US_Consumers,
+    US_Man_Pmi_Report,
+    US_Ser_Pmi_Report,
+)
+
+PANEL_TABLES = (US_Consumers, US_Buildings, Caixin_PMI, EU_Economic_Sentiment, US_Man_Pmi_Report, US_Ser_Pmi_Report)
+TRANSFORMS = ("level", "mom", "yoy")  # series transformations offered by the analytics built on the panel
+REVISION_MONTHS = 3  # trailing months re-read on refresh, to pick up revisions of recently published values
+
+MonthLike = pd.Period | date | str | tuple[int, int]
+
+logger = TemplateLogger(__name__).logger
+
+
+def month_number(year: Any, month: Any) -> Any:
+    """Converts years and months (scalars or arrays) to a running month number (year * 12 + month - 1)."""
+    return year * 12 + month - 1
+
+
+def to_month(value: MonthLike) -> pd.Period:
+    """Converts a (year, month) tuple, date, timestamp, period or string such as "2020-01" to a monthly period."""
+    if isinstance(value, tuple):
+        return pd.Period(year=value[0], month=value[1], freq="M")
+    return pd.Period(value, freq="M")
+
+
+def month_range_clause(table: type, start: MonthLike | None = None, end: MonthLike | None = None) -> list[Any]:
+    """
+    Returns WHERE clauses limiting a monthly table to the months from start to end (inclusive; either may be None).
+    Year and month are compared as a row value, which SQLite answers from the (year, month) primary key index; an expression
+    such as year * 12 + month can only be evaluated row by row.
+    """
+    clauses = []
+    if start is not None:
+        start = to_month(start)
+        clauses.append(db.tuple_(table.year, table.month) >= (start.year, start.month))
+    if end is not None:
+        end = to_month(end)
+        clauses.append(db.tuple_(table.year, table.month) <= (end.year, end.month))
+    return clauses
+
+
+def numeric_columns(table: type) -> list[str]:
+    """Returns the non-key numeric column names of a table model."""
+    return [c.name for c in table.__table__.columns if not c.primary_key and c.type.python_type in (int, float)]
+
+
+class IndicatorPanel:
+    """
+    A class to represent the stored monthly indicator series as one aligned panel, with vectorized analytics across all series.
+    Rows are consecutive months (a PeriodIndex without gaps); columns are "<table>.<column>" for every numeric column of the
+    source tables. All statistics are causal (each month only uses data up to that month) so that they can be cached and
+    updated incrementally: refresh() re-reads only what may have changed and recomputes cached statistics from the earliest
+    changed month onwards.
+    A table is read again when its version (see Table_Versions) or its row count, first or last month, or sum of month numbers
+    has changed. If the only new months come after the last month read before, refresh() reads the new months and the
+    REVISION_MONTHS before them (where revisions of published values occur); otherwise (months deleted, backfilled or added
+    before the last month read) it reads the whole table. Revisions of older months that add no month are only picked up by a
+    new panel.
+
+    Attributes:
+        panel: pd.DataFrame
+        The aligned monthly panel of raw values.
+
+        version: int
+        Incremented whenever a refresh changes the panel; lets derived caches detect source table changes.
+
+    Methods:
+        cached: Returns a shared, refreshed panel for the given tables.
+        refresh: Reads the months changed since the last refresh; returns the first changed month, if any.
+        zscore: Expanding z-scores of each series (or of its changes).
+        rolling_mean: Rolling means of each series.
+        change: Changes over a number of months (percentage or difference); mom and yoy are shorthands.
+        percentile_rank: Expanding percentile rank of each value within its own history.
+        diffusion: Share of series rising month-on-month (unchanged series count half).
+    """
+
+    _instances: dict[tuple[str], IndicatorPanel] = {}
+
+    def __init__(self, tables: tuple[type] = PANEL_TABLES) -> None:
+        self._tables = tuple(tables)
+        self._columns = [f"{t.name()}.{c}" for t in self._tables for c in numeric_columns(t)]
+        self._start: int | None = None
+        self._values = np.empty((0, len(self._columns)))
+        self._table_state: dict[str, tuple[Any, ...]] = {}
+        self._stats: dict[tuple, np.ndarray] = {}
+        self._version = 0
+        self.refresh()
+
+    @classmethod
+    def cached(cls, tables: tuple[type] = PANEL_TABLES) -> IndicatorPanel:
+        key = tuple(t.name() for t in tables)
+        if key not in cls._instances:
+            cls._instances[key] = cls(tables)
+        else:
+            cls._instances[key].refresh()
+        return cls._instances[key]
+
+    @property
+    def panel(self) -> pd.DataFrame:
+        return self._frame(self._values)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    def refresh(self) -> pd.Period | None:
+        with DBConnection() as conn:
+            changed_from = None
+            for table in self._tables:
+                months = month_number(table.year, table.month)
+                count, first, last, total = conn._connection.execute(
+                    db.select(db.func.count(), db.func.min(months), db.func.max(months), db.func.sum(months))
+                ).one()
+                state = (table_version(conn._connection, table.name()), count, first, last, total)
+                previous = self._table_state.get(table.name())
+                if state == previous or (previous is None and not count):
+                    continue
+
+                since = None
+                if previous is not None and count >= previous[1] and first == previous[2]:
+                    # Months added since: if they account for every new key, only the revision window needs reading again
+                    added = conn._connection.execute(
+                        db.select(db.func.count(), db.func.coalesce(db.func.sum(months), 0)).where(months > previous[3])
+                    ).one()
+                    if tuple(added) == (count - previous[1], total - previous[4]):
+                        since = previous[3] - REVISION_MONTHS + 1
+                rows = self._read_table(conn, table, since)
+                first_changed = self._write_rows(table, rows, since)
+                if first_changed is not None:
+                    changed_from = first_changed if changed_from is None else min(changed_from, first_changed)
+                self._table_state[table.name()] = state
+
+        if changed_from is None:
+            return None
+        self._update_stats(changed_from)
+        self._version += 1
+        return self._period_index()[changed_from]
+
+    def zscore(self, transform: str = "level") -> pd.DataFrame:
+        """Expanding z-scores of each series, or of its month-on-month ("mom") or year-on-year ("yoy") percentage changes."""
+        if transform not in TRANSFORMS:
+            raise ValueError(f"Transform must be one of {TRANSFORMS}; received: {transform}.")
+        return self._frame(self._stat("zscore", _expanding_zscore, transform=transform))
+
+    def rolling_mean(self, window: int = 12) -> pd.DataFrame:
+        return self._frame(self._stat("rolling_mean", _rolling_mean, window=window))
+
+    def change(self, periods: int = 1, pct: bool = True) -> pd.DataFrame:
+        return self._frame(self._stat("change", _change, periods=periods, pct=pct))
+
+    def mom(self, pct: bool = True) -> pd.DataFrame:
+        return self.change(1, pct=pct)
+
+    def yoy(self, pct: bool = True) -> pd.DataFrame:
+        return self.change(12, pct=pct)
+
+    def percentile_rank(self) -> pd.DataFrame:
+        return self._frame(self._stat("percentile_rank", _expanding_percentile_rank))
+
+    def diffusion(self, columns: list[str] | None = None) -> pd.Series:
+        """
+        Returns, for each month, the percentage of series (all, or the given columns) that rose from the previous month,
+        counting unchanged series as half.
+        """
+        values = self._values if columns is None else self._values[:, [self._columns.index(c) for c in columns]]
+        diff = _change(values, 0, periods=1, pct=False)
+        valid = (~np.isnan(diff)).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            index = 100 * ((diff > 0).sum(axis=1) + 0.5 * (diff == 0).sum(axis=1)) / valid
+        return pd.Series(np.where(valid > 0, index, np.nan), index=self._period_index(), name="Diffusion Index")
+
+    def _read_table(self, conn: DBConnection, table: type, since: int | None) -> pd.DataFrame:
+        stmt = db.select(table.year, table.month, *[getattr(table, c) for c in numeric_columns(table)])
+        if since is not None:
+            stmt = stmt.where(*month_range_clause(table, start=(since // 12, since % 12 + 1)))
+        return pd.read_sql(stmt, conn._connection)
+
+    def _write_rows(self, table: type, rows: pd.DataFrame, since: int | None) -> int | None:
+        # Rows of the whole table (since is None) replace all its values: months no longer stored become missing
+        months = month_number(rows["year"].to_numpy(), rows["month"].to_numpy())
+        if len(months):
+            self._extend(int(months.min()), int(months.max()))
+        elif since is not None or self._start is None:
+            return None
+        col_idx = [self._columns.index(f"{table.name()}.{c}") for c in numeric_columns(table)]
+        first_row = 0 if since is None else max(since - self._start, 0)
+        new_values = np.full((len(self._values) - first_row, len(col_idx)), np.nan)
+        new_values[months - self._start - first_row] = rows[numeric_columns(table)].to_numpy(
+            dtype="float64", na_value=np.nan
+        )
+
+        block = (slice(first_row, None), col_idx)
+        changed = ~np.all(np.isclose(self._values[block], new_values, equal_nan=True), axis=1)
+        if not changed.any():
+            return None
+        self._values[block] = new_values
+        return first_row + int(np.flatnonzero(changed)[0])
+
+    def _extend(self, first: int, last: int) -> None:
+        if self._start is None:
+            self._start = first
+            self._values = np.full((last - first + 1, len(self._columns)), np.nan)
+            return
+        n_before = max(self._start - first, 0)
+        n_after = max(last - (self._start + len(self._values) - 1), 0)
+        if n_before or n_after:
+            self._values = np.pad(self._values, ((n_before, n_after), (0, 0)), constant_values=np.nan)
+            self._start -= n_before
+            if n_before:
+                self._stats.clear()  # earlier history changes every causal statistic
+
+    def _stat(self, name: str, func: Callable, **params: Any) -> np.ndarray:
+        key = (name, func, tuple(sorted(params.items())))
+        if key not in self._stats:
+            Metrics.count("cache_misses", "IndicatorPanel")
+            self._stats[key] = func(self._values, 0, **params)
+        else:
+            Metrics.count("cache_hits", "IndicatorPanel")
+        return self._stats[key]
+
+    def _update_stats(self, changed_from: int) -> None:
+        for key, cached in list(self._stats.items()):
+            _, func, params = key
+            updated = np.empty_like(self._values)
+            n_kept = min(changed_from, len(cached))
+            updated[:n_kept] = cached[:n_kept]
+            updated[n_kept:] = func(self._values, n_kept, **dict(params))
+            self._stats[key] = updated
+
+    def _period_index(self) -> pd.PeriodIndex:
+        months = np.arange(self._start or 0, (self._start or 0) + len(self._values))
+        return pd.PeriodIndex.from_fields(year=months // 12, month=months % 12 + 1, freq="M")
+
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=self._period_index(), columns=self._columns, copy=True)
+
+
+# Causal statistics: each takes the full (months x series) array and the first row to compute, and returns rows [start:].
+
+
+def _expanding_zscore(values: np.ndarray, start: int, transform: str = "level") -> np.ndarray:
+    if transform != "level":
+        values = _change(values, 0, periods=1 if transform == "mom" else 12, pct=True)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    count = np.cumsum(valid, axis=0)[start:]
+    total = np.cumsum(filled, axis=0)[start:]
+    total_sq = np.cumsum(filled**2, axis=0)[start:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        std = np.sqrt((total_sq / count - mean**2) * count / (count - 1))
+        z = (values[start:] - mean) / std
+    return np.where(count > 1, z, np.nan)
+
+
+def _rolling_mean(values: np.ndarray, start: int, window: int) -> np.ndarray:
+    valid = ~np.isnan(values)
+    total = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    count = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(valid, axis=0)])
+    rows = np.arange(start, len(values)) + 1
+    lower = np.maximum(rows - window, 0)
+    window_count = count[rows] - count[lower]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (total[rows] - total[lower]) / window_count
+    return np.where((window_count == window) & (rows >= window)[:, None], mean, np.nan)
+
+
+def _change(values: np.ndarray, start: int, periods: int, pct: bool) -> np.ndarray:
+    current = values[start:]
+    previous = np.full_like(current, np.nan)
+    rows = np.arange(start, len(values)) - periods
+    has_previous = rows >= 0
+    previous[has_previous] = values[rows[has_previous]]
+    if not pct:
+        return current - previous
+    with np.errstate(invalid="ignore", divide="ignore"):
+        change = (current / previous - 1) * 100
+    return np.where(np.isfinite(change), change, np.nan)  # changes from zero are undefined rather than infinite
+
+
+def _expanding_percentile_rank(values: np.ndarray, start: int, chunk_size: int = 64) -> np.ndarray:
+    result = np.full((len(values) - start, values.shape[1]), np.nan)
+    for chunk_start in range(start, len(values), chunk_size):
+        chunk_end = min(chunk_start + chunk_size, len(values))
+        chunk = values[chunk_start:chunk_end]
+        history = values[:chunk_end]
+        # For each month t in the chunk, compare against history[: t + 1]
+        visible = np.arange(chunk_end)[None, :] <= np.arange(chunk_start, chunk_end)[:, None]
+        with np.errstate(invalid="ignore"):
+            at_or_below = (history[None, :, :] <= chunk[:, None, :]) & visible[:, :, None]
+        count = (~np.isnan(history)[None, :, :] & visible[:, :, None]).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rank = 100 * at_or_below.sum(axis=1) / count
+        result[chunk_start - start : chunk_end - start] = np.where(np.isnan(chunk), np.nan, rank)
+    return result
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from lisa.common import Metrics, TemplateLogger
+
+from .indicators import PANEL_TABLES, TRANSFORMS, IndicatorPanel
+
+DEFAULT_MAX_LAG = 12
+DEFAULT_MIN_PERIODS = 24
+
+logger = TemplateLogger(__name__).logger
+
+
+class LeadLagEngine:
+    """
+    Class for batched lead/lag cross-correlations across every stored monthly series (see IndicatorPanel).
+    For each lag k, one set of matrix products yields the Pearson correlation of every series at month t - k with every series
+    at month t, using only the months where both are present (pairwise-complete, via validity masks). Results are cached per
+    transform and lag range, and dropped whenever the panel reports a change in its source tables.
+
+    Methods:
+        correlations: Returns the (lags x leading series x lagging series) correlation and observation-count arrays.
+        matrix: Returns the correlation matrix for one lag as a DataFrame (rows lead columns by the lag).
+        leaders: Returns, for a target series, the lag with the strongest correlation for every other series.
+    """
+
+    def __init__(
+        self,
+        panel: IndicatorPanel | None = None,
+        max_lag: int = DEFAULT_MAX_LAG,
+        min_periods: int = DEFAULT_MIN_PERIODS,
+    ) -> None:
+        self._panel = panel or IndicatorPanel.cached(PANEL_TABLES)
+        self._max_lag = max_lag
+        self._min_periods = min_periods
+        self._cache: dict[str, tuple[int, np.ndarray, np.ndarray]] = {}
+
+    def correlations(self, transform: str = "level") -> tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            transform: str
+            "level", "mom" or "yoy"; the series transformation correlated (levels of trending series correlate spuriously).
+
+        Returns:
+            corr: np.ndarray
+            Array of shape (max_lag + 1, n_series, n_series); corr[k, i, j] correlates series i at t - k with series j at t.
+            Pairs with fewer than min_periods common months are NaN.
+
+            count: np.ndarray
+            Number of common months behind each correlation, same shape.
+        """
+        if transform not in TRANSFORMS:
+            raise ValueError(f"Transform must be one of {TRANSFORMS}; received: {transform}.")
+
+        self._panel.refresh()
+        cached = self._cache.get(transform)
+        if cached is not None and cached[0] == self._panel.version:
+            Metrics.count("cache_hits", "LeadLagEngine")
+            return cached[1], cached[2]
+        Metrics.count("cache_misses", "LeadLagEngine")
+
+        frames = {"level": lambda: self._panel.panel, "mom": self._panel.mom, "yoy": self._panel.yoy}
+        values = frames[transform]().to_numpy()
+        corr, count = _lagged_correlations(values, self._max_lag, self._min_periods)
+        self._cache[transform] = (self._panel.version, corr, count)
+        return corr, count
+
+    def matrix(self, lag: int, transform: str = "level") -> pd.DataFrame:
+        if not 0 <= lag <= self._max_lag:
+            raise ValueError(f"Lag must be between 0 and {self._max_lag}; received: {lag}.")
+        corr, _ = self.correlations(transform)
+        return pd.DataFrame(corr[lag], index=self._panel.columns, columns=self._panel.columns)
+
+    def leaders(self, target: str, transform: str = "level", top: int | None = None) -> pd.DataFrame:
+        """
+        Returns the series that best lead a target.
+
+        Args:
+            target: str
+            Panel column, as "<table>.<column>".
+
+            transform: str
+            See correlations.
+
+            top: int | None
+            Number of series returned; all by default.
+
+        Returns:
+            df: pd.DataFrame
+            One row per leading series with the lag (months) of strongest absolute correlation, the correlation and the
+            number of common months, ordered by absolute correlation.
+        """
+        if target not in self._panel.columns:
+            raise KeyError(f"Series not in panel: {target}.")
+
+        corr, count = self.correlations(transform)
+        target_corr = corr[:, :, self._panel.columns.index(target)]
+        strength = np.where(np.isnan(target_corr), -1, np.abs(target_corr))
+        best_lag = strength.argmax(axis=0)
+        series = np.arange(target_corr.shape[1])
+        df = pd.DataFrame(
+            {
+                "lag": best_lag,
+                "correlation": target_corr[best_lag, series],
+                "observations": count[best_lag, series, self._panel.columns.index(target)],
+            },
+            index=pd.Index(self._panel.columns, name="series"),
+        )
+        df = df.drop(index=target).dropna(subset="correlation")
+        df = df.iloc[np.argsort(-df["correlation"].abs().to_numpy(), kind="stable")]
+        return df if top is None else df.head(top)
+
+
+def _lagged_correlations(values: np.ndarray, max_lag: int, min_periods: int) -> tuple[np.ndarray, np.ndarray]:
+    """Pairwise-complete Pearson correlations between all columns of values (months x series), for lags 0..max_lag."""
+    valid = ~np.isnan(values)
+    # Centring on each series' mean keeps the sum-of-products formula numerically stable
+    centred = values - np.nanmean(np.where(valid.any(axis=0), values, 0.0), axis=0)
+    filled = np.where(valid, centred, 0.0)
+    mask = valid.astype("float64")
+
+    n_lags, n_series = max_lag + 1, values.shape[1]
+    corr = np.full((n_lags, n_series, n_series), np.nan)
+    count = np.zeros((n_lags, n_series, n_series), dtype="int64")
+    for lag in range(min(n_lags, len(values))):
+        x, mx = filled[: len(values) - lag], mask[: len(values) - lag]
+        y, my = filled[lag:], mask[lag:]
+
+        n = mx.T @ my
+        sum_x, sum_y = x.T @ my, mx.T @ y
+        sum_xx, sum_yy = (x**2).T @ my, mx.T @ y**2
+        sum_xy = x.T @ y
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = n * sum_xy - sum_x * sum_y
+            var = (n * sum_xx - sum_x**2) * (n * sum_yy - sum_y**2)
+            r = cov / np.sqrt(var)
+        corr[lag] = np.where((n >= min_periods) & (var > 0), np.clip(r, -1, 1), np.nan)
+        count[lag] = n.astype("int64")
+    return corr, count
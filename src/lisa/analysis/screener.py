@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as db
+
+from lisa.common import DBConnection, Metrics, TemplateLogger
+from lisa.database_model import Finviz_Stocks
+
+logger = TemplateLogger(__name__).logger
+
+Condition = tuple[Any, Any] | list[Any] | set[Any] | Any
+Predicate = Mapping[str, Condition]
+
+
+class StockScreener:
+    """
+    Class for fast, repeated screens over Finviz_Stocks from a memory-resident, columnar snapshot.
+    Numeric columns are held as float64 arrays together with their sort order (missing values last), so range conditions become
+    two binary searches and sorting becomes a gather; text columns are held as integer codes, so equality and membership
+    conditions compare integers. The snapshot is read once and rebuilt lazily after a commit writing Finviz_Stocks invalidates
+    it (on_commit is registered as a DBConnection commit hook).
+
+    Conditions are given per column:
+        - (low, high): inclusive range for numeric columns; either bound may be None.
+        - list or set: membership.
+        - any other value: equality.
+    Conditions in one mapping are combined with AND; a sequence of mappings is combined with OR.
+
+    Methods:
+        invalidate: Marks all snapshots stale.
+        on_commit: Commit hook invalidating the snapshots after Finviz_Stocks is written.
+        mask: Returns the boolean row mask of a predicate.
+        count: Returns the number of rows matching a predicate.
+        query: Returns matching rows, optionally sorted and limited to the top N.
+    """
+
+    _generation = 0
+
+    def __init__(self) -> None:
+        self._loaded_generation: int | None = None
+        self._numeric: dict[str, np.ndarray] = {}
+        self._order: dict[str, np.ndarray] = {}
+        self._sorted: dict[str, np.ndarray] = {}
+        self._n_valid: dict[str, int] = {}
+        self._codes: dict[str, np.ndarray] = {}
+        self._categories: dict[str, pd.Index] = {}
+        self._n_rows = 0
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls._generation += 1
+
+    @classmethod
+    def on_commit(cls, table_names: set[str]) -> None:
+        if Finviz_Stocks.name() in table_names:
+            cls.invalidate()
+
+    @property
+    def columns(self) -> list[str]:
+        self._ensure_snapshot()
+        return [*self._codes, *self._numeric]
+
+    def mask(self, where: Predicate | Sequence[Predicate] | None = None) -> np.ndarray:
+        self._ensure_snapshot()
+        if where is None:
+            return np.ones(self._n_rows, dtype=bool)
+        if isinstance(where, Mapping):
+            where = [where]
+
+        mask = np.zeros(self._n_rows, dtype=bool)
+        for predicate in where:
+            mask_i = np.ones(self._n_rows, dtype=bool)
+            for column, condition in predicate.items():
+                mask_i &= self._condition_mask(column, condition)
+            mask |= mask_i
+        return mask
+
+    def count(self, where: Predicate | Sequence[Predicate] | None = None) -> int:
+        return int(self.mask(where).sum())
+
+    def query(
+        self,
+        where: Predicate | Sequence[Predicate] | None = None,
+        sort_by: str | None = None,
+        ascending: bool = True,
+        top: int | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Args:
+            where: Predicate | Sequence[Predicate] | None
+            Conditions per column (see class docstring); all rows if None.
+
+            sort_by: str | None
+            Numeric column to sort by; rows missing that value are excluded. Unsorted (table order) if None.
+
+            ascending: bool
+            Sort direction.
+
+            top: int | None
+            Maximum number of rows returned.
+
+            columns: list[str] | None
+            Columns returned; all by default.
+
+        Returns:
+            df: pd.DataFrame
+            Matching rows, indexed by ticker.
+        """
+        mask = self.mask(where)
+        if sort_by is None:
+            rows = np.flatnonzero(mask)
+        else:
+            if sort_by not in self._order:
+                raise KeyError(f"Can only sort by numeric columns; received: {sort_by}.")
+            order = self._order[sort_by][: self._n_valid[sort_by]]
+            order = order if ascending else order[::-1]
+            rows = order[mask[order]]
+        rows = rows[:top]
+
+        columns = columns or self.columns
+        unknown_columns = set(columns) - set(self.columns)
+        if unknown_columns:
+            raise KeyError(f"Columns not in {Finviz_Stocks.name()}:\n{sorted(unknown_columns)}")
+        data = {c: self._decode(c, rows) if c in self._codes else self._numeric[c][rows] for c in columns}
+        return pd.DataFrame(data, index=pd.Index(self._decode("ticker", rows), name="ticker"))
+
+    def _ensure_snapshot(self) -> None:
+        if self._loaded_generation == StockScreener._generation:
+            Metrics.count("cache_hits", "StockScreener")
+            return
+        Metrics.count("cache_misses", "StockScreener")
+        generation = StockScreener._generation
+        with DBConnection() as conn:
+            result = conn._connection.execute(db.select(Finviz_Stocks))
+            df = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+        self._numeric, self._order, self._sorted, self._n_valid, self._codes, self._categories = {}, {}, {}, {}, {}, {}
+        for column in Finviz_Stocks.__table__.columns:
+            values = df[column.name]
+            if column.type.python_type in (int, float) and not column.name.startswith("gics_"):
+                values = values.to_numpy(dtype="float64", na_value=np.nan)
+                order = np.argsort(values, kind="stable")  # NaN sorts last
+                self._numeric[column.name] = values
+                self._order[column.name] = order
+                self._sorted[column.name] = values[order]
+                self._n_valid[column.name] = int((~np.isnan(values)).sum())
+            else:
+                codes, categories = pd.factorize(values, use_na_sentinel=True)
+                self._codes[column.name] = codes
+                self._categories[column.name] = pd.Index(categories)
+        self._n_rows = len(df)
+        self._loaded_generation = generation
+
+    def _decode(self, column: str, rows: np.ndarray) -> np.ndarray:
+        codes = self._codes[column][rows]
+        categories = self._categories[column].to_numpy(dtype=object)
+        return np.where(codes >= 0, categories[np.maximum(codes, 0)] if len(categories) else None, None)
+
+    def _condition_mask(self, column: str, condition: Condition) -> np.ndarray:
+        if column in self._numeric:
+            if isinstance(condition, tuple):
+                return self._range_mask(column, *condition)
+            if isinstance(condition, (list, set)):
+                return np.isin(self._numeric[column], list(condition))
+            return self._numeric[column] == condition
+
+        if column in self._codes:
+            if isinstance(condition, tuple):
+                raise ValueError(f"Range conditions apply to numeric columns only; received: {column}={condition}.")
+            values = list(condition) if isinstance(condition, (list, set)) else [condition]
+            wanted = self._categories[column].get_indexer(values)
+            return np.isin(self._codes[column], wanted[wanted >= 0])
+
+        raise KeyError(f"Column not in {Finviz_Stocks.name()}: {column}.")
+
+    def _range_mask(self, column: str, low: float | None, high: float | None) -> np.ndarray:
+        sorted_values = self._sorted[column][: self._n_valid[column]]
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        stop = len(sorted_values) if high is None else np.searchsorted(sorted_values, high, side="right")
+        mask = np.zeros(self._n_rows, dtype=bool)
+        mask[self._order[column][start:stop]] = True
+        return mask
+
+
+DBConnection.add_commit_hook(StockScreener.on_commit)
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as db
+
+from lisa.common import DBConnection, TemplateLogger
+from lisa.database_model import (
+    Finviz_Industries,
+    GICS_Industries,
+    Sector_Rotation,
+    US_Man_Industry_Ranking,
+    US_Ser_Industry_Ranking,
+)
+
+from .indicators import _rolling_mean, month_number
+
+SHORT_WINDOW = 3
+LONG_WINDOW = 12
+PERF_COLUMNS = ("perf_month_pct", "perf_quart_pct", "perf_half_pct", "perf_year_pct", "perf_ytd_pct")
+
+logger = TemplateLogger(__name__).logger
+
+# ISM sector (ranking table column prefix): Finviz (GICS) industries most exposed to it.
+# ISM sectors without a listed-equity counterpart (e.g. printing, public administration) are left out.
+MAN_SECTOR_INDUSTRIES = MappingProxyType(
+    {
+        "apparel": ("Apparel Manufacturing", "Footwear & Accessories", "Luxury Goods"),
+        "chemical": (
+            "Chemicals",
+            "Specialty Chemicals",
+            "Agricultural Inputs",
+            "Drug Manufacturers - General",
+            "Drug Manufacturers - Specialty & Generic",
+            "Household & Personal Products",
+        ),
+        "computer_electronics": (
+            "Semiconductors",
+            "Semiconductor Equipment & Materials",
+            "Computer Hardware",
+            "Communication Equipment",
+            "Consumer Electronics",
+            "Electronic Components",
+            "Scientific & Technical Instruments",
+        ),
+        "electrical_equipment": ("Electrical Equipment & Parts", "Solar"),
+        "fabricated_metal": ("Metal Fabrication", "Tools & Accessories"),
+        "food_beverage_tobacco": (
+            "Packaged Foods",
+            "Confectioners",
+            "Beverages - Non-Alcoholic",
+            "Beverages - Brewers",
+            "Beverages - Wineries & Distilleries",
+            "Tobacco",
+        ),
+        "furniture": ("Furnishings, Fixtures & Appliances",),
+        "machinery": (
+            "Specialty Industrial Machinery",
+            "Farm & Heavy Construction Machinery",
+            "Pollution & Treatment Controls",
+        ),
+        "miscellaneous": ("Medical Devices", "Medical Instruments & Supplies", "Leisure"),
+        "non_metallic_mineral": ("Building Materials",),
+        "paper": ("Paper & Paper Products", "Packaging & Containers"),
+        "petroleum_coal": ("Oil & Gas Refining & Marketing", "Oil & Gas Integrated"),
+        "metals": ("Steel", "Aluminum", "Copper"),
+        "textiles": ("Textile Manufacturing",),
+        "transportation": ("Auto Manufacturers", "Auto Parts", "Aerospace & Defense", "Recreational Vehicles"),
+        "wood": ("Lumber & Wood Production",),
+    }
+)
+
+SER_SECTOR_INDUSTRIES = MappingProxyType(
+    {
+        "accommodation_food": ("Restaurants", "Lodging", "Resorts & Casinos"),
+        "agriculture_forestry": ("Farm Products",),
+        "arts_entertainment": ("Entertainment", "Gambling", "Electronic Gaming & Multimedia"),
+        "construction": ("Engineering & Construction", "Residential Construction", "Building Products & Equipment"),
+        "education": ("Education & Training Services",),
+        "finance_insurance": (
+            "Banks - Diversified",
+            "Banks - Regional",
+            "Capital Markets",
+            "Asset Management",
+            "Credit Services",
+            "Mortgage Finance",
+            "Financial Data & Stock Exchanges",
+            "Financial Conglomerates",
+            "Insurance - Diversified",
+            "Insurance - Life",
+            "Insurance - Property & Casualty",
+            "Insurance - Reinsurance",
+            "Insurance - Specialty",
+            "Insurance Brokers",
+        ),
+        "healthcare": (
+            "Medical Care Facilities",
+            "Healthcare Plans",
+            "Diagnostics & Research",
+            "Health Information Services",
+            "Medical Distribution",
+        ),
+        "information": (
+            "Software - Application",
+            "Software - Infrastructure",
+            "Internet Content & Information",
+            "Telecom Services",
+            "Broadcasting",
+            "Publishing",
+            "Information Technology Services",
+        ),
+        "company_management": (
+            "Staffing & Employment Services",
+            "Specialty Business Services",
+            "Security & Protection Services",
+            "Waste Management",
+        ),
+        "mining": (
+            "Oil & Gas E&P",
+            "Oil & Gas Drilling",
+            "Oil & Gas Equipment & Services",
+            "Gold",
+            "Silver",
+            "Other Precious Metals & Mining",
+            "Other Industrial Metals & Mining",
+            "Thermal Coal",
+            "Coking Coal",
+            "Uranium",
+        ),
+        "other": ("Personal Services", "Rental & Leasing Services"),
+        "technical_services": ("Consulting Services", "Advertising Agencies"),
+        "real_estate": (
+            "Real Estate Services",
+            "Real Estate - Development",
+            "Real Estate - Diversified",
+            "REIT - Diversified",
+            "REIT - Healthcare Facilities",
+            "REIT - Hotel & Motel",
+            "REIT - Industrial",
+            "REIT - Office",
+            "REIT - Residential",
+            "REIT - Retail",
+            "REIT - Specialty",
+            "REIT - Mortgage",
+        ),
+        "retail_trade": (
+            "Apparel Retail",
+            "Department Stores",
+            "Discount Stores",
+            "Grocery Stores",
+            "Home Improvement Retail",
+            "Internet Retail",
+            "Specialty Retail",
+            "Auto & Truck Dealerships",
+            "Pharmaceutical Retailers",
+        ),
+        "transportation_warehousing": (
+            "Airlines",
+            "Airports & Air Services",
+            "Railroads",
+            "Trucking",
+            "Marine Shipping",
+            "Integrated Freight & Logistics",
+            "Oil & Gas Midstream",
+        ),
+        "utilities": (
+            "Utilities - Diversified",
+            "Utilities - Independent Power Producers",
+            "Utilities - Regulated Electric",
+            "Utilities - Regulated Gas",
+            "Utilities - Regulated Water",
+            "Utilities - Renewable",
+        ),
+        "wholesale_trade": ("Industrial Distribution", "Food Distribution", "Electronics & Computer Distribution"),
+    }
+)
+
+# Ranking table: (report name, suffix of the activity ranking columns, sector-industry map)
+RANKING_SOURCES = MappingProxyType(
+    {
+        US_Man_Industry_Ranking: ("manufacturing", "NewOrders", MAN_SECTOR_INDUSTRIES),
+        US_Ser_Industry_Ranking: ("services", "BusinessActivity", SER_SECTOR_INDUSTRIES),
+    }
+)
+
+
+class SectorRotation:
+    """
+    Class for sector rotation signals: ISM industry rankings mapped to GICS industries and joined to Finviz industry performance.
+    Momentum is the short-window mean of a sector's ranking less its long-window mean, for both the PMI ranking and the
+    new-orders (manufacturing) or business-activity (services) ranking. Rows are materialised per month, report, ISM sector and
+    GICS industry in the Sector_Rotation table. The Finviz industry performance current at refresh time is stored with the
+    latest month of each report only; earlier months keep the snapshot stored while they were the latest (NULL if none was).
+    Signals are not refreshed by ISM loads: call refresh() after loading the ISM rankings.
+
+    Methods:
+        refresh: Materialises months not yet stored (re-stamping the latest stored month with current performance).
+        signals: Computes the signal rows of one ranking table from a given month number onwards.
+        read: Returns the stored signals of a month (the latest by default).
+    """
+
+    def __init__(self, short_window: int = SHORT_WINDOW, long_window: int = LONG_WINDOW) -> None:
+        if not 0 < short_window < long_window:
+            raise ValueError(f"Windows must satisfy 0 < short < long; received: {short_window}, {long_window}.")
+        self._short_window = short_window
+        self._long_window = long_window
+
+    def refresh(self, full: bool = False) -> pd.DataFrame:
+        """
+        Args:
+            full: bool
+            Whether to recompute all months rather than only those from the latest stored month onwards.
+
+        Returns:
+            df: pd.DataFrame
+            The upserted rows.
+        """
+        with DBConnection() as conn:
+            conn.ensure_table(Sector_Rotation)
+            industry_ids = dict(
+                conn._connection.execute(db.select(GICS_Industries.industry, GICS_Industries.id)).tuples().all()
+            )
+            performance = pd.read_sql(
+                db.select(Finviz_Industries.gics_industry_id, *[getattr(Finviz_Industries, c) for c in PERF_COLUMNS]),
+                conn._connection,
+            )
+
+            frames = []
+            for ranking in RANKING_SOURCES:
+                report = RANKING_SOURCES[ranking][0]
+                start = None
+                if not full:
+                    start = conn._connection.execute(
+                        db.select(db.func.max(month_number(Sector_Rotation.year, Sector_Rotation.month))).where(
+                            Sector_Rotation.report == report
+                        )
+                    ).scalar()
+                frames.append(self.signals(conn, ranking, start, industry_ids))
+
+            df = pd.concat(frames, ignore_index=True)
+            if df.empty:
+                return df
+            # Performance is a snapshot of today: it is only joined to the latest month of each report. Earlier months are
+            # upserted without the performance columns, so they keep the snapshot stamped while they were the latest (or NULL).
+            months = month_number(df["year"], df["month"])
+            latest = months == months.groupby(df["report"]).transform("max")
+            history = df.loc[~latest, Sector_Rotation.columns()[: -len(PERF_COLUMNS)]]
+            current = df.loc[latest].merge(performance, on="gics_industry_id", how="left")[Sector_Rotation.columns()]
+            current = current.astype(object).where(current.notna(), None)
+            if not history.empty:
+                conn.upsert_rows(Sector_Rotation.name(), history.to_dict(orient="records"))
+            conn.upsert_rows(Sector_Rotation.name(), current.to_dict(orient="records"))
+        return pd.concat([history, current], ignore_index=True)
+
+    def signals(
+        self, conn: DBConnection, ranking: type, start: int | None, industry_ids: dict[str, int]
+    ) -> pd.DataFrame:
+        """
+        Args:
+            conn: DBConnection
+            Open connection to read the rankings with.
+
+            ranking: type
+            US_Man_Industry_Ranking or US_Ser_Industry_Ranking.
+
+            start: int | None
+            First month number (year * 12 + month - 1) returned; all months if None.
+
+            industry_ids: dict[str, int]
+            GICS industry name to id.
+
+        Returns:
+            df: pd.DataFrame
+            One row per month and (ISM sector, GICS industry) pair, with rankings and momentum.
+        """
+        report, activity_suffix, sector_industries = RANKING_SOURCES[ranking]
+        unknown_industries = {i for industries in sector_industries.values() for i in industries} - industry_ids.keys()
+        if unknown_industries:
+            logger.warning(
+                f"Industries mapped to ISM sectors are not in {GICS_Industries.name()}:\n{sorted(unknown_industries)}"
+            )
+
+        sectors = list(sector_industries)
+        pmi_cols = [getattr(ranking, f"{s}_PMI") for s in sectors]
+        activity_cols = [getattr(ranking, f"{s}_{activity_suffix}") for s in sectors]
+        stmt = db.select(ranking.year, ranking.month, *pmi_cols, *activity_cols)
+        if start is not None:
+            stmt = stmt.where(month_number(ranking.year, ranking.month) >= start - self._long_window + 1)
+        rows = conn._connection.execute(stmt).all()
+        if not rows:
+            return pd.DataFrame(columns=Sector_Rotation.columns()[: -len(PERF_COLUMNS)])
+
+        # Gap-free month grid, so that rolling windows span calendar months
+        data = np.array(rows, dtype="float64")
+        months = month_number(data[:, 0], data[:, 1]).astype("int64")
+        grid = np.full((months.max() - months.min() + 1, data.shape[1] - 2), np.nan)
+        grid[months - months.min()] = data[:, 2:]
+        momentum = _rolling_mean(grid, 0, self._short_window) - _rolling_mean(grid, 0, self._long_window)
+
+        keep = np.flatnonzero(np.isin(np.arange(len(grid)) + months.min(), months))
+        if start is not None:
+            keep = keep[keep + months.min() >= start]
+
+        # (sector, industry) pairs, as sector positions into the ranking columns
+        pairs = [
+            (i, industry_ids[ind]) for i, s in enumerate(sectors) for ind in sector_industries[s] if ind in industry_ids
+        ]
+        sector_pos = np.array([p[0] for p in pairs], dtype="int64")
+        n_sectors = len(sectors)
+        month_rows = np.repeat(keep, len(pairs))
+        pair_rows = np.tile(np.arange(len(pairs)), len(keep))
+        pmi_pos, activity_pos = sector_pos[pair_rows], sector_pos[pair_rows] + n_sectors
+        grid_months = month_rows + months.min()
+
+        return pd.DataFrame(
+            {
+                "year": grid_months // 12,
+                "month": grid_months % 12 + 1,
+                "report": report,
+                "ism_sector": np.array(sectors, dtype=object)[sector_pos[pair_rows]],
+                "gics_industry_id": np.array([p[1] for p in pairs], dtype="int64")[pair_rows],
+                "pmi_rank": grid[month_rows, pmi_pos].astype("int64"),
+                "pmi_momentum": momentum[month_rows, pmi_pos],
+                "activity_rank": grid[month_rows, activity_pos].astype("int64"),
+                "activity_momentum": momentum[month_rows, activity_pos],
+            }
+        )
+
+    @staticmethod
+    def read(year: int | None = None, month: int | None = None) -> pd.DataFrame:
+        """Returns the stored signals of a month (the latest by default), strongest PMI momentum first."""
+        with DBConnection() as conn:
+            if year is None or month is None:
+                latest = conn._connection.execute(
+                    db.select(db.func.max(month_number(Sector_Rotation.year, Sector_Rotation.month)))
+                ).scalar()
+                if latest is None:
+                    return pd.DataFrame(columns=Sector_Rotation.columns())
+                year, month = latest // 12, latest % 12 + 1
+            stmt = (
+                db.select(Sector_Rotation, GICS_Industries.industry)
+                .join(GICS_Industries, Sector_Rotation.gics_industry_id == GICS_Industries.id)
+                .where(Sector_Rotation.year == year, Sector_Rotation.month == month)
+                .order_by(Sector_Rotation.pmi_momentum.desc())
+            )
+            return pd.read_sql(stmt, conn._connection)
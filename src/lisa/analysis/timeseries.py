@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as db
+
+from lisa.common import DBConnection, Metrics, TemplateLogger
+from lisa.common.read_cache import table_version
+from lisa.database_model import (
+    Caixin_PMI,
+    EU_Economic_Sentiment,
+    US_Buildings,
+    US_Consumers,
+    US_Man_Industry_Ranking,
+    US_Man_Pmi_Report,
+    US_Ser_Industry_Ranking,
+    US_Ser_Pmi_Report,
+)
+
+from .indicators import MonthLike, month_number, month_range_clause, numeric_columns, to_month
+
+MONTHLY_TABLES = MappingProxyType(
+    {
+        t.name(): t
+        for t in (
+            US_Consumers,
+            US_Buildings,
+            Caixin_PMI,
+            EU_Economic_Sentiment,
+            US_Man_Pmi_Report,
+            US_Ser_Pmi_Report,
+            US_Man_Industry_Ranking,
+            US_Ser_Industry_Ranking,
+        )
+    }
+)
+
+logger = TemplateLogger(__name__).logger
+
+
+class TimeSeriesStore:
+    """
+    Class for reading the monthly tables as time series: the integer year and month columns become a monthly PeriodIndex
+    (or DatetimeIndex of month starts), built directly from period ordinals (months since 1970-01) instead of parsing
+    concatenated date strings. Date ranges are pushed to SQL (see month_range_clause), so only the requested months are read.
+    Decoded months are cached per table and table version; the version changes whenever a write to the table is committed
+    through DBConnection (in any process, see Table_Versions) or its row count or largest rowid changes (other writes), and a
+    range read slices the cached months of the whole table.
+
+    Methods:
+        frame: Returns columns of a monthly table over a date range, indexed by month.
+        series: Returns one column of a monthly table over a date range, indexed by month.
+        index: Returns the months stored in a table over a date range.
+    """
+
+    _ordinals: dict[str, tuple[tuple[int, ...], np.ndarray]] = {}
+
+    def frame(
+        self,
+        table: type | str,
+        columns: list[str] | None = None,
+        start: MonthLike | None = None,
+        end: MonthLike | None = None,
+        timestamps: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Args:
+            table: type | str
+            A monthly table model, or its name.
+
+            columns: list[str] | None
+            Columns to return; all numeric columns by default.
+
+            start: MonthLike | None
+            end: MonthLike | None
+            First and last months to return (inclusive), e.g. "2020-01", (2020, 1), a date or a pd.Period.
+
+            timestamps: bool
+            Whether to index by month-start timestamps (DatetimeIndex) instead of monthly periods (PeriodIndex).
+
+        Returns:
+            df: pd.DataFrame
+            One row per stored month in the range, in chronological order.
+        """
+        table = self._table(table)
+        columns = columns or numeric_columns(table)
+        unknown_columns = set(columns) - set(table.columns())
+        if unknown_columns:
+            raise KeyError(f"Columns not in table {table.name()}: {sorted(unknown_columns)}.")
+
+        stmt = db.select(*[getattr(table, c) for c in columns]).where(*month_range_clause(table, start, end))
+        with DBConnection() as conn, Metrics.stage("read", table.name()) as record:
+            ordinals = self._months(conn, table, start, end)
+            result = conn._connection.execute(stmt.order_by(table.year, table.month))
+            df = pd.DataFrame(result.fetchall(), columns=columns)
+            if len(df) != len(ordinals):  # written by another process since the version was read
+                self._ordinals.pop(table.name(), None)
+                ordinals = self._months(conn, table, start, end)
+            record.add(rows=len(df))
+        df.index = self._to_index(ordinals, timestamps)
+        return df
+
+    def series(
+        self,
+        table: type | str,
+        column: str,
+        start: MonthLike | None = None,
+        end: MonthLike | None = None,
+        timestamps: bool = False,
+    ) -> pd.Series:
+        return self.frame(table, [column], start, end, timestamps)[column]
+
+    def index(
+        self,
+        table: type | str,
+        start: MonthLike | None = None,
+        end: MonthLike | None = None,
+        timestamps: bool = False,
+    ) -> pd.PeriodIndex | pd.DatetimeIndex:
+        table = self._table(table)
+        with DBConnection() as conn:
+            return self._to_index(self._months(conn, table, start, end), timestamps)
+
+    @staticmethod
+    def _table(table: type | str) -> type:
+        name = table if isinstance(table, str) else table.name()
+        if name not in MONTHLY_TABLES:
+            raise KeyError(f"Not a monthly table: {name}; must be one of {list(MONTHLY_TABLES)}.")
+        return MONTHLY_TABLES[name]
+
+    @classmethod
+    def _months(cls, conn: DBConnection, table: type, start: MonthLike | None, end: MonthLike | None) -> np.ndarray:
+        # Stored months as monthly period ordinals (months since 1970-01), in chronological order
+        name = table.name()
+        count, max_rowid = conn._connection.exec_driver_sql(f'SELECT count(*), max(rowid) FROM "{name}"').one()
+        version = (table_version(conn._connection, name), count, max_rowid or 0)
+
+        cached = cls._ordinals.get(name)
+        if cached is not None and cached[0] == version:
+            Metrics.count("cache_hits", "TimeSeriesStore")
+            ordinals = cached[1]
+        else:
+            Metrics.count("cache_misses", "TimeSeriesStore")
+            keys = conn._connection.execute(db.select(table.year, table.month).order_by(table.year, table.month)).all()
+            years, months = np.array(keys, dtype="int64").reshape(-1, 2).T
+            ordinals = month_number(years, months) - month_number(1970, 1)
+            ordinals.flags.writeable = False
+            cls._ordinals[name] = (version, ordinals)
+
+        first = 0 if start is None else np.searchsorted(ordinals, to_month(start).ordinal)
+        last = len(ordinals) if end is None else np.searchsorted(ordinals, to_month(end).ordinal, "right")
+        return ordinals[first:last]
+
+    @staticmethod
+    def _to_index(ordinals: np.ndarray, timestamps: bool) -> pd.PeriodIndex | pd.DatetimeIndex:
+        if timestamps:
+            return pd.DatetimeIndex(ordinals.astype("datetime64[M]").astype("datetime64[ns]"))
+        return pd.PeriodIndex.from_ordinals(ordinals, freq="M")
@@ -1,3 +1,12 @@
+from .arrow_mirror import ArrowMirror
 from .db_connection import DBConnection
+from .duckdb_backend import DuckDBBackend
+from .load_validator import LoadValidator
+from .maintenance import Maintenance
+from .metrics import Metrics
+from .profiler import Profiler
+from .read_cache import ReadCache
+from .search_index import SearchIndex
 from .template_logger import TemplateLogger
 from .web_session import WebSession
+from .write_behind import TableWrite, WriteBehindLoader, write_tables
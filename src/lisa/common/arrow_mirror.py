@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+import pandas as pd
+import sqlalchemy as db
+
+import lisa.database_model as database_model
+
+from .db_connection import ENGINE, SQLITE_PATH, DBConnection
+from .metrics import Metrics
+from .template_logger import TemplateLogger
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency: pip install pyarrow
+    pa = ipc = pq = None
+
+MIRROR_PATH = SQLITE_PATH.parent.joinpath("mirror")
+MANIFEST_NAME = "manifest.json"
+ARROW_TYPES = MappingProxyType({int: "int64", float: "float64", str: "string", bool: "bool"})
+# Derived tables recomputed in bulk by the analysis modules; commit hooks leave them to explicit sync() calls
+DERIVED_TABLES = frozenset({database_model.Stock_Factors.name()})
+
+logger = TemplateLogger(__name__).logger
+
+
+def model_tables() -> dict[str, db.Table]:
+    """Returns the tables of all models in lisa.database_model, by name."""
+    return {m.__table__.name: m.__table__ for m in vars(database_model).values() if hasattr(m, "__table__")}
+
+
+class ArrowMirror:
+    """
+    Class for a columnar mirror of the database: one Arrow IPC file (and optionally a Parquet file) per table, in data/mirror/.
+    IPC files are uncompressed, so read() memory-maps them and hands the columns to pandas without copying (Arrow-backed
+    dtypes) or with a single conversion (NumPy dtypes); either way, no rows are converted one by one as with df_from_sql.
+
+    The mirror is created by a first sync(). From then on it follows the database: tables written through DBConnection are
+    re-exported after each commit (via a commit hook; except DERIVED_TABLES, such as the ~1.5m rows of Stock_Factors), and
+    sync() re-exports any table whose row count or largest rowid differs from the manifest, which catches writes from outside
+    this package unless they only update values in place.
+    Requires pyarrow; without it, sync() raises ImportError and read() falls back to reading the database.
+
+    Methods:
+        available: Returns whether pyarrow is installed.
+        sync: Exports new or changed tables; returns the names of the exported tables.
+        read: Returns a table as a DataFrame from its memory-mapped IPC file.
+        read_arrow: Returns a table as a pyarrow.Table from its memory-mapped IPC file.
+        is_current: Returns whether the mirror file of a table matches the table's current fingerprint.
+        on_commit: Commit hook re-exporting the tables changed in a committed transaction.
+    """
+
+    def __init__(self, path: Path = MIRROR_PATH, parquet: bool = False) -> None:
+        self._path = Path(path)
+        self._parquet = parquet
+
+    @staticmethod
+    def available() -> bool:
+        return pa is not None
+
+    def sync(self, tables: list[str] | None = None, full: bool = False) -> list[str]:
+        """
+        Args:
+            tables: list[str] | None
+            Tables to export regardless of their fingerprint; by default, all model tables are checked.
+
+            full: bool
+            Whether to export every model table regardless of the manifest.
+
+        Returns:
+            exported: list[str]
+            Names of the exported tables.
+        """
+        if not self.available():
+            raise ImportError("The Arrow mirror requires pyarrow; install it with: pip install pyarrow")
+
+        known_tables = model_tables()
+        unknown_tables = set(tables or []) - known_tables.keys()
+        if unknown_tables:
+            raise KeyError(f"Tables not in lisa.database_model: {sorted(unknown_tables)}.")
+
+        self._path.mkdir(parents=True, exist_ok=True)
+        manifest = self._manifest()
+        inspector = db.inspect(ENGINE)
+        exported = []
+        with DBConnection() as conn:
+            for name, table in known_tables.items():
+                if (tables is not None and name not in tables) or not inspector.has_table(name):
+                    continue
+                fingerprint = self._fingerprint(conn, name)
+                unchanged = manifest.get(name, {}).get("fingerprint") == fingerprint and self._file(name).exists()
+                if tables is None and unchanged and not full:
+                    continue
+                n_rows = self._export(conn, name, table)
+                manifest[name] = {
+                    "fingerprint": fingerprint,
+                    "rows": n_rows,
+                    "exported_at": datetime.now().isoformat(timespec="seconds"),
+                }
+                exported.append(name)
+
+        if exported:
+            with self._replacing(self._path.joinpath(MANIFEST_NAME)) as tmp_path:
+                tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        return exported
+
+    def read(self, table_name: str, columns: list[str] | None = None, zero_copy: bool = True) -> pd.DataFrame:
+        """
+        Args:
+            table_name: str
+            Table to read.
+
+            columns: list[str] | None
+            Columns to return; all by default.
+
+            zero_copy: bool
+            Whether to return Arrow-backed columns (pd.ArrowDtype) that share the memory-mapped buffers; otherwise columns are
+            converted to NumPy dtypes, as returned by DBConnection.df_from_sql.
+
+        Returns:
+            df: pd.DataFrame
+            The table; read from the database if the mirror has no file for it or pyarrow is not installed.
+        """
+        if not self.available() or not self._file(table_name).exists():
+            with DBConnection() as conn:
+                df = conn.df_from_sql(table_name)
+            return df[columns] if columns else df
+
+        table = self.read_arrow(table_name, columns)
+        return table.to_pandas(types_mapper=pd.ArrowDtype) if zero_copy else table.to_pandas()
+
+    def read_arrow(self, table_name: str, columns: list[str] | None = None) -> pa.Table:
+        path = self._file(table_name)
+        if not path.exists():
+            raise KeyError(f"No mirror file for table: {table_name}.")
+        table = ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        return table.select(columns) if columns else table
+
+    def is_current(self, conn: DBConnection, table_name: str) -> bool:
+        if not self.available() or not self._file(table_name).exists():
+            return False
+        return self._manifest().get(table_name, {}).get("fingerprint") == self._fingerprint(conn, table_name)
+
+    @classmethod
+    def on_commit(cls, table_names: set[str]) -> None:
+        mirror = cls()
+        if not mirror.available() or not mirror._path.joinpath(MANIFEST_NAME).exists():
+            return  # the mirror is only maintained once created by a first sync()
+        tables = sorted((table_names & model_tables().keys()) - DERIVED_TABLES)
+        if tables:
+            mirror.sync(tables)
+
+    def _export(self, conn: DBConnection, name: str, table: db.Table) -> int:
+        with Metrics.stage("export", name) as record:
+            result = conn._connection.exec_driver_sql(f'SELECT * FROM "{name}"')
+            column_names = list(result.keys())
+            rows = result.fetchall()
+            values = list(zip(*rows)) if rows else [()] * len(column_names)
+
+            fields, arrays = [], []
+            for column_name, column_values in zip(column_names, values):
+                column = table.columns.get(column_name)
+                arrow_type = ARROW_TYPES.get(column.type.python_type) if column is not None else None
+                array = pa.array(column_values, type=arrow_type)
+                fields.append(pa.field(column_name, array.type, nullable=column is None or column.nullable))
+                arrays.append(array)
+            arrow_table = pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+            with self._replacing(self._file(name)) as tmp_path:
+                with pa.OSFile(str(tmp_path), "wb") as sink, ipc.new_file(sink, arrow_table.schema) as writer:
+                    writer.write_table(arrow_table)
+            parquet_path = self._path.joinpath(f"{name}.parquet")
+            if self._parquet or parquet_path.exists():  # Parquet copies, once created, are kept up to date too
+                with self._replacing(parquet_path) as tmp_path:
+                    pq.write_table(arrow_table, str(tmp_path))
+            record.add(rows=len(rows))
+        return len(rows)
+
+    def _file(self, table_name: str) -> Path:
+        return self._path.joinpath(f"{table_name}.arrow")
+
+    def _manifest(self) -> dict[str, Any]:
+        path = self._path.joinpath(MANIFEST_NAME)
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+    @staticmethod
+    def _fingerprint(conn: DBConnection, name: str) -> list[int]:
+        # WITHOUT ROWID tables (e.g. EU_Economic_Sentiment_Long) have no rowid; their fingerprint is the row count only
+        table = model_tables().get(name)
+        max_rowid_sql = "max(rowid)" if table is None or table.dialect_options["sqlite"]["with_rowid"] else "0"
+        count, max_rowid = conn._connection.exec_driver_sql(f'SELECT count(*), {max_rowid_sql} FROM "{name}"').one()
+        return [count, max_rowid or 0]
+
+    @staticmethod
+    @contextmanager
+    def _replacing(path: Path) -> Iterator[Path]:
+        # Write to a temporary file, then replace: readers holding a memory map of the old file are unaffected
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        try:
+            yield tmp_path
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+
+DBConnection.add_commit_hook(ArrowMirror.on_commit)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
@@ -10,13 +13,18 @@ from sqlalchemy.dialects.sqlite import insert
 
 from lisa.utils import find_project_root
 
+from .load_validator import LoadValidator
+from .metrics import Metrics
+from .read_cache import ReadCache, bump_version
+from .search_index import DEFAULT_LIMIT, INDEX_TABLE, SEARCH_SOURCES, SearchIndex
 from .template_logger import TemplateLogger
 
 root = find_project_root(Path(__file__).resolve())
 SQLITE_PATH = root.joinpath("data").joinpath("Leading Indicators and Stocks.db")
 ENGINE = db.create_engine(f"sqlite:///{SQLITE_PATH}")
 METADATA = db.MetaData()
-EXE_LIMIT = 32766
+STAGING_PREFIX = "staging_"
+MAX_STATEMENTS = 128
 
 logger = TemplateLogger(__name__).logger
 
@@ -24,67 +32,284 @@ logger = TemplateLogger(__name__).logger
 class DBConnection:
     """
     Class for handling database operations. Commit and rollback occur when context manager exits.
+    Upserts are recorded as "upsert" stages in Metrics (duration and rows, per table).
+    Before any SQL is issued, all received rows are checked against the table schema by LoadValidator (types, nullability,
+    primary key uniqueness, value ranges); a failed check raises ValueError listing the offending rows.
+    On a primary key conflict, upserts update the received columns only and keep the stored values of the others.
+    Upserts run one parameterized INSERT ... ON CONFLICT statement with executemany; the statement is compiled once per (table
+    schema, received column set) and reused across calls, for the MAX_STATEMENTS most recently used (hits and misses counted
+    in Metrics as statement_cache_hits/statement_cache_misses). Values are converted by the column types' bind processors, as
+    SQLAlchemy would before handing them to the driver.
+    Large loads (e.g. Finviz_Stocks, history backfills) can use the staging load of upsert_rows instead: the rows are bulk
+    inserted into a temporary table, then merged into the target with one set-based INSERT ... SELECT ... ON CONFLICT.
+    Tables written through the connection (upsert_rows, delete_rows, or mark_changed after other writes) get their version in
+    the Table_Versions table incremented within the same transaction, and are passed to the registered commit hooks once the
+    transaction has been committed, e.g. to refresh derived copies of the data.
+    df_from_sql reads through the shared ReadCache, which serves repeated reads of a table until its version changes.
     """
 
+    _commit_hooks: list[Callable[[set[str]], None]] = []
+    _upsert_statements: OrderedDict[tuple, tuple[str, tuple[str, ...]]] = OrderedDict()
+    _upsert_statements_lock = threading.Lock()
+    _analytics_backend: Any = None
+
     def __init__(self) -> None:
         self._connection = ENGINE.connect()
+        self._changed_tables: set[str] = set()
+
+    @classmethod
+    def add_commit_hook(cls, hook: Callable[[set[str]], None]) -> None:
+        """Registers a function called with the names of the changed tables after every commit that changed any."""
+        if hook not in cls._commit_hooks:
+            cls._commit_hooks.append(hook)
+
+    @classmethod
+    def set_analytics_backend(cls, backend: Any) -> None:
+        """Routes analytical_query to a backend with ready(sql) and query(sql, params) methods (e.g. DuckDBBackend); None for SQLite."""
+        cls._analytics_backend = backend
+
+    def analytical_query(self, sql: str, params: Sequence[Any] | None = None) -> pd.DataFrame:
+        """
+        Runs a read-only query (positional parameters written as ?) on the analytics backend if it is ready for the query (e.g.
+        its copies of the tables read are current), else on SQLite.
+        Writes must go through the other methods, which always use SQLite.
+        """
+        backend = DBConnection._analytics_backend
+        if backend is not None and backend.ready(sql):
+            return backend.query(sql, params)
+        return pd.read_sql(sql, self._connection, params=tuple(params or ()))
+
+    def mark_changed(self, table_name: str) -> None:
+        bump_version(self._connection, table_name)
+        self._changed_tables.add(table_name)
+        if table_name in SEARCH_SOURCES:  # the search index triggers wrote to the index as well
+            bump_version(self._connection, INDEX_TABLE)
+            self._changed_tables.add(INDEX_TABLE)
+
+    @contextmanager
+    def savepoint(self) -> Iterator[None]:
+        """
+        Runs the enclosed writes in a savepoint: if they raise, only they are rolled back and the rest of the transaction is kept
+        (the exception propagates). Lets several independent writes share one commit.
+        """
+        if not self._connection.connection.dbapi_connection.in_transaction:
+            # pysqlite only begins transactions before DML; releasing a savepoint outside one would commit straight away
+            self._connection.exec_driver_sql("BEGIN")
+        changed_tables = set(self._changed_tables)
+        try:
+            with self._connection.begin_nested():
+                yield
+        except BaseException:
+            self._changed_tables = changed_tables
+            raise
 
     def upsert_rows(
         self,
         table_name: str,
         data_rows: list[dict[str, Any]],
         delete_first: bool = False,
+        staging: bool = False,
+        delete_missing: bool = False,
     ) -> None:
-        table = db.Table(table_name, METADATA, autoload_with=ENGINE)
-        pk_columns, name_types_dict = self._table_schema(table)
-        incoming_name_types_dict = {name: type(value) for name, value in data_rows[0].items()}
-        self._pre_load_checks(table, incoming_name_types_dict, name_types_dict)
-
-        if delete_first:
-            self._connection.execute(table.delete())
-
-        n_col = len(data_rows[0])
-        n_rows = len(data_rows)
-        chunk_size = EXE_LIMIT // n_col
-        n_chunks = int(n_rows / chunk_size) + (n_rows % chunk_size > 0)
-
-        for i in range(n_chunks):
-            data_rows_i = data_rows[i * chunk_size : (i + 1) * chunk_size]
-            stmt = insert(table).values(data_rows_i)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=pk_columns,
-                set_={c.name: stmt.excluded[c.name] for c in table.columns if c.name not in pk_columns},
-            )
-            self._connection.execute(stmt)
+        """
+        Args:
+            table_name: str
+            Table to upsert into; rows are matched on its primary key.
+
+            data_rows: list[dict[str, Any]]
+            Rows to upsert, all with the same columns. A row whose key is already stored only updates the received columns;
+            stored values of the other columns are kept (the same for direct and staging loads).
+
+            delete_first: bool
+            Whether to delete all rows of the table first.
+
+            staging: bool
+            Whether to load through a temporary staging table (faster for large loads).
+
+            delete_missing: bool
+            Whether to delete rows whose primary key is not among the received rows; requires staging.
+        """
+        if delete_missing and not staging:
+            raise ValueError("Deleting rows missing from received data requires the staging load (staging=True).")
+
+        with Metrics.stage("upsert", table_name, delete_first=delete_first, staging=staging) as record:
+            table = db.Table(table_name, METADATA, autoload_with=self._connection)
+            pk_columns, _ = self._table_schema(table)
+            self._pre_load_checks(table, data_rows)
+
+            self.ensure_search_index(table_name)
+            if delete_first:
+                self._connection.execute(table.delete())
+
+            if staging:
+                self._staged_upsert(table, pk_columns, data_rows, delete_missing)
+            else:
+                self._direct_upsert(table, pk_columns, data_rows)
+            record.add(rows=len(data_rows))
+        self.mark_changed(table_name)
 
         print(f"Successful upsert in {table_name}.")
 
-    def _pre_load_checks(
+    def delete_rows(self, table_name: str, key_rows: list[dict[str, Any]]) -> None:
+        """
+        Args:
+            table_name: str
+            Table to delete from.
+
+            key_rows: list[dict[str, Any]]
+            Primary key values of the rows to delete, one dict per row (other keys are ignored).
+        """
+        if not key_rows:
+            return
+        with Metrics.stage("delete", table_name) as record:
+            table = db.Table(table_name, METADATA, autoload_with=self._connection)
+            pk_columns, _ = self._table_schema(table)
+            missing_columns = self._missing_columns(key_rows[0].keys(), pk_columns)
+            if missing_columns:
+                raise KeyError(f"Primary key columns missing from received keys: {sorted(missing_columns)}.")
+
+            self.ensure_search_index(table_name)
+            stmt = table.delete().where(*[table.c[c] == db.bindparam(f"key_{c}") for c in pk_columns])
+            self._connection.execute(stmt, [{f"key_{c}": row[c] for c in pk_columns} for row in key_rows])
+            record.add(rows=len(key_rows))
+        self.mark_changed(table_name)
+
+    def _direct_upsert(self, table: db.Table, pk_columns: list[str], data_rows: list[dict[str, Any]]) -> None:
+        sql, keys = self._upsert_statement(table, pk_columns, tuple(data_rows[0]))
+        self._connection.exec_driver_sql(sql, self._parameters(table, keys, data_rows))
+
+    @classmethod
+    def _upsert_statement(
+        cls, table: db.Table, pk_columns: list[str], columns: tuple[str, ...]
+    ) -> tuple[str, tuple[str, ...]]:
+        """Returns the SQL of the upsert statement for a column set, and the order of its parameters; compiled once."""
+        # SQLAlchemy's compiled cache does not take the SQLite ON CONFLICT construct, so compiled statements are kept here
+        key = (table.name, tuple((c.name, repr(c.type)) for c in table.columns), columns)
+        with cls._upsert_statements_lock:
+            cached = cls._upsert_statements.get(key)
+            if cached is not None:
+                cls._upsert_statements.move_to_end(key)
+        Metrics.count("statement_cache_misses" if cached is None else "statement_cache_hits", table.name)
+        if cached is None:
+            stmt = insert(table)
+            updates = {c: stmt.excluded[c] for c in columns if c not in pk_columns}
+            if updates:
+                stmt = stmt.on_conflict_do_update(index_elements=pk_columns, set_=updates)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=pk_columns)
+            compiled = stmt.compile(dialect=ENGINE.dialect, column_keys=list(columns))
+            cached = (compiled.string, tuple(compiled.positiontup))
+            with cls._upsert_statements_lock:
+                cls._upsert_statements[key] = cached
+                while len(cls._upsert_statements) > MAX_STATEMENTS:
+                    cls._upsert_statements.popitem(last=False)
+        return cached
+
+    @staticmethod
+    def _parameters(table: db.Table, columns: Sequence[str], data_rows: list[dict[str, Any]]) -> list[tuple]:
+        """Returns the rows as driver parameters in column order, converted by the column types' bind processors."""
+        processors = [
+            (i, processor)
+            for i, c in enumerate(columns)
+            if (processor := table.columns[c].type.dialect_impl(ENGINE.dialect).bind_processor(ENGINE.dialect))
+        ]
+        if not processors:
+            return [tuple(row[c] for c in columns) for row in data_rows]
+        parameters = []
+        for row in data_rows:
+            values = [row[c] for c in columns]
+            for i, processor in processors:
+                values[i] = processor(values[i])
+            parameters.append(tuple(values))
+        return parameters
+
+    def _staged_upsert(
         self,
         table: db.Table,
-        incoming_name_types_dict: dict[str, Any],
-        name_types_dict: dict[str, Any],
+        pk_columns: list[str],
+        data_rows: list[dict[str, Any]],
+        delete_missing: bool,
     ) -> None:
-        new_columns = self._new_columns(incoming_name_types_dict.keys(), name_types_dict.keys())
-        if new_columns:
-            raise ValueError(
-                f"Received column names must match column names in table: {table.name}.\nNew columns not in database:\n{sorted(list(new_columns))}."
+        # Plain driver statements: one executemany into the staging table, then set-based statements into the target
+        columns = list(data_rows[0])
+        target, staging = _quoted(table.name), _quoted(f"{STAGING_PREFIX}{table.name}")
+        column_list = ", ".join(_quoted(c) for c in columns)
+        key_list = ", ".join(_quoted(c) for c in pk_columns)
+        execute = self._connection.exec_driver_sql
+
+        execute(f"DROP TABLE IF EXISTS temp.{staging}")  # left behind by a failed load on this pooled connection
+        execute(f"CREATE TEMP TABLE {staging} AS SELECT {column_list} FROM main.{target} WHERE 0")
+        execute(
+            f"INSERT INTO temp.{staging} ({column_list}) VALUES ({', '.join('?' * len(columns))})",
+            self._parameters(table, columns, data_rows),
+        )
+
+        updates = ", ".join(f"{_quoted(c)} = excluded.{_quoted(c)}" for c in columns if c not in pk_columns)
+        # "WHERE true" resolves SQLite's parsing ambiguity between a join constraint and the upsert clause
+        execute(
+            f"INSERT INTO main.{target} ({column_list}) SELECT {column_list} FROM temp.{staging} WHERE true "
+            f"ON CONFLICT ({key_list}) DO {f'UPDATE SET {updates}' if updates else 'NOTHING'}"
+        )
+        if delete_missing:
+            execute(f"CREATE INDEX temp.{_quoted(f'ix_{STAGING_PREFIX}{table.name}')} ON {staging} ({key_list})")
+            matches = " AND ".join(f"s.{_quoted(c)} = {target}.{_quoted(c)}" for c in pk_columns)
+            deleted = execute(
+                f"DELETE FROM main.{target} WHERE NOT EXISTS (SELECT 1 FROM temp.{staging} s WHERE {matches})"
             )
+            logger.info(f"Deleted {deleted.rowcount} rows missing from received data in {table.name}.")
+        execute(f"DROP TABLE temp.{staging}")
 
-        missing_columns = self._missing_columns(incoming_name_types_dict.keys(), name_types_dict.keys())
+    def _pre_load_checks(self, table: db.Table, data_rows: list[dict[str, Any]]) -> None:
+        missing_columns = self._missing_columns(data_rows[0].keys(), (c.name for c in table.columns))
         if missing_columns:
             logger.warning(
                 f"The following columns exist in database but are missing from received data:\n{sorted(list(missing_columns))}"
             )
+        with Metrics.stage("validate", table.name) as record:
+            LoadValidator(table).validate(data_rows)
+            record.add(rows=len(data_rows))
 
-        type_mismatches = self._mismatching_types(incoming_name_types_dict, name_types_dict)
-        if type_mismatches:
-            raise ValueError(
-                f"Received column types must match column types in table: {table.name}.\nMismatches:\n{type_mismatches}"
-            )
+    def df_from_sql(
+        self, table_name: str, sql: str | None = None, params: Sequence[Any] | None = None, cache: bool = True
+    ) -> pd.DataFrame:
+        """
+        Args:
+            table_name: str
+            Table to read.
+
+            sql: str | None
+            Query reading only that table, with positional parameters written as ?; the whole table by default.
+
+            params: Sequence[Any] | None
+            Query parameters.
+
+            cache: bool
+            Whether to read through the shared ReadCache, which re-reads the table only after a write to it (see ReadCache).
+
+        Returns:
+            df: pd.DataFrame
+            Committed data only: rows written by this connection's open transaction are not included.
+        """
+        if cache:
+            return ReadCache.default().read(ENGINE, table_name, sql, params)
+        if sql is None:
+            return pd.read_sql_table(table_name, ENGINE)
+        return pd.read_sql(sql, ENGINE, params=tuple(params or ()))
 
-    def df_from_sql(self, table_name: str) -> pd.DataFrame:
-        return pd.read_sql_table(table_name, ENGINE)
+    def ensure_table(self, model: type) -> None:
+        """
+        Creates the table of a model if missing, on this connection and within its transaction: upsert_rows reflects tables on the
+        same connection, and no second connection competes for SQLite's write lock (e.g. inside a write-behind batch).
+        """
+        model.__table__.create(self._connection, checkfirst=True)
+
+    def ensure_search_index(self, table_name: str) -> None:
+        if SearchIndex(self._connection).ensure(table_name):
+            self.mark_changed(INDEX_TABLE)
+
+    def search(self, query: str, sources: list[str] | None = None, limit: int = DEFAULT_LIMIT) -> pd.DataFrame:
+        """Returns ranked full-text matches from the ISM report commentary and stock descriptions; see SearchIndex.search."""
+        return SearchIndex(self._connection).search(query, sources=sources, limit=limit)
 
     def __enter__(self):
         return self
@@ -95,6 +320,16 @@ class DBConnection:
         else:
             self._connection.rollback()
         self._connection.close()
+        if exc_type is None and self._changed_tables:
+            self._run_commit_hooks(self._changed_tables)
+
+    @classmethod
+    def _run_commit_hooks(cls, table_names: set[str]) -> None:
+        for hook in cls._commit_hooks:
+            try:
+                hook(set(table_names))
+            except Exception:
+                logger.exception(f"Error in commit hook {hook.__qualname__} for tables: {sorted(table_names)}")
 
     @staticmethod
     def _table_schema(table: db.Table) -> tuple[list[str], dict[str, Any]]:
@@ -102,32 +337,13 @@ class DBConnection:
         types_dict = {c.name: c.type.python_type for c in table.columns}
         return primary_keys, types_dict
 
-    @staticmethod
-    def _new_columns(incoming_columns: Iterable, expected_columns: Iterable) -> set[str]:
-        return set(incoming_columns) - set(expected_columns)
-
     @staticmethod
     def _missing_columns(incoming_columns: Iterable, expected_columns: Iterable) -> set[str]:
         return set(expected_columns) - set(incoming_columns)
 
-    @staticmethod
-    def _mismatching_types(
-        incoming_types_dict: dict[str, Any], expected_types_dict: dict[str, Any]
-    ) -> list[dict[str, Any]]:
-        mismatches = [
-            {
-                "Column": name,
-                "Received type": typ,
-                "Required type": expected_types_dict[name],
-            }
-            for name, typ in incoming_types_dict.items()
-            if typ
-            not in {
-                type(None),
-                expected_types_dict[name],
-                int
-                if expected_types_dict[name] is float
-                else type(None),  # relaxation: accept integers when floats expected; not vice versa
-            }
-        ]
-        return mismatches
+
+def _quoted(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+DBConnection.add_commit_hook(ReadCache.on_commit)
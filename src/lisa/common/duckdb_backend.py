@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+import pandas as pd
+
+from lisa.database_model import EU_Economic_Sentiment, Table_Versions
+
+from .arrow_mirror import ArrowMirror, model_tables
+from .db_connection import SQLITE_PATH, DBConnection
+from .metrics import Metrics
+from .read_cache import table_version
+from .template_logger import TemplateLogger
+
+try:
+    import duckdb
+except ImportError:  # optional dependency: pip install duckdb
+    duckdb = None
+
+DUCKDB_PATH = SQLITE_PATH.with_suffix(".duckdb")
+MODES = ("copy", "attach")
+VERSIONS_TABLE = "lisa_table_versions"  # SQLite table version (see Table_Versions) of each copied table
+PANDAS_TYPES = MappingProxyType({int: "Int64", float: "float64", str: "string", bool: "boolean"})
+ESI_COLUMNS = tuple(c.name for c in EU_Economic_Sentiment.__table__.columns if c.name.endswith("_esi"))
+
+# Typical dashboard queries, valid in both SQLite and DuckDB
+DASHBOARD_QUERIES = MappingProxyType(
+    {
+        "esi_yearly_means": (
+            f"SELECT year, {', '.join(f'AVG({c}) AS {c}' for c in ESI_COLUMNS)} "
+            "FROM EU_Economic_Sentiment GROUP BY year ORDER BY year"
+        ),
+        "esi_latest_cross_section": (
+            f"SELECT {', '.join(ESI_COLUMNS)} FROM EU_Economic_Sentiment "
+            "WHERE year * 12 + month = (SELECT MAX(year * 12 + month) FROM EU_Economic_Sentiment)"
+        ),
+        "sector_summary": (
+            "SELECT s.sector, COUNT(*) AS n_stocks, SUM(f.market_cap_m_usd) AS market_cap_m_usd, "
+            "AVG(f.p_e) AS p_e, AVG(f.dividend_pct) AS dividend_pct "
+            "FROM Finviz_Stocks f JOIN GICS_Sectors s ON s.id = f.gics_sector_id "
+            "GROUP BY s.sector ORDER BY market_cap_m_usd DESC"
+        ),
+        "industry_leaders": (
+            "SELECT s.sector, i.industry, f.ticker, f.market_cap_m_usd "
+            "FROM Finviz_Stocks f "
+            "JOIN (SELECT gics_industry_id, MAX(market_cap_m_usd) AS max_cap FROM Finviz_Stocks GROUP BY gics_industry_id) m "
+            "ON m.gics_industry_id = f.gics_industry_id AND m.max_cap = f.market_cap_m_usd "
+            "JOIN GICS_Industries i ON i.id = f.gics_industry_id "
+            "JOIN GICS_Sectors s ON s.id = i.sector_id "
+            "ORDER BY s.sector, i.industry"
+        ),
+    }
+)
+
+logger = TemplateLogger(__name__).logger
+
+
+class DuckDBBackend:
+    """
+    Class for running read-only analytical queries on DuckDB, while all writes stay on SQLite.
+    Two modes:
+        - "copy" (default): DuckDB keeps columnar copies of the model tables in data/<database name>.duckdb, together with
+          the SQLite table version (see Table_Versions) each copy was taken at. sync() creates the copies and re-copies the
+          tables whose version has changed, from the Arrow mirror where it is up to date, otherwise from SQLite. A query is
+          only routed to DuckDB while the copies of all tables it reads are at the current version; otherwise it runs on SQLite.
+        - "attach": the SQLite file is attached read-only through DuckDB's sqlite extension; always current, but scans still
+          read SQLite's row format.
+    Queries use a read-only DuckDB connection; sync() opens the file for writing and closes it when done (DuckDB allows one
+    read-write connection to a file, and none while other processes have it open).
+    Importing this module registers a copy-mode backend with DBConnection, so that DBConnection.analytical_query uses DuckDB
+    for the tables whose copies are current. Requires duckdb; without it, analytical queries run on SQLite.
+
+    Methods:
+        available: Returns whether duckdb is installed.
+        ready: Returns whether a query can be routed to DuckDB (installed, and in copy mode, the copies it reads are current).
+        sync: Creates or refreshes the columnar copies; returns the names of the copied tables.
+        query: Runs a read-only query; returns a DataFrame.
+        benchmark: Times queries on SQLite and DuckDB; returns the timings per query.
+        close: Closes the DuckDB connection.
+    """
+
+    def __init__(self, mode: str = "copy", path: Path = DUCKDB_PATH) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Mode must be one of {list(MODES)}; received: {mode}.")
+        self._mode = mode
+        self._path = Path(path)
+        self._connection = None
+        self._read_only = True
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return duckdb is not None
+
+    def ready(self, sql: str | None = None) -> bool:
+        """
+        Args:
+            sql: str | None
+            Query to route; its tables must have current copies. By default, all copied tables must be current.
+
+        Returns:
+            ready: bool
+            Whether the query can run on DuckDB with the same result as on SQLite.
+        """
+        if not self._usable():
+            return False
+        if self._mode == "attach":
+            return True
+        try:
+            with self._lock:
+                connection = self._connect()
+                copied = self._copied_versions(connection)
+                tables = connection.get_table_names(sql) if sql else set(copied)
+        except duckdb.Error:
+            logger.exception(f"Error in reading the DuckDB copy: {self._path}")
+            return False  # e.g. the file is being synced by another process
+        if not tables or not tables <= copied.keys():
+            return False
+        with DBConnection() as conn:
+            return all(table_version(conn._connection, name) == copied[name] for name in tables)
+
+    def sync(self, tables: list[str] | None = None) -> list[str]:
+        """
+        Args:
+            tables: list[str] | None
+            Tables to copy; by default, all model tables present in SQLite whose copy is missing or not at their version.
+
+        Returns:
+            copied: list[str]
+            Names of the copied tables.
+        """
+        if self._mode != "copy":
+            raise ValueError("Only the copy mode keeps tables to sync.")
+        if not self.available():
+            raise ImportError("The DuckDB backend requires duckdb; install it with: pip install duckdb")
+
+        known_tables = model_tables()
+        unknown_tables = set(tables or []) - known_tables.keys()
+        if unknown_tables:
+            raise KeyError(f"Tables not in lisa.database_model: {sorted(unknown_tables)}.")
+
+        mirror = ArrowMirror()
+        copied = []
+        try:
+            with DBConnection() as conn:
+                existing = set(
+                    conn._connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'").scalars()
+                )
+                with self._lock:
+                    copied_versions = self._copied_versions(self._connect(read_only=False))
+                for name, table in known_tables.items():
+                    if (
+                        (tables is not None and name not in tables)
+                        or name not in existing
+                        or name == Table_Versions.name()
+                    ):
+                        continue
+                    # The version is read before the data: a write committed in between only makes the copy look stale
+                    version = table_version(conn._connection, name)
+                    if tables is None and copied_versions.get(name) == version:
+                        continue
+                    with Metrics.stage("duckdb_copy", name) as record:
+                        if mirror.is_current(conn, name):
+                            data = mirror.read_arrow(name)
+                        else:
+                            result = conn._connection.exec_driver_sql(f'SELECT * FROM "{name}"')
+                            data = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+                            data = data.astype(
+                                {
+                                    c.name: PANDAS_TYPES[c.type.python_type]
+                                    for c in table.columns
+                                    if c.name in data.columns
+                                }
+                            )
+                        with self._lock:
+                            connection = self._connect(read_only=False)
+                            connection.register("incoming", data)
+                            connection.execute(f'CREATE OR REPLACE TABLE "{name}" AS SELECT * FROM incoming')
+                            connection.unregister("incoming")
+                            connection.execute(
+                                f"INSERT OR REPLACE INTO {VERSIONS_TABLE} VALUES (?, ?)", [name, version]
+                            )
+                        record.add(rows=len(data))
+                    copied.append(name)
+        finally:
+            self.close()  # release the write access; queries reopen the file read-only
+        return copied
+
+    def query(self, sql: str, params: Sequence[Any] | None = None) -> pd.DataFrame:
+        """
+        Args:
+            sql: str
+            A single SELECT statement (read-only); positional parameters are written as ?.
+
+            params: Sequence[Any] | None
+            Values of the positional parameters.
+
+        Returns:
+            df: pd.DataFrame
+            The query result.
+        """
+        if not self._usable():
+            raise RuntimeError(
+                f"DuckDB backend is not ready (mode: {self._mode}); install duckdb and/or run sync() first."
+            )
+        with self._lock:
+            connection = self._connect()
+            statements = connection.extract_statements(sql)
+            if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+                raise ValueError(f"Only single, read-only SELECT statements can be routed to DuckDB; received:\n{sql}")
+            with Metrics.stage("query", "duckdb"):
+                return connection.execute(sql, params or []).df()
+
+    def benchmark(self, queries: dict[str, str] | None = None, repeat: int = 5) -> pd.DataFrame:
+        """
+        Args:
+            queries: dict[str, str] | None
+            Queries to time, by name; DASHBOARD_QUERIES by default.
+
+            repeat: int
+            Runs per query and backend; the best time is reported.
+
+        Returns:
+            timings: pd.DataFrame
+            Best time in milliseconds on SQLite and DuckDB, the speed-up, and whether both returned the same number of rows.
+        """
+        queries = queries or DASHBOARD_QUERIES
+        rows = []
+        for name, sql in queries.items():
+            with DBConnection() as conn:
+                sqlite_ms, sqlite_df = _best_time(lambda: pd.read_sql(sql, conn._connection), repeat)
+            duckdb_ms, duckdb_df = _best_time(lambda: self.query(sql), repeat)
+            rows.append(
+                {
+                    "query": name,
+                    "sqlite_ms": sqlite_ms,
+                    "duckdb_ms": duckdb_ms,
+                    "speed_up": sqlite_ms / duckdb_ms if duckdb_ms else float("nan"),
+                    "same_rows": len(sqlite_df) == len(duckdb_df),
+                }
+            )
+        return pd.DataFrame(rows).set_index("query")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _usable(self) -> bool:
+        return self.available() and (self._mode == "attach" or self._path.exists())
+
+    def _connect(self, read_only: bool = True) -> duckdb.DuckDBPyConnection:
+        if self._connection is not None and (self._mode == "attach" or self._read_only == read_only):
+            return self._connection
+        if self._connection is not None:
+            self._connection.close()  # DuckDB does not open a file twice in one process with different access modes
+            self._connection = None
+        if self._mode == "copy":
+            self._connection = duckdb.connect(str(self._path), read_only=read_only)
+            self._read_only = read_only
+            if not read_only:
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {VERSIONS_TABLE} (table_name VARCHAR PRIMARY KEY, version BIGINT)"
+                )
+        else:
+            self._connection = duckdb.connect()
+            try:
+                self._connection.execute("INSTALL sqlite; LOAD sqlite;")
+                self._connection.execute(f"ATTACH '{SQLITE_PATH}' AS lisa (TYPE SQLITE, READ_ONLY); USE lisa;")
+            except duckdb.Error:
+                self._connection.close()
+                self._connection = None
+                logger.exception(f"Error in attaching the SQLite database to DuckDB: {SQLITE_PATH}")
+                raise
+        return self._connection
+
+    @staticmethod
+    def _copied_versions(connection: duckdb.DuckDBPyConnection) -> dict[str, int]:
+        try:
+            return dict(connection.execute(f"SELECT table_name, version FROM {VERSIONS_TABLE}").fetchall())
+        except duckdb.CatalogException:
+            return {}  # copy made before versions were recorded: every table is synced again
+
+
+def _best_time(func: Any, repeat: int) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+if duckdb is not None:
+    DBConnection.set_analytics_backend(DuckDBBackend())
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as db
+
+from .template_logger import TemplateLogger
+
+# Python types accepted per column type; integers are accepted where floats are expected, not vice versa
+ACCEPTED_TYPES = MappingProxyType({int: (int,), float: (float, int), str: (str,), bool: (bool,)})
+# Inclusive value bounds by column name, applied to every table that has the column
+VALUE_RANGES = MappingProxyType({"year": (1900, 2100), "month": (1, 12)})
+REPORT_ROWS = 20
+
+logger = TemplateLogger(__name__).logger
+
+
+class LoadValidator:
+    """
+    Class for validating incoming rows against a table's schema before any SQL is issued, so that a bad value in row 5,000 fails
+    the load up front instead of mid-transaction. Every column is checked as a whole:
+        - type: each value is None/NaN or of the Python type the column expects (bool is not taken for int).
+        - nullability: non-nullable columns hold no None/NaN, and none is missing from the received data.
+        - primary key: every key column is received (unless SQLite generates it, as a rowid alias), and no two received rows
+          share a key.
+        - range: numeric values are finite, and within VALUE_RANGES for the columns listed there.
+    Columns of one type are checked with a single pass over the values; rows are only located for the report when a column fails.
+
+    Methods:
+        report: Returns the failed checks, one row per offending received row and column.
+        validate: Raises ValueError with a summary and the first offending rows if any check fails.
+    """
+
+    def __init__(self, table: db.Table) -> None:
+        self._table = table
+
+    def report(self, data: pd.DataFrame | list[dict[str, Any]]) -> pd.DataFrame:
+        """
+        Args:
+            data: pd.DataFrame | list[dict[str, Any]]
+            Received rows, with the table's column names.
+
+        Returns:
+            report: pd.DataFrame
+            Columns: row (position in the received data), column, check ("type", "null", "missing", "duplicate key" or
+            "range") and value. Empty if all checks pass.
+        """
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data, dtype=object)
+        df = df.reset_index(drop=True)
+        columns = {c.name: c for c in self._table.columns}
+
+        unknown_columns = set(df.columns) - columns.keys()
+        if unknown_columns:
+            raise ValueError(
+                f"Received column names must match column names in table: {self._table.name}.\nNew columns not in database:\n{sorted(unknown_columns)}."
+            )
+
+        findings = []
+        for name, column in columns.items():
+            if name not in df.columns:
+                generated = column.server_default is not None or column is self._table.autoincrement_column
+                if (not column.nullable or column.primary_key) and not generated:
+                    findings.append(pd.DataFrame({"row": [pd.NA], "column": name, "check": "missing", "value": None}))
+                continue
+
+            values = df[name].to_numpy(dtype=object)
+            is_null = pd.isna(values)
+            python_type = column.type.python_type
+            wrong_type = self._wrong_types(values, is_null, ACCEPTED_TYPES.get(python_type, (python_type,)))
+            findings.append(self._findings(name, values, wrong_type, "type"))
+            if not column.nullable:
+                findings.append(self._findings(name, values, is_null, "null"))
+            if python_type in (int, float):
+                findings.append(
+                    self._findings(name, values, self._out_of_range(name, values, is_null | wrong_type), "range")
+                )
+
+        # Duplicates are only meaningful on the full key; a missing key column is reported above
+        pk_columns = [c.name for c in self._table.primary_key]
+        if pk_columns and set(pk_columns).issubset(df.columns):
+            duplicated = df.duplicated(subset=pk_columns, keep=False).to_numpy()
+            if duplicated.any():
+                keys = df[pk_columns].astype(str).agg(", ".join, axis=1).to_numpy(dtype=object)
+                findings.append(self._findings(", ".join(pk_columns), keys, duplicated, "duplicate key"))
+
+        findings = [f for f in findings if f is not None]
+        if not findings:
+            return pd.DataFrame(columns=["row", "column", "check", "value"])
+        return pd.concat(findings, ignore_index=True)
+
+    def validate(self, data: pd.DataFrame | list[dict[str, Any]]) -> None:
+        report = self.report(data)
+        if report.empty:
+            return
+        counts = report.groupby(["check", "column"], sort=False).size()
+        summary = "\n".join(f"{check} ({column}): {n} rows" for (check, column), n in counts.items())
+        raise ValueError(
+            f"Received data failed validation against table: {self._table.name}.\n{summary}\n"
+            f"First offending rows:\n{report.head(REPORT_ROWS).to_string(index=False)}"
+        )
+
+    @staticmethod
+    def _wrong_types(values: np.ndarray, is_null: np.ndarray, accepted: tuple[type, ...]) -> np.ndarray:
+        # One pass collecting the distinct types; positions are only computed if an unexpected type occurs
+        if set(map(type, values[~is_null])).issubset(accepted):
+            return np.zeros(len(values), dtype=bool)
+        return ~is_null & ~pd.Series(map(type, values), dtype=object).isin(accepted).to_numpy()
+
+    @staticmethod
+    def _out_of_range(name: str, values: np.ndarray, skip: np.ndarray) -> np.ndarray:
+        numbers = np.full(len(values), np.nan)
+        numbers[~skip] = values[~skip].astype(float)
+        low, high = VALUE_RANGES.get(name, (-np.inf, np.inf))
+        with np.errstate(invalid="ignore"):
+            return np.isinf(numbers) | (numbers < low) | (numbers > high)
+
+    @staticmethod
+    def _findings(name: str, values: np.ndarray, mask: np.ndarray, check: str) -> pd.DataFrame | None:
+        if not mask.any():
+            return None
+        rows = np.flatnonzero(mask)
+        return pd.DataFrame({"row": rows, "column": name, "check": check, "value": values[rows]})
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import MappingProxyType
+
+import pandas as pd
+import sqlalchemy as db
+
+from . import db_connection
+from .arrow_mirror import model_tables
+from .db_connection import DBConnection
+from .metrics import Metrics
+from .template_logger import TemplateLogger
+
+MIN_FREE_PCT = 10.0
+AUTO_VACUUM_MODES = MappingProxyType({0: "none", 1: "full", 2: "incremental"})
+
+logger = TemplateLogger(__name__).logger
+
+
+class Maintenance:
+    """
+    Class for database upkeep, meant to run after each refresh (ReleaseScheduler.run does so when anything was loaded).
+        - Indexes: creates the secondary indexes declared in the models' __table_args__ that are missing from existing tables
+          (tables created since get them with the table). Monthly tables need none: their (year, month) primary key serves
+          month ranges, as long as queries compare year and month columns rather than an expression of them.
+        - Statistics: runs PRAGMA optimize, which re-analyzes tables whose statistics are stale, or a full ANALYZE when the
+          database has no statistics yet, so that the query planner picks the indexes.
+        - Space: reloads with delete_first leave free pages behind that SQLite never returns to the file system by default.
+          vacuum(convert=True) switches the database to incremental auto-vacuum, a one-off full VACUUM that rewrites the whole
+          file and locks it meanwhile, so it is never done implicitly. From then on, free pages are released with
+          PRAGMA incremental_vacuum once they exceed min_free_pct of the file.
+        - Report: size, unused space and fragmentation per table and index, from SQLite's dbstat virtual table.
+
+    Methods:
+        run: Runs the steps below; returns the report (or None with report=False).
+        ensure_indexes: Creates missing secondary indexes; returns their names.
+        optimize: Refreshes the query planner statistics.
+        vacuum: Releases free pages; returns the number of pages released.
+        report: Returns the size and fragmentation report.
+    """
+
+    def run(self, vacuum: bool = True, report: bool = True) -> pd.DataFrame | None:
+        self.ensure_indexes()
+        self.optimize()
+        if vacuum:
+            self.vacuum()
+        return self.report() if report else None
+
+    def ensure_indexes(self, tables: list[str] | None = None) -> list[str]:
+        known_tables = model_tables()
+        unknown_tables = set(tables or []) - known_tables.keys()
+        if unknown_tables:
+            raise KeyError(f"Tables not in lisa.database_model: {sorted(unknown_tables)}.")
+
+        created = []
+        with Metrics.stage("maintenance", "indexes"), DBConnection() as conn:
+            existing = dict(conn._connection.exec_driver_sql("SELECT name, type FROM sqlite_master").all())
+            for table_name, table in known_tables.items():
+                if (tables is not None and table_name not in tables) or existing.get(table_name) != "table":
+                    continue
+                for index in sorted(table.indexes, key=lambda i: i.name):
+                    if index.name not in existing:
+                        index.create(conn._connection)
+                        created.append(index.name)
+        if created:
+            logger.info(f"Created secondary indexes: {created}")
+        return created
+
+    def optimize(self, full: bool = False) -> None:
+        """
+        Args:
+            full: bool
+            Whether to re-analyze every table and index instead of only those whose statistics are stale.
+        """
+        with Metrics.stage("maintenance", "optimize"), DBConnection() as conn:
+            has_stats = conn._connection.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            ).first()
+            conn._connection.exec_driver_sql("ANALYZE" if full or not has_stats else "PRAGMA optimize")
+
+    def vacuum(self, min_free_pct: float = MIN_FREE_PCT, pages: int | None = None, convert: bool = False) -> int:
+        """
+        Args:
+            min_free_pct: float
+            Free pages, as a percentage of all pages, from which they are released.
+
+            pages: int | None
+            Maximum number of pages to release; all free pages by default.
+
+            convert: bool
+            Whether to switch a database without auto-vacuum to incremental auto-vacuum (a full VACUUM, rewriting the file and
+            releasing all free pages); without it, such a database is left unchanged.
+
+        Returns:
+            released: int
+            Number of pages released.
+        """
+        with Metrics.stage("maintenance", "vacuum"), self._autocommit() as conn:
+            mode = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+            page_count, free_count = self._page_counts(conn)
+            due = free_count and free_count / page_count * 100 >= min_free_pct
+            if mode == 0 and convert:
+                # Switching to incremental auto-vacuum only takes effect with a full rebuild of the file
+                logger.info(f"Converting database to incremental auto-vacuum; rebuilding {page_count} pages.")
+                conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.exec_driver_sql("VACUUM")
+            elif mode == 0 and due:
+                logger.info(
+                    f"{free_count} of {page_count} pages are free, but auto-vacuum is off; "
+                    "vacuum(convert=True) switches the database to incremental auto-vacuum."
+                )
+            elif mode == 2 and due:
+                conn.exec_driver_sql(f"PRAGMA incremental_vacuum({int(pages) if pages else 0})").all()
+            new_page_count, _ = self._page_counts(conn)
+        released = page_count - new_page_count
+        if released:
+            logger.info(f"Vacuum released {released} of {page_count} pages (auto-vacuum: {AUTO_VACUUM_MODES[mode]}).")
+        return released
+
+    def report(self) -> pd.DataFrame:
+        """
+        Returns:
+            report: pd.DataFrame
+            One row per table and index (name, type, table, pages, size_kib, unused_pct, fragmentation_pct), largest first,
+            followed by a "(free pages)" row for pages not used by any table or index. unused_pct is the share of their pages'
+            bytes holding no data; fragmentation_pct is the share of pages not stored right after their predecessor in the
+            b-tree, i.e. read out of order in a full scan.
+        """
+        with Metrics.stage("maintenance", "report"), DBConnection() as conn:
+            page_size = conn._connection.exec_driver_sql("PRAGMA page_size").scalar()
+            _, free_count = self._page_counts(conn._connection)
+            try:
+                pages = pd.read_sql(
+                    'SELECT d.name, m.type, m.tbl_name AS "table", d.pageno, d.pgsize, d.unused FROM dbstat d '
+                    "LEFT JOIN sqlite_master m ON m.name = d.name ORDER BY d.name, d.path",
+                    conn._connection,
+                )
+            except db.exc.OperationalError:
+                logger.exception("SQLite build does not provide the dbstat virtual table; size report is disabled.")
+                pages = pd.DataFrame(columns=["name", "type", "table", "pageno", "pgsize", "unused"])
+
+        pages["type"] = pages["type"].fillna("table")  # sqlite_schema itself is not listed in sqlite_master
+        pages["table"] = pages["table"].fillna(pages["name"])
+        pages["out_of_order"] = pages.groupby("name")["pageno"].diff().fillna(1).ne(1)
+        report = pages.groupby(["name", "type", "table"], as_index=False).agg(
+            pages=("pageno", "size"),
+            size=("pgsize", "sum"),
+            unused=("unused", "sum"),
+            out_of_order=("out_of_order", "sum"),
+        )
+        report = pd.DataFrame(
+            {
+                "name": report["name"],
+                "type": report["type"],
+                "table": report["table"],
+                "pages": report["pages"],
+                "size_kib": report["size"] / 1024,
+                "unused_pct": report["unused"] / report["size"] * 100,
+                "fragmentation_pct": report["out_of_order"] / report["pages"] * 100,
+            }
+        ).sort_values("size_kib", ascending=False, ignore_index=True)
+        free = {
+            "name": "(free pages)",
+            "type": "",
+            "table": "",
+            "pages": free_count,
+            "size_kib": free_count * page_size / 1024,
+        }
+        return pd.concat([report, pd.DataFrame([free])], ignore_index=True)
+
+    @staticmethod
+    def _page_counts(conn: db.Connection) -> tuple[int, int]:
+        page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+        free_count = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        return page_count, free_count
+
+    @staticmethod
+    @contextmanager
+    def _autocommit() -> Iterator[db.Connection]:
+        # VACUUM cannot run inside a transaction
+        with db_connection.ENGINE.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            yield conn
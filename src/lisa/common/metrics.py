@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .template_logger import folder_path
+
+JSONL_PATH = folder_path.joinpath("metrics.jsonl")
+PROMETHEUS_PATH = folder_path.joinpath("metrics.prom")
+JSONL_ROTATION_SIZE = 5 * 1024 * 1024
+MAX_PENDING = 10_000  # records kept for the next flush; older ones are dropped (and counted) beyond that
+PREFIX = "lisa"
+STAGE_FIELDS = ("bytes", "rows", "retries")
+
+
+class StageRecord:
+    """
+    Measurements of one run of a pipeline stage; yielded by Metrics.stage so that the stage body can add byte, row and retry
+    counts as they become known.
+    """
+
+    def __init__(self, stage: str, source: str, labels: dict[str, Any]) -> None:
+        self.stage = stage
+        self.source = source
+        self.labels = labels
+        self.counts = dict.fromkeys(STAGE_FIELDS, 0)
+        self.ok = True
+
+    def add(self, **counts: int) -> None:
+        unknown = counts.keys() - self.counts.keys()
+        if unknown:
+            raise KeyError(f"Stage counts must be among {list(STAGE_FIELDS)}; received: {sorted(unknown)}.")
+        for name, value in counts.items():
+            self.counts[name] += int(value)
+
+    def fail(self) -> None:
+        self.ok = False
+
+
+class Metrics:
+    """
+    Class for lightweight instrumentation of the pipeline stages (fetch, parse, transform, load) and of caches.
+    Every stage run is timed with a monotonic clock and kept as a record (duration, bytes, rows, retries, success); records are
+    also aggregated per (source, stage). Counters track anything else, such as cache hits and misses.
+    Nothing is written to disk unless configure() is called (e.g. by a scheduled job): flush() then appends the pending records
+    to logs/metrics.jsonl and writes the aggregates to logs/metrics.prom (Prometheus text exposition format), and also runs at
+    interpreter exit. At most MAX_PENDING records are kept between flushes; older ones are dropped and counted.
+
+    Methods:
+        stage: Context manager timing one run of a stage; yields its StageRecord.
+        configure: Sets the output files and enables flushing, including at interpreter exit.
+        timed: Decorator timing every call of a function as a stage (until a returned Future resolves); counts result rows.
+        count: Increments a counter.
+        summary: Returns the aggregates per source and stage as a DataFrame.
+        prometheus: Returns the aggregates and counters in Prometheus text format.
+        flush: Appends pending records as JSON lines and rewrites the Prometheus file, if configured.
+        reset: Clears all records, aggregates and counters.
+    """
+
+    _lock = threading.Lock()
+    _pending: deque[dict[str, Any]] = deque(maxlen=MAX_PENDING)
+    _paths: tuple[Path, Path] | None = None
+    _stages: dict[tuple[str, str], dict[str, float]] = {}
+    _counters: dict[tuple[str, str], float] = {}
+
+    @classmethod
+    @contextmanager
+    def stage(cls, stage: str, source: str, **labels: Any) -> Iterator[StageRecord]:
+        """
+        Args:
+            stage: str
+            Stage name, e.g. "fetch", "parse", "transform" or "load".
+
+            source: str
+            What the stage works on, e.g. a host, scraper class or table name.
+
+            labels: Any
+            Extra fields kept in the JSON record only (not in the Prometheus aggregates, to bound their cardinality).
+        """
+        record = StageRecord(stage, source, labels)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.fail()
+            raise
+        finally:
+            cls._record(record, time.perf_counter() - start)
+
+    @classmethod
+    def configure(cls, jsonl_path: Path = JSONL_PATH, prometheus_path: Path = PROMETHEUS_PATH) -> None:
+        with cls._lock:
+            first = cls._paths is None
+            cls._paths = (Path(jsonl_path), Path(prometheus_path))
+        if first:
+            atexit.register(cls.flush)
+
+    @classmethod
+    def timed(
+        cls,
+        stage: str,
+        source: str | None = None,
+        none_is_failure: bool = True,
+        rows: Callable[[Any], int] | None = None,
+    ) -> Callable[[Callable], Callable]:
+        """
+        Decorator for stage functions. The source defaults to the class (or module) the function is defined in; a None result
+        counts as a failed run unless none_is_failure is False (for functions that return nothing).
+        Rows are counted by the rows function if given (e.g. for a dictionary of tables), else for DataFrame and list results.
+        A Future result (a write-behind load) is recorded when it resolves: the run lasts until then, its rows are the Future's
+        result, and it fails if the Future does.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            name = source or func.__qualname__.rpartition(".")[0] or func.__module__.rpartition(".")[2]
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                record = StageRecord(stage, name, {"function": func.__name__})
+                start = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException:
+                    record.fail()
+                    cls._record(record, time.perf_counter() - start)
+                    raise
+
+                if isinstance(result, Future):
+                    record.labels["background"] = True
+                    result.add_done_callback(lambda future: cls._record_future(record, start, future))
+                    return result
+                if result is None and none_is_failure:
+                    record.fail()
+                elif result is not None and rows is not None:
+                    record.add(rows=rows(result))
+                elif isinstance(result, (pd.DataFrame, list)):
+                    record.add(rows=len(result))
+                cls._record(record, time.perf_counter() - start)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    def count(cls, name: str, source: str, value: float = 1) -> None:
+        with cls._lock:
+            cls._counters[(name, source)] = cls._counters.get((name, source), 0) + value
+
+    @classmethod
+    def summary(cls) -> pd.DataFrame:
+        with cls._lock:
+            rows = [{"source": source, "stage": stage, **agg} for (source, stage), agg in cls._stages.items()]
+        return pd.DataFrame(rows, columns=["source", "stage", "runs", "errors", "seconds", *STAGE_FIELDS])
+
+    @classmethod
+    def prometheus(cls) -> str:
+        with cls._lock:
+            stages = {key: dict(agg) for key, agg in cls._stages.items()}
+            counters = dict(cls._counters)
+
+        lines = []
+        metrics = (
+            ("stage_runs_total", "runs", "counter", "Number of runs per pipeline stage."),
+            ("stage_errors_total", "errors", "counter", "Number of failed runs per pipeline stage."),
+            ("stage_duration_seconds_total", "seconds", "counter", "Time spent per pipeline stage."),
+            ("stage_bytes_total", "bytes", "counter", "Bytes received per pipeline stage."),
+            ("stage_rows_total", "rows", "counter", "Rows produced or written per pipeline stage."),
+            ("stage_retries_total", "retries", "counter", "HTTP retries per pipeline stage."),
+        )
+        for metric, field, kind, description in metrics:
+            lines += [f"# HELP {PREFIX}_{metric} {description}", f"# TYPE {PREFIX}_{metric} {kind}"]
+            for (source, stage), agg in sorted(stages.items()):
+                lines.append(f"{PREFIX}_{metric}{_labels(source=source, stage=stage)} {agg[field]:g}")
+
+        for name in sorted({name for name, _ in counters}):
+            lines += [
+                f"# HELP {PREFIX}_{name}_total Count of {name.replace('_', ' ')}.",
+                f"# TYPE {PREFIX}_{name}_total counter",
+            ]
+            for (counter, source), value in sorted(counters.items()):
+                if counter == name:
+                    lines.append(f"{PREFIX}_{name}_total{_labels(source=source)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def flush(cls, jsonl_path: Path | None = None, prometheus_path: Path | None = None) -> None:
+        """Writes to the given paths, else to the configured ones; does nothing if neither are set."""
+        with cls._lock:
+            if cls._paths is None and (jsonl_path is None or prometheus_path is None):
+                return
+            jsonl_path = Path(jsonl_path or cls._paths[0])
+            prometheus_path = Path(prometheus_path or cls._paths[1])
+            pending = list(cls._pending)
+            cls._pending.clear()
+        if pending:
+            if jsonl_path.exists() and jsonl_path.stat().st_size > JSONL_ROTATION_SIZE:
+                jsonl_path.replace(jsonl_path.with_name(f"{jsonl_path.stem}_backup{jsonl_path.suffix}"))
+            with jsonl_path.open("a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record, default=str) + "\n" for record in pending)
+        if pending or cls._counters:
+            prometheus_path.write_text(cls.prometheus(), encoding="utf-8")
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._pending.clear()
+            cls._stages, cls._counters = {}, {}
+
+    @classmethod
+    def _record_future(cls, record: StageRecord, start: float, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            record.fail()
+        elif isinstance(future.result(), int):
+            record.add(rows=future.result())
+        cls._record(record, time.perf_counter() - start)
+
+    @classmethod
+    def _record(cls, record: StageRecord, seconds: float) -> None:
+        entry = {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "source": record.source,
+            "stage": record.stage,
+            "seconds": round(seconds, 6),
+            "ok": record.ok,
+            **record.counts,
+            **record.labels,
+        }
+        with cls._lock:
+            if len(cls._pending) == cls._pending.maxlen:
+                key = ("dropped_records", "Metrics")
+                cls._counters[key] = cls._counters.get(key, 0) + 1
+            cls._pending.append(entry)
+            agg = cls._stages.setdefault(
+                (record.source, record.stage),
+                {"runs": 0, "errors": 0, "seconds": 0.0, **dict.fromkeys(STAGE_FIELDS, 0)},
+            )
+            agg["runs"] += 1
+            agg["errors"] += not record.ok
+            agg["seconds"] += seconds
+            for name, value in record.counts.items():
+                agg[name] += value
+
+
+def _labels(**labels: str) -> str:
+    escaped = (f'{k}="{_escape(v)}"' for k, v in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+
+from .template_logger import TemplateLogger, folder_path
+
+PROFILE_ENV_VAR = "LISA_PROFILE"
+PROFILE_FOLDER = folder_path.joinpath("profiles")
+TOP_N = 25
+TRACEMALLOC_FRAMES = 5
+
+logger = TemplateLogger(__name__).logger
+
+
+class Profiler:
+    """
+    Class for profiling scraper runs on demand.
+    Profiling is switched on for every decorated call by setting the LISA_PROFILE environment variable (to anything but "", "0"
+    or "false"), or per call with the profile keyword argument, e.g. ConsumerSurvey.download(profile=True). A profiled call runs
+    under cProfile and tracemalloc and writes two files to logs/profiles/:
+        - <time>_<function>.prof: the cProfile dump, for pstats or snakeviz.
+        - <time>_<function>.txt: wall time, peak traced memory, the top functions by cumulative time and the top source
+          lines by allocated memory.
+    Only the outermost profiled call of a thread is profiled (cProfile cannot nest), so that e.g. a profiled load() covers
+    the upsert_rows calls within it. Work done in other threads (e.g. TradingEconomics.download_all) is not in the profile.
+
+    Methods:
+        profiled: Decorator adding the profile keyword argument to a function.
+        profile: Context manager profiling the enclosed block.
+        enabled: Returns whether profiling is switched on by the environment variable.
+    """
+
+    _active = threading.local()
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.environ.get(PROFILE_ENV_VAR, "").strip().lower() not in ("", "0", "false")
+
+    @classmethod
+    def profiled(cls, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, profile: bool | None = None, **kwargs: Any) -> Any:
+            if not (cls.enabled() if profile is None else profile):
+                return func(*args, **kwargs)
+            with cls.profile(func.__qualname__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    @classmethod
+    @contextmanager
+    def profile(cls, name: str, top_n: int = TOP_N) -> Iterator[None]:
+        """
+        Args:
+            name: str
+            Name of the profiled run, used in the file names (e.g. "ConsumerSurvey.download").
+
+            top_n: int
+            Number of functions and source lines listed in the summary.
+        """
+        if getattr(cls._active, "running", False):
+            yield
+            return
+
+        cls._active.running = True
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            seconds = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            cls._active.running = False
+            try:
+                cls._write(name, profiler, snapshot, seconds, peak, top_n)
+            except OSError:
+                logger.exception(f"Error in writing profile of: {name}")
+
+    @staticmethod
+    def _write(
+        name: str,
+        profiler: cProfile.Profile,
+        snapshot: tracemalloc.Snapshot,
+        seconds: float,
+        peak: int,
+        top_n: int,
+    ) -> None:
+        PROFILE_FOLDER.mkdir(parents=True, exist_ok=True)
+        stem = f"{PROFILE_FOLDER.joinpath(f'{datetime.now():%Y%m%d_%H%M%S_%f}_{name}')}"
+        profiler.dump_stats(f"{stem}.prof")
+
+        stats = pstats.Stats(profiler)
+        by_cumtime = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top_n]
+        snapshot = snapshot.filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, cProfile.__file__))
+        )
+        by_size = snapshot.statistics("lineno")[:top_n]
+
+        lines = [
+            f"Profile of {name}",
+            f"Wall time: {seconds:.3f} s; peak traced memory: {peak / 2**20:.1f} MiB; total calls: {stats.total_calls}",
+            "",
+            f"Top {top_n} functions by cumulative time",
+            f"{'cumtime (s)':>12} {'tottime (s)':>12} {'calls':>10}  function",
+        ]
+        for (filename, lineno, function), (_, ncalls, tottime, cumtime, _) in by_cumtime:
+            lines.append(f"{cumtime:12.4f} {tottime:12.4f} {ncalls:10d}  {function} ({filename}:{lineno})")
+
+        lines += ["", f"Top {top_n} source lines by allocated memory", f"{'size (KiB)':>12} {'blocks':>10}  line"]
+        for stat in by_size:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size / 1024:12.1f} {stat.count:10d}  {frame.filename}:{frame.lineno}")
+
+        with open(f"{stem}.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        logger.info(f"Profile of {name} ({seconds:.2f} s) written to: {stem}.txt")
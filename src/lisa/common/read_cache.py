@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any
+
+import pandas as pd
+import sqlalchemy as db
+
+from lisa.database_model import Table_Versions
+
+from .metrics import Metrics
+from .template_logger import TemplateLogger
+
+MAX_ENTRIES = 64
+MAX_MEGABYTES = 512
+
+logger = TemplateLogger(__name__).logger
+
+
+def table_version(connection: db.Connection, table_name: str) -> int:
+    """Returns the stored version of a table: the number of committed writes recorded for it (0 if none were)."""
+    try:
+        version = connection.exec_driver_sql(
+            f'SELECT version FROM "{Table_Versions.name()}" WHERE table_name = ?', (table_name,)
+        ).scalar()
+    except db.exc.OperationalError:
+        return 0  # no table written through DBConnection yet
+    return version or 0
+
+
+def bump_version(connection: db.Connection, table_name: str) -> None:
+    """
+    Increments the stored version of a table, within the connection's transaction (undone if it is rolled back).
+    The Table_Versions table is created by the first bump that finds it missing, on the same connection.
+    """
+    sql = (
+        f'INSERT INTO "{Table_Versions.name()}" (table_name, version) VALUES (?, 1) '
+        "ON CONFLICT (table_name) DO UPDATE SET version = version + 1"
+    )
+    try:
+        connection.exec_driver_sql(sql, (table_name,))
+    except db.exc.OperationalError:
+        Table_Versions.__table__.create(connection, checkfirst=True)
+        connection.exec_driver_sql(sql, (table_name,))
+
+
+class ReadCache:
+    """
+    Class for caching query results per table, bounded to max_entries results and max_megabytes of memory (least recently used
+    results are dropped first). A result is keyed by database, table name, query and parameters, and stored with the table's
+    version from the Table_Versions table, which DBConnection increments in the same transaction as every write it records
+    (upsert_rows, mark_changed; writes made by the full-text search triggers count as writes to Search_Index). Each read
+    compares the stored version first: if another connection, notebook or process has committed a write to the table since, the
+    query runs again. Writes made outside DBConnection without mark_changed are not seen.
+    Callers receive a copy of the cached result (a few milliseconds for the widest tables), so modifying it leaves the cache
+    intact; pandas offers no public way to make a frame's values read-only without splitting it into one block per column.
+    Hits and misses are counted in Metrics as read_cache_hits/read_cache_misses, per table.
+
+    Methods:
+        default: Returns the shared cache used by DBConnection.df_from_sql.
+        read: Returns the result of a query on a table, from the cache when the table has not changed.
+        invalidate: Drops the cached results of some or all tables.
+        on_commit: Commit hook dropping the cached results of written tables.
+    """
+
+    _default: ReadCache | None = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_megabytes: float = MAX_MEGABYTES) -> None:
+        self._max_entries = max(max_entries, 1)
+        self._max_bytes = max_megabytes * 2**20
+        self._entries: OrderedDict[tuple[str, str, str, tuple], tuple[int, pd.DataFrame, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> ReadCache:
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def read(
+        self, engine: db.Engine, table_name: str, sql: str | None = None, params: Sequence[Any] | None = None
+    ) -> pd.DataFrame:
+        """
+        Args:
+            engine: db.Engine
+            Database to read from; read with a connection of its own, so only committed data is cached.
+
+            table_name: str
+            Table read by the query; its version decides whether a cached result is still valid.
+
+            sql: str | None
+            Query reading only that table, with positional parameters written as ?; the whole table by default.
+
+            params: Sequence[Any] | None
+            Query parameters.
+
+        Returns:
+            df: pd.DataFrame
+            Query result; a copy owned by the caller.
+        """
+        params = tuple(params or ())
+        key = (str(engine.url), table_name, sql or "", params)
+        with engine.connect() as connection:
+            # The version is read before the data: a write committed in between only makes the entry look stale
+            version = table_version(connection, table_name)
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None and cached[0] == version:
+                    self._entries.move_to_end(key)
+                    Metrics.count("read_cache_hits", table_name)
+                    return cached[1].copy()
+            Metrics.count("read_cache_misses", table_name)
+            if sql is None:
+                df = pd.read_sql_table(table_name, connection)
+            else:
+                df = pd.read_sql(sql, connection, params=params)
+
+        self._store(key, version, df)
+        return df.copy()
+
+    def invalidate(self, table_names: set[str] | None = None) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if table_names is None or k[1] in table_names]:
+                self._bytes -= self._entries.pop(key)[2]
+
+    @classmethod
+    def on_commit(cls, table_names: set[str]) -> None:
+        if cls._default is not None:
+            cls._default.invalidate(table_names)
+
+    def _store(self, key: tuple[str, str, str, tuple], version: int, df: pd.DataFrame) -> None:
+        n_bytes = int(df.memory_usage(index=True, deep=True).sum())
+        if n_bytes > self._max_bytes:
+            logger.info(f"Result of {n_bytes / 2**20:.0f} MB from {key[1]} exceeds the read cache size; not cached.")
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (version, df, n_bytes)
+            self._bytes += n_bytes
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
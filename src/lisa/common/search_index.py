@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+
+import pandas as pd
+import sqlalchemy as db
+from sqlalchemy import Text
+
+from lisa.database_model import Finviz_Stocks_Description, US_Man_Pmi_Report, US_Ser_Pmi_Report
+
+from .template_logger import TemplateLogger
+
+INDEX_TABLE = "Search_Index"
+ROWID_SOURCE_SHIFT = 2**48  # index rowid = source code * 2**48 + source rowid * 2**8 + section position
+ROWID_ROW_SHIFT = 2**8
+DEFAULT_LIMIT = 20
+
+logger = TemplateLogger(__name__).logger
+
+
+def _text_columns(table: type) -> tuple[str]:
+    return tuple(
+        c.name
+        for c in table.__table__.columns
+        if isinstance(c.type, Text) and not c.primary_key and not c.name.endswith(("_direction", "_change_rate"))
+    )
+
+
+# Source table name: (source code, SQL expression for the record key with {row} as the row alias, indexed text columns)
+SEARCH_SOURCES = MappingProxyType(
+    {
+        US_Man_Pmi_Report.name(): (1, "printf('%04d-%02d', {row}.year, {row}.month)", _text_columns(US_Man_Pmi_Report)),
+        US_Ser_Pmi_Report.name(): (2, "printf('%04d-%02d', {row}.year, {row}.month)", _text_columns(US_Ser_Pmi_Report)),
+        Finviz_Stocks_Description.name(): (3, "{row}.ticker", ("description",)),
+    }
+)
+
+
+class SearchIndex:
+    """
+    Class for maintaining and querying an SQLite FTS5 full-text index over the ISM report commentary and stock descriptions.
+    Each indexed text column of each source row is stored as one index row, so matches are reported per report month (or ticker)
+    and section. Triggers on the source tables keep the index in step with every insert, upsert, update and delete.
+
+    Methods:
+        ensure: Creates the index table and triggers for a source table if missing; backfills the index when it is created.
+        rebuild: Clears and repopulates the index rows of one or all source tables.
+        search: Returns ranked matches for an FTS5 query.
+    """
+
+    def __init__(self, connection: db.Connection) -> None:
+        self._connection = connection
+
+    def ensure(self, source: str) -> bool:
+        """Returns whether the index was written to (backfilled for the source)."""
+        if source not in SEARCH_SOURCES:
+            return False
+
+        exists_stmt = db.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name")
+        if not self._connection.execute(exists_stmt, {"name": source}).first():
+            return False
+        index_exists = self._connection.execute(exists_stmt, {"name": INDEX_TABLE}).first()
+
+        try:
+            self._connection.execute(
+                db.text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} USING fts5("
+                    "body, source UNINDEXED, record_key UNINDEXED, section UNINDEXED, tokenize = 'porter unicode61')"
+                )
+            )
+        except db.exc.OperationalError:
+            logger.exception("SQLite build does not support FTS5; full-text search index is disabled.")
+            return False
+
+        triggers = {
+            "insert": f"AFTER INSERT ON {source} BEGIN {self._insert_sql(source, 'new')} END",
+            "update": (
+                f"AFTER UPDATE ON {source} BEGIN {self._delete_sql(source, 'old')} {self._insert_sql(source, 'new')} END"
+            ),
+            "delete": f"AFTER DELETE ON {source} BEGIN {self._delete_sql(source, 'old')} END",
+        }
+        trigger_exists = self._connection.execute(
+            db.text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+            {"name": f"{INDEX_TABLE}_{source}_insert"},
+        ).first()
+        for event, body in triggers.items():
+            self._connection.execute(db.text(f"CREATE TRIGGER IF NOT EXISTS {INDEX_TABLE}_{source}_{event} {body}"))
+
+        if not index_exists or not trigger_exists:
+            self.rebuild(source)
+            return True
+        return False
+
+    def rebuild(self, source: str | None = None) -> None:
+        sources = [source] if source else list(SEARCH_SOURCES)
+        for name in sources:
+            code, key_sql, columns = SEARCH_SOURCES[name]
+            self._connection.execute(
+                db.text(f"DELETE FROM {INDEX_TABLE} WHERE rowid >= :low AND rowid < :high"),
+                {"low": code * ROWID_SOURCE_SHIFT, "high": (code + 1) * ROWID_SOURCE_SHIFT},
+            )
+            for position, column in enumerate(columns):
+                self._connection.execute(
+                    db.text(
+                        f"INSERT INTO {INDEX_TABLE} (rowid, body, source, record_key, section) "
+                        f"SELECT {self._rowid_sql(code, name, position)}, {name}.{column}, '{name}', "
+                        f"{key_sql.format(row=name)}, '{column}' FROM {name}"
+                    )
+                )
+
+    def search(self, query: str, sources: list[str] | None = None, limit: int = DEFAULT_LIMIT) -> pd.DataFrame:
+        """
+        Runs an FTS5 query (e.g. 'tariffs', '"supply chain" NOT china', 'semiconductor*') against the index.
+
+        Args:
+            query: str
+            The FTS5 query string.
+
+            sources: list[str] | None
+            Source table names to restrict the search to; all sources by default.
+
+            limit: int
+            Maximum number of matches returned.
+
+        Returns:
+            df: pd.DataFrame
+            Matches ordered by relevance (BM25), with the source table, record key (YYYY-MM or ticker), section and a snippet.
+        """
+        sources = sources or list(SEARCH_SOURCES)
+        unknown_sources = set(sources) - SEARCH_SOURCES.keys()
+        if unknown_sources:
+            raise ValueError(f"Tables are not indexed for search:\n{sorted(unknown_sources)}")
+
+        stmt = db.text(
+            f"SELECT source, record_key, section, bm25({INDEX_TABLE}) AS rank, "
+            f"snippet({INDEX_TABLE}, 0, '[', ']', '...', 16) AS snippet "
+            f"FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH :query AND source IN :sources "
+            "ORDER BY rank LIMIT :limit"
+        ).bindparams(db.bindparam("sources", expanding=True))
+        result = self._connection.execute(stmt, {"query": query, "sources": sources, "limit": limit})
+        return pd.DataFrame(result.fetchall(), columns=["source", "record_key", "section", "rank", "snippet"])
+
+    @staticmethod
+    def _rowid_sql(code: int, row: str, position: int) -> str:
+        return f"{code * ROWID_SOURCE_SHIFT} + {row}.rowid * {ROWID_ROW_SHIFT} + {position}"
+
+    @classmethod
+    def _insert_sql(cls, source: str, row: str) -> str:
+        code, key_sql, columns = SEARCH_SOURCES[source]
+        return " ".join(
+            f"INSERT INTO {INDEX_TABLE} (rowid, body, source, record_key, section) "
+            f"VALUES ({cls._rowid_sql(code, row, position)}, {row}.{column}, '{source}', {key_sql.format(row=row)}, '{column}');"
+            for position, column in enumerate(columns)
+        )
+
+    @classmethod
+    def _delete_sql(cls, source: str, row: str) -> str:
+        code, _, _ = SEARCH_SOURCES[source]
+        low = cls._rowid_sql(code, row, 0)
+        return f"DELETE FROM {INDEX_TABLE} WHERE rowid >= {low} AND rowid < {low} + {ROWID_ROW_SHIFT};"
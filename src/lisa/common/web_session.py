@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import random
+import threading
+from urllib.parse import urlparse
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from .metrics import Metrics
 from .template_logger import TemplateLogger
 
 TIMEOUT = 10
@@ -23,8 +26,11 @@ logger = TemplateLogger(__name__).logger
 
 class WebSession:
     """
-    Class to implement the resquests.get() method with automatic retries, headers, and session renewal (to avoid being blocked by sites).
-    It is designed to be used as a context manager.
+    Class to implement the resquests.get() and requests.head() methods with automatic retries, headers, and session renewal (to avoid being blocked by sites).
+    It is designed to be used as a context manager, and may be shared by threads fetching concurrently: the requests in flight on
+    each underlying requests.Session are counted, and a session replaced by renewal (or left by __exit__) is only closed once
+    they have all finished.
+    Every request is recorded as a "fetch" stage in Metrics (latency, bytes received and retries, per host).
     """
 
     def __init__(
@@ -46,6 +52,9 @@ class WebSession:
         )
         self._session = self._init_session()
         self._success_count = 0
+        self._in_flight: dict[requests.Session, int] = {}
+        self._retired: set[requests.Session] = set()
+        self._lock = threading.Lock()
 
     def _init_session(self) -> requests.Session:
         session = requests.Session()
@@ -63,26 +72,62 @@ class WebSession:
         )
         return session
 
-    def get(self, url: str) -> requests.Response | None:
+    def get(self, url: str, headers: dict[str, str] | None = None) -> requests.Response | None:
+        return self._request("GET", url, headers)
+
+    def head(self, url: str, headers: dict[str, str] | None = None) -> requests.Response | None:
+        """Sends a HEAD request (e.g. conditional, with If-None-Match/If-Modified-Since headers) to check for new content cheaply."""
+        return self._request("HEAD", url, headers)
+
+    def _request(self, method: str, url: str, headers: dict[str, str] | None) -> requests.Response | None:
+        with self._lock:
+            session = self._session
+            self._in_flight[session] = self._in_flight.get(session, 0) + 1
         try:
-            response = self._session.get(url, timeout=self._timeout)
-        except (requests.exceptions.RequestException, requests.exceptions.Timeout):
-            logger.exception(f"GET request failed for: {url}")
-            return None
-
-        if not response.ok:
-            logger.error(f"GET request failed for: {url}\nResponse code: {response.status_code}")
-            return None
-
-        self._success_count += 1
-        current_count = self._success_count
-        if current_count % self._session_renewal_interval == 0:
-            self._session.close()
-            self._session = self._init_session()
+            with Metrics.stage("fetch", urlparse(url).netloc, method=method, url=url) as record:
+                try:
+                    response = session.request(method, url, headers=headers, timeout=self._timeout)
+                except (requests.exceptions.RequestException, requests.exceptions.Timeout):
+                    logger.exception(f"{method} request failed for: {url}")
+                    record.fail()
+                    return None
+
+                record.add(bytes=len(response.content), retries=self._retries(response))
+                if not response.ok:
+                    logger.error(f"{method} request failed for: {url}\nResponse code: {response.status_code}")
+                    record.fail()
+                    return None
+        finally:
+            with self._lock:
+                self._in_flight[session] -= 1
+                if not self._in_flight[session]:
+                    del self._in_flight[session]
+                    if session in self._retired:
+                        self._retired.discard(session)
+                        session.close()
+
+        with self._lock:
+            self._success_count += 1
+            if self._success_count % self._session_renewal_interval == 0:
+                self._retire(self._session)
+                self._session = self._init_session()
         return response
 
+    def _retire(self, session: requests.Session) -> None:
+        # Called with the lock held: closes the session now if idle, else once its last request in flight has finished
+        if session in self._in_flight:
+            self._retired.add(session)
+        else:
+            session.close()
+
+    @staticmethod
+    def _retries(response: requests.Response) -> int:
+        retries = getattr(response.raw, "retries", None)
+        return len(retries.history) if retries is not None else 0
+
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._session.close()
+        with self._lock:
+            self._retire(self._session)
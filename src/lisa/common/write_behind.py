@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass, field
+from typing import Any
+
+from .db_connection import DBConnection
+from .metrics import Metrics
+from .template_logger import TemplateLogger
+
+MAX_GROUP = 32
+LINGER_SECONDS = 0.05
+
+logger = TemplateLogger(__name__).logger
+
+
+@dataclass(frozen=True)
+class TableWrite:
+    """
+    One write to a table: an upsert_rows call, followed by a delete_rows call if keys to delete are given.
+
+    Attributes:
+        table_name: str
+        Table to write to.
+
+        data_rows: list[dict[str, Any]]
+        Rows to upsert; may be empty.
+
+        delete_first: bool
+        staging: bool
+        delete_missing: bool
+        As in DBConnection.upsert_rows.
+
+        delete_keys: list[dict[str, Any]]
+        Primary keys of rows to delete after the upsert, as in DBConnection.delete_rows.
+    """
+
+    table_name: str
+    data_rows: list[dict[str, Any]]
+    delete_first: bool = False
+    staging: bool = False
+    delete_missing: bool = False
+    delete_keys: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.data_rows) + len(self.delete_keys)
+
+    def apply(self, conn: DBConnection) -> None:
+        if self.data_rows or self.delete_first:
+            conn.upsert_rows(
+                self.table_name,
+                self.data_rows,
+                delete_first=self.delete_first,
+                staging=self.staging,
+                delete_missing=self.delete_missing,
+            )
+        conn.delete_rows(self.table_name, self.delete_keys)
+
+
+def write_tables(*writes: TableWrite, background: bool = False) -> Future | None:
+    """
+    Applies table writes, in the given order and in one transaction: now, or with background=True, as one batch of the shared
+    write-behind loader (whose Future is returned). The scrapers' load methods write through this function.
+    """
+    if background:
+        return WriteBehindLoader.default().submit(*writes)
+    with DBConnection() as conn:
+        for write in writes:
+            write.apply(conn)
+    return None
+
+
+class WriteBehindLoader:
+    """
+    Class for write-behind loading: batches of table writes are queued and applied by a single background thread, so that
+    downloads and parsing carry on while SQLite writes, and only one thread ever writes (no lock contention between writers).
+    Batches are applied in submission order. Whatever is queued when the writer picks up work (up to max_group batches, waiting
+    at most linger seconds for more) is applied in one transaction with a single commit; each batch runs in its own savepoint, so
+    a failing batch is rolled back alone and the others are still committed. All writes of one batch succeed or fail together.
+    submit() returns a Future per batch, resolved with the number of rows written once the batch is committed, or with the
+    exception that failed it (also logged). The scrapers' load methods take background=True to submit instead of writing (see
+    write_tables); Metrics.timed records such loads when their Future resolves, so that the load stage times the actual write.
+
+    Methods:
+        default: Returns the shared loader, created on first use and closed at interpreter exit.
+        submit: Queues a batch of table writes; returns its Future.
+        flush: Waits until all batches submitted so far are committed or failed.
+        close: Flushes, then stops the writer thread.
+    """
+
+    _default: WriteBehindLoader | None = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_group: int = MAX_GROUP, linger: float = LINGER_SECONDS) -> None:
+        self._max_group = max(max_group, 1)
+        self._linger = linger
+        self._queue: queue.Queue[tuple[tuple[TableWrite, ...], Future] | None] = queue.Queue()
+        self._pending: set[Future] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    @classmethod
+    def default(cls) -> WriteBehindLoader:
+        with cls._default_lock:
+            if cls._default is None or cls._default._closed:
+                cls._default = cls()
+            return cls._default
+
+    def submit(self, *writes: TableWrite) -> Future:
+        """
+        Args:
+            writes: TableWrite
+            Writes applied together, in the given order.
+
+        Returns:
+            future: Future
+            Resolved with the number of rows written once committed.
+        """
+        if not writes:
+            raise ValueError("At least one table write must be submitted.")
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write-behind loader is closed; no more batches can be submitted.")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="lisa-write-behind", daemon=True)
+                self._thread.start()
+            self._pending.add(future)
+            self._queue.put((writes, future))
+        future.add_done_callback(self._discard)
+        return future
+
+    def flush(self, timeout: float | None = None) -> None:
+        with self._lock:
+            pending = set(self._pending)
+        _, not_done = wait_futures(pending, timeout=timeout)
+        if not_done:
+            raise TimeoutError(f"{len(not_done)} write-behind batches still pending after {timeout} s.")
+
+    def close(self, timeout: float | None = None) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.flush(timeout)
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    @classmethod
+    def _close_default(cls) -> None:
+        if cls._default is not None:
+            cls._default.close()
+
+    def _discard(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                return
+            group = [item]
+            deadline = time.monotonic() + self._linger
+            while len(group) < self._max_group:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                group.append(item)
+            self._apply(group)
+
+    @staticmethod
+    def _apply(group: list[tuple[tuple[TableWrite, ...], Future]]) -> None:
+        outcomes = []
+        try:
+            with Metrics.stage("write_behind", "WriteBehindLoader", batches=len(group)) as record:
+                with DBConnection() as conn:
+                    for writes, future in group:
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        try:
+                            with conn.savepoint():
+                                for write in writes:
+                                    write.apply(conn)
+                        except Exception as e:
+                            logger.exception(
+                                f"Error in write-behind batch for tables: {[w.table_name for w in writes]}"
+                            )
+                            outcomes.append((future, None, e))
+                        else:
+                            outcomes.append((future, sum(w.n_rows for w in writes), None))
+                record.add(rows=sum(n for _, n, _ in outcomes if n))
+        except Exception as e:
+            logger.exception(f"Error in committing {len(group)} write-behind batches.")
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, n_rows, error in outcomes:
+            if error is None:
+                future.set_result(n_rows)
+            else:
+                future.set_exception(error)
+
+
+atexit.register(WriteBehindLoader._close_default)
@@ -1,15 +1,21 @@
 from .bonds_table import Bonds
 from .caixin_pmi_table import Caixin_PMI
 from .commodities_table import Commodities
+from .composite_index_table import Composite_Index
 from .crypto_table import Crypto
 from .currencies_table import Currencies
+from .eu_economic_sentiment_long_table import EU_Economic_Sentiment_Long
 from .eu_economic_sentiment_table import EU_Economic_Sentiment
 from .finviz_industries_table import Finviz_Industries
 from .finviz_stocks_description_table import Finviz_Stocks_Description
 from .finviz_stocks_table import Finviz_Stocks
 from .gics_industries_table import GICS_Industries
 from .gics_sectors_table import GICS_Sectors
+from .release_state_table import Release_State
+from .sector_rotation_table import Sector_Rotation
+from .stock_factors_table import Stock_Factors
 from .stocks_indices_table import Stock_Indices
+from .table_versions_table import Table_Versions
 from .us_buildings_table import US_Buildings
 from .us_consumers_table import US_Consumers
 from .us_man_industry_rankings_table import US_Man_Industry_Ranking
@@ -0,0 +1,29 @@
+from types import MappingProxyType
+
+from sqlalchemy import REAL, Column, Integer, Text
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Composite_Index(Base):
+    __tablename__ = "Composite_Index"
+    index_name = Column(Text, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    value = Column(REAL)
+    coverage = Column(REAL)
+
+    @classmethod
+    def name(cls):
+        return cls.__tablename__
+
+    @classmethod
+    def columns(cls):
+        return [c.name for c in cls.__table__.columns]
+
+    @staticmethod
+    def column_map():
+        return MappingProxyType(
+            {"Index": "index_name", "Year": "year", "Month": "month", "Value": "value", "Coverage": "coverage"}
+        )
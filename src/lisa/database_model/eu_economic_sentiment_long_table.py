@@ -0,0 +1,38 @@
+from types import MappingProxyType
+
+from sqlalchemy import REAL, Column, Integer, PrimaryKeyConstraint, Text
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class EU_Economic_Sentiment_Long(Base):
+    __tablename__ = "EU_Economic_Sentiment_Long"
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    region = Column(Text, nullable=False)
+    indicator = Column(Text, nullable=False)
+    value = Column(REAL, nullable=False)
+
+    # Clustered on the series key (WITHOUT ROWID): the rows of a region (and indicator) are stored together, in date order
+    __table_args__ = (PrimaryKeyConstraint("region", "indicator", "year", "month"), {"sqlite_with_rowid": False})
+
+    @classmethod
+    def name(cls):
+        return cls.__tablename__
+
+    @classmethod
+    def columns(cls):
+        return [c.name for c in cls.__table__.columns]
+
+    @staticmethod
+    def column_map():
+        return MappingProxyType(
+            {
+                "Year": "year",
+                "Month": "month",
+                "Region": "region",
+                "Indicator": "indicator",
+                "Value": "value",
+            }
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Text
+from sqlalchemy import Column, Index, Text, text
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -9,6 +9,11 @@ class Finviz_Stocks_Description(Base):
     ticker = Column(Text, primary_key=True)
     description = Column(Text)
 
+    # Partial index of the tickers still missing a description
+    __table_args__ = (
+        Index("ix_Finviz_Stocks_Description_missing", "ticker", sqlite_where=text("description IS NULL")),
+    )
+
     @classmethod
     def name(cls):
         return cls.__tablename__
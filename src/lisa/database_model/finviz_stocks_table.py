@@ -1,6 +1,6 @@
 from types import MappingProxyType
 
-from sqlalchemy import REAL, Column, ForeignKey, Integer, Text
+from sqlalchemy import REAL, Column, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -105,6 +105,12 @@ class Finviz_Stocks(Base):
     price = Column(REAL)
     change_pct = Column(REAL)
 
+    # Sector and industry lookups (screens, peer groups); the industry index also orders each industry by market cap
+    __table_args__ = (
+        Index("ix_Finviz_Stocks_gics_sector_id", "gics_sector_id"),
+        Index("ix_Finviz_Stocks_gics_industry_id", "gics_industry_id", "market_cap_m_usd"),
+    )
+
     @classmethod
     def name(cls):
         return cls.__tablename__
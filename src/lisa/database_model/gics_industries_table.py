@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -11,6 +11,8 @@ class GICS_Industries(Base):
     industry = Column(Text, nullable=False, unique=True)
     sector_id = Column(Integer, ForeignKey("GICS_Sectors.id", ondelete="CASCADE"), nullable=False)
 
+    __table_args__ = (Index("ix_GICS_Industries_sector_id", "sector_id"),)
+
     @classmethod
     def name(cls):
         return cls.__tablename__
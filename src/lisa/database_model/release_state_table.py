@@ -0,0 +1,37 @@
+from types import MappingProxyType
+
+from sqlalchemy import Column, Text
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Release_State(Base):
+    __tablename__ = "Release_State"
+    source = Column(Text, primary_key=True)
+    probe_url = Column(Text)
+    etag = Column(Text)
+    last_modified = Column(Text)
+    checked_at = Column(Text)
+    outcome = Column(Text)
+
+    @classmethod
+    def name(cls):
+        return cls.__tablename__
+
+    @classmethod
+    def columns(cls):
+        return [c.name for c in cls.__table__.columns]
+
+    @staticmethod
+    def column_map():
+        return MappingProxyType(
+            {
+                "Source": "source",
+                "Probe URL": "probe_url",
+                "ETag": "etag",
+                "Last Modified": "last_modified",
+                "Checked At": "checked_at",
+                "Outcome": "outcome",
+            }
+        )
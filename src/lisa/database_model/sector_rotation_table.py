@@ -0,0 +1,53 @@
+from types import MappingProxyType
+
+from sqlalchemy import REAL, Column, Integer, Text
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Sector_Rotation(Base):
+    __tablename__ = "Sector_Rotation"
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    report = Column(Text, primary_key=True)
+    ism_sector = Column(Text, primary_key=True)
+    gics_industry_id = Column(Integer, primary_key=True)
+    pmi_rank = Column(Integer)
+    pmi_momentum = Column(REAL)
+    activity_rank = Column(Integer)
+    activity_momentum = Column(REAL)
+    perf_month_pct = Column(REAL)
+    perf_quart_pct = Column(REAL)
+    perf_half_pct = Column(REAL)
+    perf_year_pct = Column(REAL)
+    perf_ytd_pct = Column(REAL)
+
+    @classmethod
+    def name(cls):
+        return cls.__tablename__
+
+    @classmethod
+    def columns(cls):
+        return [c.name for c in cls.__table__.columns]
+
+    @staticmethod
+    def column_map():
+        return MappingProxyType(
+            {
+                "Year": "year",
+                "Month": "month",
+                "Report": "report",
+                "ISM Sector": "ism_sector",
+                "Industry": "gics_industry_id",
+                "PMI Rank": "pmi_rank",
+                "PMI Momentum": "pmi_momentum",
+                "Activity Rank": "activity_rank",
+                "Activity Momentum": "activity_momentum",
+                "Perf Month (%)": "perf_month_pct",
+                "Perf Quart (%)": "perf_quart_pct",
+                "Perf Half (%)": "perf_half_pct",
+                "Perf Year (%)": "perf_year_pct",
+                "Perf YTD (%)": "perf_ytd_pct",
+            }
+        )
@@ -0,0 +1,38 @@
+from types import MappingProxyType
+
+from sqlalchemy import REAL, Column, Index, Text
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Stock_Factors(Base):
+    __tablename__ = "Stock_Factors"
+    ticker = Column(Text, primary_key=True)
+    peer_group = Column(Text, primary_key=True)
+    metric = Column(Text, primary_key=True)
+    pct_rank = Column(REAL)
+    zscore = Column(REAL)
+
+    # Cross-sectional reads of one metric within a peer group
+    __table_args__ = (Index("ix_Stock_Factors_peer_group_metric", "peer_group", "metric"),)
+
+    @classmethod
+    def name(cls):
+        return cls.__tablename__
+
+    @classmethod
+    def columns(cls):
+        return [c.name for c in cls.__table__.columns]
+
+    @staticmethod
+    def column_map():
+        return MappingProxyType(
+            {
+                "Ticker": "ticker",
+                "Peer Group": "peer_group",
+                "Metric": "metric",
+                "Percentile Rank": "pct_rank",
+                "Z-Score": "zscore",
+            }
+        )
@@ -0,0 +1,29 @@
+from types import MappingProxyType
+
+from sqlalchemy import Column, Integer, Text
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Table_Versions(Base):
+    __tablename__ = "Table_Versions"
+    table_name = Column(Text, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+    @classmethod
+    def name(cls):
+        return cls.__tablename__
+
+    @classmethod
+    def columns(cls):
+        return [c.name for c in cls.__table__.columns]
+
+    @staticmethod
+    def column_map():
+        return MappingProxyType(
+            {
+                "Table Name": "table_name",
+                "Version": "version",
+            }
+        )
@@ -4,4 +4,5 @@ from .consumer_survey import ConsumerSurvey
 from .euro_survey import EuroSurvey
 from .finviz import Finviz, FinvizIndustries, FinvizScreener
 from .ism_report import IsmReport
+from .scheduler import ReleaseScheduler
 from .trading_economics import TradingEconomics
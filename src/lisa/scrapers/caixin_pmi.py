@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import re
+from concurrent.futures import Future
 
 import pandas as pd
 from bs4 import BeautifulSoup
 
-from lisa.common import DBConnection, TemplateLogger, WebSession
+from lisa.common import Metrics, Profiler, TableWrite, TemplateLogger, WebSession, write_tables
 from lisa.database_model import Caixin_PMI
 
 from .utils import MONTHS
@@ -30,7 +31,7 @@ class CaixinPmi:
     Methods:
         download: Overarching method exposed to public; obatins outputs from _main and calls __init__.
         _main: Downloads the Manufacturing and Services PMI data from Trading Economics.
-        load: Uploads the Caixin Manufacturing and Services PMI data to the database.
+        load: Uploads the Caixin Manufacturing and Services PMI data to the database (or queues it with background=True).
         _parse_text: Parses webpage text to extract PMI index, month, and year.
     """
 
@@ -42,6 +43,7 @@ class CaixinPmi:
         return self._table.copy(deep=True)
 
     @classmethod
+    @Profiler.profiled
     def download(cls) -> CaixinPmi | None:
         man_data = cls._main(URL_MAN)
         ser_data = cls._main(URL_SER)
@@ -60,8 +62,9 @@ class CaixinPmi:
         if not response:
             return None
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        tags = soup.find_all(class_="comment more")
+        with Metrics.stage("parse", "CaixinPmi", url=url):
+            soup = BeautifulSoup(response.text, "html.parser")
+            tags = soup.find_all(class_="comment more")
         if not tags:
             logger.error("Failed to find HTML tags containing relevant text.")
             return None
@@ -81,7 +84,9 @@ class CaixinPmi:
         df = df.sort_values(by=["Year", "Month"], ignore_index=True)
         return df
 
-    def load(self) -> None:
+    @Profiler.profiled
+    @Metrics.timed("load", none_is_failure=False)
+    def load(self, background: bool = False) -> Future | None:
         column_map = Caixin_PMI.column_map()
         table_name = Caixin_PMI.name()
         df = self.table
@@ -92,8 +97,7 @@ class CaixinPmi:
             raise ValueError(f"No column mapping exists for:\n{new_cols}")
 
         data_rows = df.rename(columns=column_map).to_dict(orient="records")
-        with DBConnection() as conn:
-            conn.upsert_rows(table_name=table_name, data_rows=data_rows)
+        return write_tables(TableWrite(table_name, data_rows), background=background)
 
     @staticmethod
     def _parse_text(text: str) -> tuple[int, int, float] | None:
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import io
 import warnings
+from concurrent.futures import Future
 from functools import reduce
 
 import pandas as pd
 
-from lisa.common import DBConnection, TemplateLogger, WebSession
+from lisa.common import Metrics, Profiler, TableWrite, TemplateLogger, WebSession, write_tables
 from lisa.database_model import US_Buildings
 
 URL_PERMIT = "https://www.census.gov/construction/nrc/xls/permits_cust.xlsx"
@@ -28,7 +29,7 @@ class ConstructionSurvey:
 
     Methods:
         download: Downloads the US Census Bureau Construction Survey data; reads Excel files into DataFrames; returns a processed DataFrame.
-        load: Loads the US Census Bureau Construction Survey data into a database table.
+        load: Loads the US Census Bureau Construction Survey data into a database table (or queues it with background=True).
         _process_df: Processes the raw DataFrames, merging them into one.
     """
 
@@ -40,6 +41,7 @@ class ConstructionSurvey:
         return self._table.copy(deep=True)
 
     @classmethod
+    @Profiler.profiled
     def download(cls) -> ConstructionSurvey | None:
         # Fetch the US Census Bureau Construction Survey data
         with WebSession() as session:
@@ -53,11 +55,13 @@ class ConstructionSurvey:
 
         xl_list = []
         for response in [response_permit, response_auth, response_start, response_construct, response_complete]:
-            try:
-                xl_list.append(pd.ExcelFile(io.BytesIO(response.content)))
-            except ValueError:
-                logger.exception(f"Error processing Excel file from: {response.url}")
-                return None
+            with Metrics.stage("parse", "ConstructionSurvey", url=response.url) as record:
+                try:
+                    xl_list.append(pd.ExcelFile(io.BytesIO(response.content)))
+                except ValueError:
+                    logger.exception(f"Error processing Excel file from: {response.url}")
+                    record.fail()
+                    return None
 
         df_list = []
         for xl in xl_list:
@@ -74,7 +78,9 @@ class ConstructionSurvey:
         merged_df = merged_df.sort_values(by=["Year", "Month"]).reset_index(drop=True)
         return cls(merged_df)
 
-    def load(self) -> None:
+    @Profiler.profiled
+    @Metrics.timed("load", none_is_failure=False)
+    def load(self, background: bool = False) -> Future | None:
         column_map = US_Buildings.column_map()
         table_name = US_Buildings.name()
         df = self.table
@@ -85,10 +91,10 @@ class ConstructionSurvey:
             raise ValueError(f"No column mapping exists for:\n{new_cols}")
 
         data_rows = df.rename(columns=column_map).to_dict(orient="records")
-        with DBConnection() as conn:
-            conn.upsert_rows(table_name=table_name, data_rows=data_rows)
+        return write_tables(TableWrite(table_name, data_rows), background=background)
 
     @staticmethod
+    @Metrics.timed("transform")
     def _process_df(xl: pd.ExcelFile) -> pd.DataFrame:
         if "Seasonally Adjusted" not in xl.sheet_names:
             logger.error(f"Required tab not found in Excel file.\n{xl.sheet_names}")
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import io
+from concurrent.futures import Future
 
 import pandas as pd
 
-from lisa.common import DBConnection, TemplateLogger, WebSession
+from lisa.common import Metrics, Profiler, TableWrite, TemplateLogger, WebSession, write_tables
 from lisa.database_model import US_Consumers
 
 from .utils import MONTHS
@@ -25,7 +26,7 @@ class ConsumerSurvey:
 
     Methods:
         download: Downloads the US Michigan Consumer Survey data; reads CSVs into DataFrames; returns a processed DataFrame.
-        load: Loads the US Michigan Consumer Survey data into a database table.
+        load: Loads the US Michigan Consumer Survey data into a database table (or queues it with background=True).
         _process_df: Processes the raw DataFrames, merging them into one.
     """
 
@@ -37,6 +38,7 @@ class ConsumerSurvey:
         return self._table.copy(deep=True)
 
     @classmethod
+    @Profiler.profiled
     def download(cls) -> ConsumerSurvey | None:
         # Fetch the US Michigan Consumer Index, and the Current and Expected Components
         with WebSession() as session:
@@ -46,12 +48,16 @@ class ConsumerSurvey:
             return None
 
         # Wrap response string in file-like object for read_csv
-        df1 = pd.read_csv(io.StringIO(response_index.text), sep=",", skiprows=4)
-        df2 = pd.read_csv(io.StringIO(response_components.text), sep=",", skiprows=4)
+        with Metrics.stage("parse", "ConsumerSurvey") as record:
+            df1 = pd.read_csv(io.StringIO(response_index.text), sep=",", skiprows=4)
+            df2 = pd.read_csv(io.StringIO(response_components.text), sep=",", skiprows=4)
+            record.add(rows=len(df1) + len(df2))
         data = cls._process_df(df1, df2)
         return None if data is None else cls(data)
 
-    def load(self) -> None:
+    @Profiler.profiled
+    @Metrics.timed("load", none_is_failure=False)
+    def load(self, background: bool = False) -> Future | None:
         column_map = US_Consumers.column_map()
         table_name = US_Consumers.name()
         df = self.table
@@ -62,10 +68,10 @@ class ConsumerSurvey:
             raise ValueError(f"No column mapping exists for:\n{new_cols}")
 
         data_rows = df.rename(columns=column_map).to_dict(orient="records")
-        with DBConnection() as conn:
-            conn.upsert_rows(table_name=table_name, data_rows=data_rows)
+        return write_tables(TableWrite(table_name, data_rows), background=background)
 
     @staticmethod
+    @Metrics.timed("transform")
     def _process_df(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame | None:
         # Drop empty columns and rows; define column names and data types
         df1 = df1.dropna(axis=1, how="all")
@@ -2,16 +2,22 @@ from __future__ import annotations
 
 import io
 import zipfile
+from concurrent.futures import Future
 
 import numpy as np
 import pandas as pd
+import sqlalchemy as db
 from bs4 import BeautifulSoup
 
-from lisa.common import DBConnection, TemplateLogger, WebSession
-from lisa.database_model import EU_Economic_Sentiment
+from lisa.analysis.indicators import month_range_clause
+from lisa.common import DBConnection, Metrics, Profiler, TableWrite, TemplateLogger, WebSession, write_tables
+from lisa.database_model import EU_Economic_Sentiment, EU_Economic_Sentiment_Long
 
 URL_EURO = "https://economy-finance.ec.europa.eu/economic-forecast-and-surveys/business-and-consumer-surveys/download-business-and-consumer-survey-data/time-series_en"
 
+STORAGE_MODES = ("wide", "long", "both")
+LONG_KEYS = ["year", "month", "region", "indicator"]
+
 logger = TemplateLogger(__name__).logger
 
 
@@ -25,7 +31,11 @@ class EuroSurvey:
 
     Methods:
         download: Downloads the EU Economic Survey data; reads the Excel file into a DataFrame; returns a processed DataFrame.
-        load: Loads the EU Economic Survey data into a database table.
+        load: Loads the EU Economic Survey data into the wide and/or the long (normalised) database table.
+        read: Returns stored data from the long table, filtered in SQL, in long or wide shape.
+        to_long: Converts wide rows (one column per region and indicator) to (year, month, region, indicator, value) rows.
+        to_wide: Converts long rows back to the wide shape of EU_Economic_Sentiment.
+        _long_write: Prepares the write of only the changed values to the long table, and the deletion of values that became missing.
         _process_df: Processes the raw DataFrame, adding Year and Month columns.
     """
 
@@ -37,6 +47,7 @@ class EuroSurvey:
         return self._table.copy(deep=True)
 
     @classmethod
+    @Profiler.profiled
     def download(cls) -> EuroSurvey | None:
         # Fetch the EU Economic Survey data
         url = URL_EURO
@@ -57,21 +68,38 @@ class EuroSurvey:
                 return None
 
         # Wrap response content in file-like object to extract from zip file and process the excel file
-        try:
-            zip_bytes = io.BytesIO(response.content)
-            with zipfile.ZipFile(zip_bytes) as z:
-                file = z.filelist[0]
-                with z.open(file) as f:
-                    df = pd.read_excel(f, sheet_name=2)
-        except Exception:
-            logger.exception(f"Error opening or reading Excel file from: {response.url}")
-            return None
+        with Metrics.stage("parse", "EuroSurvey", url=response.url) as record:
+            try:
+                zip_bytes = io.BytesIO(response.content)
+                with zipfile.ZipFile(zip_bytes) as z:
+                    file = z.filelist[0]
+                    with z.open(file) as f:
+                        df = pd.read_excel(f, sheet_name=2)
+            except Exception:
+                logger.exception(f"Error opening or reading Excel file from: {response.url}")
+                record.fail()
+                return None
+            record.add(rows=len(df))
 
         data = cls._process_df(df)
 
         return cls(data) if data is not None else None
 
-    def load(self) -> None:
+    @Profiler.profiled
+    @Metrics.timed("load", none_is_failure=False)
+    def load(self, storage: str = "wide", background: bool = False) -> Future | None:
+        """
+        Args:
+            storage: str
+            "wide" (EU_Economic_Sentiment, one column per region and indicator), "long" (EU_Economic_Sentiment_Long, one row
+            per year, month, region and indicator) or "both" (written in one transaction).
+
+            background: bool
+            Whether to queue the writes on the write-behind loader and return their Future.
+        """
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"Storage must be one of {list(STORAGE_MODES)}; received: {storage}.")
+
         column_map = EU_Economic_Sentiment.column_map()
         table_name = EU_Economic_Sentiment.name()
         df = self.table
@@ -81,11 +109,100 @@ class EuroSurvey:
         if new_cols:
             raise ValueError(f"No column mapping exists for:\n{new_cols}")
 
-        data_rows = df.rename(columns=column_map).to_dict(orient="records")
+        df = df.rename(columns=column_map)
+        writes = []
+        if storage in ("wide", "both"):
+            writes.append(TableWrite(table_name, df.to_dict(orient="records"), staging=True))
+        if storage in ("long", "both"):
+            writes.append(self._long_write(self.to_long(df)))
+        return write_tables(*writes, background=background)
+
+    @staticmethod
+    def read(
+        regions: list[str] | None = None,
+        indicators: list[str] | None = None,
+        start: tuple[int, int] | None = None,
+        end: tuple[int, int] | None = None,
+        wide: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Args:
+            regions: list[str] | None
+            Region codes, e.g. ["DE", "FR", "EA"]; all by default.
+
+            indicators: list[str] | None
+            Indicators among indu, serv, cons, reta, buil, esi and eei; all by default.
+
+            start: tuple[int, int] | None
+            First (year, month) returned, inclusive.
+
+            end: tuple[int, int] | None
+            Last (year, month) returned, inclusive.
+
+            wide: bool
+            Whether to pivot to the wide shape (one row per year and month, columns as in EU_Economic_Sentiment).
+
+        Returns:
+            df: pd.DataFrame
+            The stored values, ordered by date.
+        """
+        table = EU_Economic_Sentiment_Long
+        stmt = db.select(*[getattr(table, c) for c in table.columns()])
+        if regions:
+            stmt = stmt.where(table.region.in_(regions))
+        if indicators:
+            stmt = stmt.where(table.indicator.in_(indicators))
+        stmt = stmt.where(*month_range_clause(table, start, end))
+        with DBConnection() as conn:
+            df = pd.read_sql(stmt.order_by(table.year, table.month), conn._connection)
+        return EuroSurvey.to_wide(df) if wide else df
+
+    @staticmethod
+    def to_long(df: pd.DataFrame) -> pd.DataFrame:
+        """Converts rows with database column names (year, month, <region>_<indicator>...) to long rows without missing values."""
+        value_cols = [c for c in df.columns if c not in ("year", "month")]
+        long = df.melt(id_vars=["year", "month"], value_vars=value_cols, var_name="column", value_name="value")
+        long["value"] = pd.to_numeric(long["value"], errors="coerce").astype("float64")
+        long = long.dropna(subset=["value"])
+        long[["region", "indicator"]] = long["column"].str.split("_", n=1, expand=True)
+        long = long.astype({"year": "int64", "month": "int64"})
+        return long[[*LONG_KEYS, "value"]].reset_index(drop=True)
+
+    @staticmethod
+    def to_wide(df: pd.DataFrame) -> pd.DataFrame:
+        """Converts long rows to one row per year and month, with the columns present ordered as in EU_Economic_Sentiment."""
+        columns = df["region"] + "_" + df["indicator"]
+        wide = df.assign(column=columns).pivot(index=["year", "month"], columns="column", values="value")
+        ordered = [c for c in EU_Economic_Sentiment.columns() if c in wide.columns]
+        return wide[ordered].reset_index().rename_axis(columns=None)
+
+    @staticmethod
+    def _long_write(incoming: pd.DataFrame) -> TableWrite:
+        table = EU_Economic_Sentiment_Long
         with DBConnection() as conn:
-            conn.upsert_rows(table_name=table_name, data_rows=data_rows)
+            conn.ensure_table(table)
+            stored = pd.read_sql(db.select(*[getattr(table, c) for c in table.columns()]), conn._connection)
+        merged = incoming.merge(stored, on=LONG_KEYS, how="outer", suffixes=("", "_stored"), indicator=True)
+
+        # New or revised values are upserted; stored values missing from the download (within its months) are deleted
+        changed = merged[(merged["_merge"] == "left_only") | (merged["value"] != merged["value_stored"])]
+        changed = changed[changed["_merge"] != "right_only"]
+        months = set(zip(incoming["year"], incoming["month"]))
+        removed = merged[merged["_merge"] == "right_only"]
+        removed = removed[
+            np.fromiter((ym in months for ym in zip(removed["year"], removed["month"])), bool, len(removed))
+        ]
+
+        logger.info(f"{table.name()}: {len(changed)} values to upsert, {len(removed)} to delete.")
+        return TableWrite(
+            table.name(),
+            changed[[*LONG_KEYS, "value"]].to_dict(orient="records"),
+            staging=True,
+            delete_keys=removed[LONG_KEYS].to_dict(orient="records"),
+        )
 
     @staticmethod
+    @Metrics.timed("transform")
     def _process_df(df: pd.DataFrame) -> pd.DataFrame:
         # Rename first column to Date
         df.columns.values[0] = "Date"
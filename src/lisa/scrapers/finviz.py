@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import io
+from concurrent.futures import Future
+from types import MappingProxyType
 
 import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
-from sqlalchemy import case, delete, exists, insert, select, update
+from sqlalchemy import select
 
-from lisa.common import DBConnection, TemplateLogger, WebSession
+from lisa.common import DBConnection, Metrics, Profiler, TableWrite, TemplateLogger, WebSession, write_tables
 from lisa.database_model import (
     Finviz_Industries,
     Finviz_Stocks,
@@ -28,6 +30,22 @@ SCREENER_COLUMNS = (
     )
 # fmt: on
 
+# Per-column dtypes of the compact table representation; other columns follow the rules in Finviz.compact_table
+COMPACT_DTYPES = MappingProxyType(
+    {
+        "Ticker": "string",
+        "Company": "string",
+        "Sector": "category",
+        "Industry": "category",
+        "Country": "category",
+        "Exchange": "category",
+        "Index": "category",
+        "Optionable": "bool",
+        "Shortable": "bool",
+    }
+)
+YES_NO_MAP = MappingProxyType({"Yes": True, "No": False})
+
 INDUSTRIES_COLUMNS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26)
 MAX_ROWS = 10000
 ROWS_PER_PAGE = 20
@@ -43,7 +61,8 @@ class Finviz:
     Methods:
         download_stocks: Downloads the stock screener data from Finviz and returns a processed DataFrame; handles pagination.
         download_industries: Downloads the industry-level data from Finviz and returns a processed DataFrame.
-        load: Uploads Finviz stocks and industries data to the database.
+        load: Uploads Finviz stocks and industries data to the database; invalidates stock screener snapshots and refreshes factor scores.
+        compact_table: Returns the table with memory-efficient dtypes (categoricals, plain floats and booleans).
         _process_df: Processes Pandas DataFrames containing data from Finviz.
         _get_GICS_groups: Retrieves the GICS sector and industry information from the database.
         _validate_incoming_GICS: Checks whether incoming sector-industry mappings match those in the database.
@@ -51,6 +70,7 @@ class Finviz:
     """
 
     @classmethod
+    @Profiler.profiled
     def download_stocks(
         cls, num_rows: int = MAX_ROWS, view_col_nums: list[int] = SCREENER_COLUMNS
     ) -> FinvizScreener | None:
@@ -82,13 +102,16 @@ class Finviz:
                 if not response:
                     break
 
-                try:
-                    df_i = pd.read_html(io.StringIO(response.text), keep_default_na=False, na_values=custom_na_values)[
-                        -2
-                    ]
-                except (ValueError, TypeError, pd.errors.ParserError):
-                    logger.exception(f"Error in reading html table for Finviz stock screener: {url}")
-                    break
+                with Metrics.stage("parse", "Finviz", url=url) as record:
+                    try:
+                        df_i = pd.read_html(
+                            io.StringIO(response.text), keep_default_na=False, na_values=custom_na_values
+                        )[-2]
+                    except (ValueError, TypeError, pd.errors.ParserError):
+                        logger.exception(f"Error in reading html table for Finviz stock screener: {url}")
+                        record.fail()
+                        break
+                    record.add(rows=len(df_i))
 
                 df_list.append(df_i)
                 if len(df_i) < ROWS_PER_PAGE:
@@ -102,6 +125,7 @@ class Finviz:
         return FinvizScreener(data)
 
     @classmethod
+    @Profiler.profiled
     def download_industries(cls, view_col_nums: list[int] = INDUSTRIES_COLUMNS) -> FinvizIndustries | None:
         url = URL_INDUSTRY + (",").join([str(i) for i in view_col_nums])
         with WebSession() as session:
@@ -109,18 +133,23 @@ class Finviz:
         if not response:
             return None
 
-        try:
-            df = pd.read_html(io.StringIO(response.text))[-2]
-        except (ValueError, TypeError, pd.errors.ParserError):
-            logger.exception(f"Error in reading html table for Finviz industries: {url}")
-            return None
+        with Metrics.stage("parse", "Finviz", url=url) as record:
+            try:
+                df = pd.read_html(io.StringIO(response.text))[-2]
+            except (ValueError, TypeError, pd.errors.ParserError):
+                logger.exception(f"Error in reading html table for Finviz industries: {url}")
+                record.fail()
+                return None
+            record.add(rows=len(df))
 
         data = cls._process_df(df)
         data = data.rename(columns={"Name": "Industry"})
 
         return FinvizIndustries(data)
 
-    def load(self) -> None:
+    @Profiler.profiled
+    @Metrics.timed("load", none_is_failure=False)
+    def load(self, background: bool = False) -> Future | None:
         if isinstance(self, FinvizScreener):
             column_map = Finviz_Stocks.column_map()
             table_name = Finviz_Stocks.name()
@@ -137,8 +166,7 @@ class Finviz:
             raise ValueError(f"No column mapping exists for:\n{new_cols}")
 
         data_rows = df.rename(columns=column_map).to_dict(orient="records")
-        with DBConnection() as conn:
-            conn.upsert_rows(table_name=table_name, data_rows=data_rows, delete_first=True)
+        return write_tables(TableWrite(table_name, data_rows, delete_first=True, staging=True), background=background)
 
     def _prep_table(self) -> pd.DataFrame:
         df = self.table.copy()
@@ -150,7 +178,46 @@ class Finviz:
             df["Sector"] = df["Sector"].map({d["sector"]: d["sector_id"] for d in GICS_map.values()})
         return df
 
+    def compact_table(self, float_dtype: str = "float64") -> pd.DataFrame:
+        """
+        Returns a copy of the table with memory-efficient dtypes, e.g. for keeping many screener snapshots in memory.
+        Columns listed in COMPACT_DTYPES get the dtype given there (Yes/No columns become booleans, or nullable booleans
+        if any value is missing). Remaining columns are converted as follows:
+            - Float64 columns become float_dtype (float64 or float32) with NaN for missing values.
+            - Int64 columns become int64, or float_dtype if any value is missing.
+            - String columns (e.g. dates) become categoricals when fewer than half of their values are distinct.
+
+        Args:
+            float_dtype: str
+            The NumPy float dtype for numeric columns; "float32" halves their memory at the cost of precision.
+
+        Returns:
+            df: pd.DataFrame
+            A Pandas DataFrame with the same columns and values as the table, in compact dtypes.
+        """
+        df = self._table.copy()
+        for col in df.columns:
+            series = df[col]
+            dtype = COMPACT_DTYPES.get(col)
+            if dtype == "bool":
+                series = series.map(YES_NO_MAP)
+                df[col] = series.astype("boolean" if series.isna().any() else "bool")
+            elif dtype is not None:
+                df[col] = series.astype(dtype)
+            elif isinstance(series.dtype, pd.Float64Dtype):
+                df[col] = series.to_numpy(dtype=float_dtype, na_value=np.nan)
+            elif isinstance(series.dtype, pd.Int64Dtype):
+                df[col] = (
+                    series.to_numpy(dtype=float_dtype, na_value=np.nan)
+                    if series.isna().any()
+                    else series.astype("int64")
+                )
+            elif series.nunique() < len(series) / 2:
+                df[col] = series.astype("category")
+        return df
+
     @staticmethod
+    @Metrics.timed("transform")
     def _process_df(df: pd.DataFrame) -> pd.DataFrame:
         # Convert all columns to string
         df = df.astype("string")
@@ -298,42 +365,31 @@ class FinvizScreener(Finviz):
         return self._table.copy(deep=True)
 
     @classmethod
-    def load_stock_descriptions(cls) -> None:
+    @Profiler.profiled
+    def load_stock_descriptions(cls, background: bool = False) -> Future | None:
+        """
+        Brings Finviz_Stocks_Description in line with Finviz_Stocks: tickers no longer in the stocks table are deleted, and
+        descriptions are downloaded for new tickers and for those still missing one. The downloads run before any write; the
+        changes are then written in one transaction (queued on the write-behind loader with background=True).
+        """
+        table = Finviz_Stocks_Description
         with DBConnection() as conn:
-            # Delete orphan rows (tickers) from description table that are not in stocks table
-            delete_stmt = delete(Finviz_Stocks_Description).where(
-                ~exists().where(Finviz_Stocks.ticker == Finviz_Stocks_Description.ticker)
-            )
-            conn._connection.execute(delete_stmt)
-
-            # Add rows (tickers) from stocks table that are not in description table
-            insert_stmt = insert(Finviz_Stocks_Description).from_select(
-                [Finviz_Stocks_Description.ticker],
-                select(Finviz_Stocks.ticker).where(
-                    ~exists().where(Finviz_Stocks_Description.ticker == Finviz_Stocks.ticker)
-                ),
-            )
-            conn._connection.execute(insert_stmt)
-
-            # Find tickers with missing descriptions (NULL)
-            select_stmt = select(Finviz_Stocks_Description.ticker).where(
-                Finviz_Stocks_Description.description.is_(None)
-            )
-            result = conn._connection.execute(select_stmt).fetchall()
-            null_description_tickers = [ticker for ticker, *_ in result]
-
-            # Download and update missing descriptions
-            if null_description_tickers:
-                ticker_desc_map = cls.stock_description(null_description_tickers)
-                if not ticker_desc_map:
-                    return
-                case_stmt = case(ticker_desc_map, value=Finviz_Stocks_Description.ticker)
-                stmt = (
-                    update(Finviz_Stocks_Description)
-                    .where(Finviz_Stocks_Description.ticker.in_(ticker_desc_map.keys()))
-                    .values(description=case_stmt)
-                )
-                conn._connection.execute(stmt)
+            conn.ensure_table(table)
+            conn.ensure_search_index(table.name())
+            stock_tickers = set(conn._connection.execute(select(Finviz_Stocks.ticker)).scalars())
+            stored = dict(conn._connection.execute(select(table.ticker, table.description)).all())
+
+        new_tickers = sorted(stock_tickers - stored.keys())
+        missing = new_tickers + sorted(
+            t for t, description in stored.items() if description is None and t in stock_tickers
+        )
+        ticker_desc_map = cls.stock_description(missing) if missing else {}
+
+        # New tickers are inserted even without a description (NULL, retried next time)
+        data_rows = [{"ticker": t, "description": ticker_desc_map.get(t)} for t in new_tickers]
+        data_rows += [{"ticker": t, "description": d} for t, d in ticker_desc_map.items() if t in stored]
+        delete_keys = [{"ticker": t} for t in sorted(stored.keys() - stock_tickers)]
+        return write_tables(TableWrite(table.name(), data_rows, delete_keys=delete_keys), background=background)
 
     @staticmethod
     def stock_description(tickers: list[str]) -> dict[str, str | None]:
@@ -264,3 +264,146 @@ ISM_SER_REPORT_STRUCTURE = MappingProxyType(
         ),
     }
 )
+
+
+# The mappings below describe where each value of an ISM report's database row is found once the report sections are extracted.
+# Fields map a database column to a report section; cells map a report table to tuples of
+# (row position, database column prefix, {column position: database column suffix}).
+
+INDEX_CELLS = MappingProxyType({0: "index_value", 3: "direction", 4: "change_rate", 5: "trend_months"})
+TREND_CELLS = MappingProxyType({3: "direction", 4: "change_rate", 5: "trend_months"})
+HIGHER_CELLS = MappingProxyType({3: "higher_pct", 4: "same_pct", 5: "lower_pct"})
+SLOWER_CELLS = MappingProxyType({3: "slower_pct", 4: "same_pct", 5: "faster_pct"})
+REPORTING_CELLS = MappingProxyType({3: "reporting_pct", 4: "higher_pct", 5: "same_pct", 6: "lower_pct"})
+SHIFTED_HIGHER_CELLS = MappingProxyType({4: "higher_pct", 5: "same_pct", 6: "lower_pct"})
+SENTIMENT_CELLS = MappingProxyType({4: "too_high_pct", 5: "about_right_pct", 6: "too_low_pct"})
+CUSTOMER_INVENTORIES_CELLS = MappingProxyType(
+    {3: "reporting_pct", 4: "too_high_pct", 5: "about_right_pct", 6: "too_low_pct"}
+)
+LEAD_TIME_CELLS = MappingProxyType(
+    {
+        3: "hand_to_mouth_pct",
+        4: "thirty_days_pct",
+        5: "sixty_days_pct",
+        6: "ninety_days_pct",
+        7: "six_months_pct",
+        8: "year_plus_pct",
+        9: "avg",
+    }
+)
+
+ISM_MAN_REPORT_FIELDS = MappingProxyType(
+    {
+        "year": "year",
+        "month": "month",
+        "headline": "headline",
+        "highlights": "highlights",
+        "overview": "overview",
+        "comments": "comments",
+        "commodities_up": "comm_price_up",
+        "commodities_down": "comm_price_down",
+        "commodities_short": "comm_supply_short",
+        "index_summary": "index_summary",
+        "new_orders": "new_orders_text",
+        "production": "production_text",
+        "employment": "employment_text",
+        "supplier_deliveries": "supplier_deliveries_text",
+        "inventories": "inventories_text",
+        "customer_inventories": "customer_inventories_text",
+        "prices": "prices_text",
+        "backlog_orders": "backlog_orders_text",
+        "export_orders": "export_orders_text",
+        "imports": "imports_text",
+        "buying_policy": "buying_policy_text",
+    }
+)
+
+ISM_MAN_REPORT_CELLS = MappingProxyType(
+    {
+        "full_pmi_table": (
+            (0, "pmi", INDEX_CELLS),
+            (1, "new_orders", INDEX_CELLS),
+            (2, "production", INDEX_CELLS),
+            (3, "employment", INDEX_CELLS),
+            (4, "supplier_deliveries", INDEX_CELLS),
+            (5, "inventories", INDEX_CELLS),
+            (6, "customer_inventories", INDEX_CELLS),
+            (7, "prices", INDEX_CELLS),
+            (8, "backlog_orders", INDEX_CELLS),
+            (9, "export_orders", INDEX_CELLS),
+            (10, "imports", INDEX_CELLS),
+            (11, "overall_economy", TREND_CELLS),
+            (12, "manufacturing_sector", TREND_CELLS),
+        ),
+        "new_orders_table": ((0, "new_orders", HIGHER_CELLS),),
+        "production_table": ((0, "production", HIGHER_CELLS),),
+        "employment_table": ((0, "employment", HIGHER_CELLS),),
+        "supplier_deliveries_table": ((0, "supplier_deliveries", SLOWER_CELLS),),
+        "inventories_table": ((0, "inventories", HIGHER_CELLS),),
+        "customer_inventories_table": ((0, "customer_inventories", CUSTOMER_INVENTORIES_CELLS),),
+        "prices_table": ((0, "prices", HIGHER_CELLS),),
+        "backlog_orders_table": ((0, "backlog_orders", REPORTING_CELLS),),
+        "export_orders_table": ((0, "export_orders", REPORTING_CELLS),),
+        "imports_table": ((0, "imports", REPORTING_CELLS),),
+        "buying_policy_table": (
+            (0, "capex_lead_time", LEAD_TIME_CELLS),
+            (1, "production_lead_time", LEAD_TIME_CELLS),
+            (2, "mro_lead_time", LEAD_TIME_CELLS),
+        ),
+    }
+)
+
+ISM_SER_REPORT_FIELDS = MappingProxyType(
+    {
+        "year": "year",
+        "month": "month",
+        "headline": "headline",
+        "highlights": "highlights",
+        "overview": "overview",
+        "comments": "comments",
+        "commodities_up": "comm_price_up",
+        "commodities_down": "comm_price_down",
+        "commodities_short": "comm_supply_short",
+        "index_summary": "index_summary",
+        "new_orders": "new_orders_text",
+        "employment": "employment_text",
+        "supplier_deliveries": "supplier_deliveries_text",
+        "inventories": "inventories_text",
+        "prices": "prices_text",
+        "backlog_orders": "backlog_orders_text",
+        "export_orders": "export_orders_text",
+        "imports": "imports_text",
+        "business_activity": "business_activity_text",
+        "inventory_sentiment": "inventory_sentiment_text",
+    }
+)
+
+ISM_SER_REPORT_CELLS = MappingProxyType(
+    {
+        "full_pmi_table": (
+            (0, "pmi", INDEX_CELLS),
+            (1, "business_activity", INDEX_CELLS),
+            (2, "new_orders", INDEX_CELLS),
+            (3, "employment", INDEX_CELLS),
+            (4, "supplier_deliveries", INDEX_CELLS),
+            (5, "inventories", INDEX_CELLS),
+            (6, "prices", INDEX_CELLS),
+            (7, "backlog_orders", INDEX_CELLS),
+            (8, "export_orders", INDEX_CELLS),
+            (9, "imports", INDEX_CELLS),
+            (10, "inventory_sentiment", INDEX_CELLS),
+            (12, "overall_economy", TREND_CELLS),
+            (13, "services_sector", TREND_CELLS),
+        ),
+        "new_orders_table": ((0, "new_orders", HIGHER_CELLS),),
+        "business_activity_table": ((0, "business_activity", HIGHER_CELLS),),
+        "employment_table": ((0, "employment", HIGHER_CELLS),),
+        "supplier_deliveries_table": ((0, "supplier_deliveries", SLOWER_CELLS),),
+        "inventories_table": ((0, "inventories", HIGHER_CELLS),),
+        "inventory_sentiment_table": ((0, "inventory_sentiment", SENTIMENT_CELLS),),
+        "prices_table": ((0, "prices", HIGHER_CELLS),),
+        "backlog_orders_table": ((0, "backlog_orders", SHIFTED_HIGHER_CELLS),),
+        "export_orders_table": ((0, "export_orders", SHIFTED_HIGHER_CELLS),),
+        "imports_table": ((0, "imports", SHIFTED_HIGHER_CELLS),),
+    }
+)
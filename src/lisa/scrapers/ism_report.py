@@ -2,18 +2,30 @@ from __future__ import annotations
 
 import io
 import re
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime
+from types import MappingProxyType
 from urllib.parse import urlparse
 
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
 from bs4.element import ResultSet, Tag
 
-from lisa.common import DBConnection, TemplateLogger, WebSession
+from lisa.common import Metrics, Profiler, TableWrite, TemplateLogger, WebSession, write_tables
 from lisa.database_model import US_Man_Industry_Ranking, US_Man_Pmi_Report, US_Ser_Industry_Ranking, US_Ser_Pmi_Report
 
-from .html_dictionary import ISM_MAN_REPORT_STRUCTURE, ISM_SER_REPORT_STRUCTURE
-from .utils import MONTHS, custom_table_to_df, find_content, p_to_str, set_class_prop, set_private_attr
+from .html_dictionary import (
+    ISM_MAN_REPORT_CELLS,
+    ISM_MAN_REPORT_FIELDS,
+    ISM_MAN_REPORT_STRUCTURE,
+    ISM_SER_REPORT_CELLS,
+    ISM_SER_REPORT_FIELDS,
+    ISM_SER_REPORT_STRUCTURE,
+)
+from .utils import MONTHS, NavigationPlan, custom_table_to_df, p_to_str, set_class_prop, set_private_attr
 
 URL_MAN = "https://www.ismworld.org/supply-management-news-and-reports/reports/ism-report-on-business/pmi/"
 URL_SER = "https://www.ismworld.org/supply-management-news-and-reports/reports/ism-report-on-business/services/"
@@ -57,6 +69,8 @@ SERV_SECTORS = (
     "Utilities",
     "Wholesale Trade",
 )
+ISM_MAN_REPORT_PLAN = NavigationPlan(ISM_MAN_REPORT_STRUCTURE)
+ISM_SER_REPORT_PLAN = NavigationPlan(ISM_SER_REPORT_STRUCTURE)
 
 logger = TemplateLogger(__name__).logger
 
@@ -73,22 +87,28 @@ class IsmReport:
     Methods:
         download_manufacturing: Calls the _main method and constructs a ManufacturingPmi object from the returned dictionary.
         download_services: Calls the _main method and constructs a ServicesPmi object from the returned dictionary.
-        load: Calls the _load_report_table and _load_rankings_table methods to upload records to the database.
+        load: Writes the records of the _report_write and _rankings_write methods in one transaction (or in the background).
         _main: Determines the report url; calls the _parse_html method _transform_sections method to extract report setions.
         _parse_html: Parses and extracts relevant report sections from webpage HTML.
         _transform_sections: Transforms extracted HTML content into strings (text) and Pandas DataFrames (tables); derives "rankings" and "comments".
         _rankings: Ranks the industry sectors based on their growth/contraction.
         _respondents_say: Extracts comments from respondents and stores them in a Pandas DataFrame.
-        _load_report_table: Uploads report sections to the database.
-        _load_rankings_table: Uploads sector rankings to the database.
+        _report_write: Prepares the write of report sections to the database.
+        _rankings_write: Prepares the write of sector rankings to the database.
         _prep_report_table: Prepares records from various report sections to be uploaded to the database.
+        build_report_rows: Prepares records for a batch of reports in one pass, driven by the compiled report schemas.
+        _section_array: Returns a report table as a NumPy array, ready for cell lookups.
         _prep_rankings_table: Prepares records from sector rankings to be uploaded to the database.
     """
 
     @classmethod
+    @Profiler.profiled
     def download_manufacturing(cls, url: str | None = None) -> ManufacturingPmi | None:
         cls._report_type = "m"
         sections = cls._main(url)
+        if sections is None:
+            logger.error(f"Error in downloading the ISM manufacturing report: {url or 'latest'}")
+            return None
         nones = [k for k, v in sections.items() if v is None]
         if nones:
             logger.error(f"Some sections of the ISM manufacturing report could not be processed correctly.\n{nones}")
@@ -97,9 +117,13 @@ class IsmReport:
         return ManufacturingPmi(sections)
 
     @classmethod
+    @Profiler.profiled
     def download_services(cls, url: str | None = None) -> ServicesPmi | None:
         cls._report_type = "s"
         sections = cls._main(url)
+        if sections is None:
+            logger.error(f"Error in downloading the ISM services report: {url or 'latest'}")
+            return None
         nones = [k for k, v in sections.items() if v is None]
         if nones:
             logger.error(f"Some sections of the ISM services report could not be processed correctly.\n{nones}")
@@ -149,10 +173,12 @@ class IsmReport:
         return sections
 
     @classmethod
+    @Metrics.timed("parse")
     def _parse_html(cls, html_content: str) -> dict[str, Tag | ResultSet | None]:
         """
         Parses the webpage HTML using BeautifulSoup. Extracts and stores the HTML of relevant sections in a dictionary.
-        The relevant sections and how to locate them in the HTML structure are defined in the "static" module.
+        The relevant sections and how to locate them in the HTML structure are defined in the "html_dictionary" module,
+        and are compiled into navigation plans that locate each shared anchor only once.
 
         Args:
             html_content: str
@@ -165,9 +191,8 @@ class IsmReport:
 
         soup = BeautifulSoup(html_content, "html.parser")
         html_sections = {}
-        navigation_scheme = ISM_MAN_REPORT_STRUCTURE if cls._report_type == "m" else ISM_SER_REPORT_STRUCTURE
-        for section_name, navigation_steps in navigation_scheme.items():
-            section_content = find_content(soup, navigation_steps)
+        navigation_plan = ISM_MAN_REPORT_PLAN if cls._report_type == "m" else ISM_SER_REPORT_PLAN
+        for section_name, section_content in navigation_plan.run(soup).items():
             if type(section_content) not in [Tag, ResultSet]:
                 html_sections[section_name] = None
             else:
@@ -175,6 +200,7 @@ class IsmReport:
         return html_sections
 
     @classmethod
+    @Metrics.timed("transform")
     def _transform_sections(
         cls, html_sections: dict[str, Tag | ResultSet | None]
     ) -> dict[str, str | list[pd.DataFrame] | None]:
@@ -372,11 +398,12 @@ class IsmReport:
 
         return df
 
-    def load(self) -> None:
-        self._load_report_table()
-        self._load_rankings_table()
+    @Profiler.profiled
+    @Metrics.timed("load", none_is_failure=False)
+    def load(self, background: bool = False) -> Future | None:
+        return write_tables(self._report_write(), self._rankings_write(), background=background)
 
-    def _load_report_table(self) -> None:
+    def _report_write(self) -> TableWrite:
         if isinstance(self, ManufacturingPmi):
             column_map = US_Man_Pmi_Report.column_map()
             table_name = US_Man_Pmi_Report.name()
@@ -392,10 +419,9 @@ class IsmReport:
             raise ValueError(f"No column mapping exists for:\n{new_cols}")
 
         data_rows = df.rename(columns=column_map).to_dict(orient="records")
-        with DBConnection() as conn:
-            conn.upsert_rows(table_name=table_name, data_rows=data_rows)
+        return TableWrite(table_name, data_rows)
 
-    def _load_rankings_table(self) -> None:
+    def _rankings_write(self) -> TableWrite:
         if isinstance(self, ManufacturingPmi):
             column_map = US_Man_Industry_Ranking.column_map()
             table_name = US_Man_Industry_Ranking.name()
@@ -411,280 +437,65 @@ class IsmReport:
             raise ValueError(f"No column mapping exists for:\n{new_cols}")
 
         data_rows = df.rename(columns=column_map).to_dict(orient="records")
-        with DBConnection() as conn:
-            conn.upsert_rows(table_name=table_name, data_rows=data_rows)
+        return TableWrite(table_name, data_rows)
 
     def _prep_report_table(self) -> pd.DataFrame:
-        if isinstance(self, ManufacturingPmi):
-            full_pmi_table = self.full_pmi_table
-            new_orders_table = self.new_orders_table
-            production_table = self.production_table
-            employment_table = self.employment_table
-            supplier_deliveries_table = self.supplier_deliveries_table
-            inventories_table = self.inventories_table
-            customer_inventories_table = self.customer_inventories_table
-            prices_table = self.prices_table
-            backlog_orders_table = self.backlog_orders_table
-            export_orders_table = self.export_orders_table
-            imports_table = self.imports_table
-            buying_policy_table = self.buying_policy_table[self.buying_policy_table["Month"] == self.month].sort_values(
-                "Category"
-            )
+        return self.build_report_rows([self])
 
-            data_row = pd.DataFrame(
-                index=[0],
-                data={
-                    "year": int(self.year),
-                    "month": int(self.month),
-                    "headline": str(self.headline),
-                    "highlights": str(self.highlights),
-                    "overview": str(self.overview),
-                    "comments": str(self.comments),
-                    "commodities_up": str(self.comm_price_up),
-                    "commodities_down": str(self.comm_price_down),
-                    "commodities_short": str(self.comm_supply_short),
-                    "index_summary": str(self.index_summary),
-                    "new_orders": str(self.new_orders_text),
-                    "production": str(self.production_text),
-                    "employment": str(self.employment_text),
-                    "supplier_deliveries": str(self.supplier_deliveries_text),
-                    "inventories": str(self.inventories_text),
-                    "customer_inventories": str(self.customer_inventories_text),
-                    "prices": str(self.prices_text),
-                    "backlog_orders": str(self.backlog_orders_text),
-                    "export_orders": str(self.export_orders_text),
-                    "imports": str(self.imports_text),
-                    "buying_policy": str(self.buying_policy_text),
-                    "pmi_index_value": float(full_pmi_table.iloc[0, 0]),
-                    "pmi_direction": str(full_pmi_table.iloc[0, 3]),
-                    "pmi_change_rate": str(full_pmi_table.iloc[0, 4]),
-                    "pmi_trend_months": int(full_pmi_table.iloc[0, 5]),
-                    "new_orders_index_value": float(full_pmi_table.iloc[1, 0]),
-                    "new_orders_direction": str(full_pmi_table.iloc[1, 3]),
-                    "new_orders_change_rate": str(full_pmi_table.iloc[1, 4]),
-                    "new_orders_trend_months": int(full_pmi_table.iloc[1, 5]),
-                    "production_index_value": float(full_pmi_table.iloc[2, 0]),
-                    "production_direction": str(full_pmi_table.iloc[2, 3]),
-                    "production_change_rate": str(full_pmi_table.iloc[2, 4]),
-                    "production_trend_months": int(full_pmi_table.iloc[2, 5]),
-                    "employment_index_value": float(full_pmi_table.iloc[3, 0]),
-                    "employment_direction": str(full_pmi_table.iloc[3, 3]),
-                    "employment_change_rate": str(full_pmi_table.iloc[3, 4]),
-                    "employment_trend_months": int(full_pmi_table.iloc[3, 5]),
-                    "supplier_deliveries_index_value": float(full_pmi_table.iloc[4, 0]),
-                    "supplier_deliveries_direction": str(full_pmi_table.iloc[4, 3]),
-                    "supplier_deliveries_change_rate": str(full_pmi_table.iloc[4, 4]),
-                    "supplier_deliveries_trend_months": int(full_pmi_table.iloc[4, 5]),
-                    "inventories_index_value": float(full_pmi_table.iloc[5, 0]),
-                    "inventories_direction": str(full_pmi_table.iloc[5, 3]),
-                    "inventories_change_rate": str(full_pmi_table.iloc[5, 4]),
-                    "inventories_trend_months": int(full_pmi_table.iloc[5, 5]),
-                    "customer_inventories_index_value": float(full_pmi_table.iloc[6, 0]),
-                    "customer_inventories_direction": str(full_pmi_table.iloc[6, 3]),
-                    "customer_inventories_change_rate": str(full_pmi_table.iloc[6, 4]),
-                    "customer_inventories_trend_months": int(full_pmi_table.iloc[6, 5]),
-                    "prices_index_value": float(full_pmi_table.iloc[7, 0]),
-                    "prices_direction": str(full_pmi_table.iloc[7, 3]),
-                    "prices_change_rate": str(full_pmi_table.iloc[7, 4]),
-                    "prices_trend_months": int(full_pmi_table.iloc[7, 5]),
-                    "backlog_orders_index_value": float(full_pmi_table.iloc[8, 0]),
-                    "backlog_orders_direction": str(full_pmi_table.iloc[8, 3]),
-                    "backlog_orders_change_rate": str(full_pmi_table.iloc[8, 4]),
-                    "backlog_orders_trend_months": int(full_pmi_table.iloc[8, 5]),
-                    "export_orders_index_value": float(full_pmi_table.iloc[9, 0]),
-                    "export_orders_direction": str(full_pmi_table.iloc[9, 3]),
-                    "export_orders_change_rate": str(full_pmi_table.iloc[9, 4]),
-                    "export_orders_trend_months": int(full_pmi_table.iloc[9, 5]),
-                    "imports_index_value": float(full_pmi_table.iloc[10, 0]),
-                    "imports_direction": str(full_pmi_table.iloc[10, 3]),
-                    "imports_change_rate": str(full_pmi_table.iloc[10, 4]),
-                    "imports_trend_months": int(full_pmi_table.iloc[10, 5]),
-                    "overall_economy_direction": str(full_pmi_table.iloc[11, 3]),
-                    "overall_economy_change_rate": str(full_pmi_table.iloc[11, 4]),
-                    "overall_economy_trend_months": int(full_pmi_table.iloc[11, 5]),
-                    "manufacturing_sector_direction": str(full_pmi_table.iloc[12, 3]),
-                    "manufacturing_sector_change_rate": str(full_pmi_table.iloc[12, 4]),
-                    "manufacturing_sector_trend_months": int(full_pmi_table.iloc[12, 5]),
-                    "new_orders_higher_pct": float(new_orders_table.iloc[0, 3]),
-                    "new_orders_same_pct": float(new_orders_table.iloc[0, 4]),
-                    "new_orders_lower_pct": float(new_orders_table.iloc[0, 5]),
-                    "production_higher_pct": float(production_table.iloc[0, 3]),
-                    "production_same_pct": float(production_table.iloc[0, 4]),
-                    "production_lower_pct": float(production_table.iloc[0, 5]),
-                    "employment_higher_pct": float(employment_table.iloc[0, 3]),
-                    "employment_same_pct": float(employment_table.iloc[0, 4]),
-                    "employment_lower_pct": float(employment_table.iloc[0, 5]),
-                    "supplier_deliveries_slower_pct": float(supplier_deliveries_table.iloc[0, 3]),
-                    "supplier_deliveries_same_pct": float(supplier_deliveries_table.iloc[0, 4]),
-                    "supplier_deliveries_faster_pct": float(supplier_deliveries_table.iloc[0, 5]),
-                    "inventories_higher_pct": float(inventories_table.iloc[0, 3]),
-                    "inventories_same_pct": float(inventories_table.iloc[0, 4]),
-                    "inventories_lower_pct": float(inventories_table.iloc[0, 5]),
-                    "customer_inventories_reporting_pct": float(customer_inventories_table.iloc[0, 3]),
-                    "customer_inventories_too_high_pct": float(customer_inventories_table.iloc[0, 4]),
-                    "customer_inventories_about_right_pct": float(customer_inventories_table.iloc[0, 5]),
-                    "customer_inventories_too_low_pct": float(customer_inventories_table.iloc[0, 6]),
-                    "prices_higher_pct": float(prices_table.iloc[0, 3]),
-                    "prices_same_pct": float(prices_table.iloc[0, 4]),
-                    "prices_lower_pct": float(prices_table.iloc[0, 5]),
-                    "backlog_orders_reporting_pct": float(backlog_orders_table.iloc[0, 3]),
-                    "backlog_orders_higher_pct": float(backlog_orders_table.iloc[0, 4]),
-                    "backlog_orders_same_pct": float(backlog_orders_table.iloc[0, 5]),
-                    "backlog_orders_lower_pct": float(backlog_orders_table.iloc[0, 6]),
-                    "export_orders_reporting_pct": float(export_orders_table.iloc[0, 3]),
-                    "export_orders_higher_pct": float(export_orders_table.iloc[0, 4]),
-                    "export_orders_same_pct": float(export_orders_table.iloc[0, 5]),
-                    "export_orders_lower_pct": float(export_orders_table.iloc[0, 6]),
-                    "imports_reporting_pct": float(imports_table.iloc[0, 3]),
-                    "imports_higher_pct": float(imports_table.iloc[0, 4]),
-                    "imports_same_pct": float(imports_table.iloc[0, 5]),
-                    "imports_lower_pct": float(imports_table.iloc[0, 6]),
-                    "capex_lead_time_hand_to_mouth_pct": float(buying_policy_table.iloc[0, 3]),
-                    "capex_lead_time_thirty_days_pct": float(buying_policy_table.iloc[0, 4]),
-                    "capex_lead_time_sixty_days_pct": float(buying_policy_table.iloc[0, 5]),
-                    "capex_lead_time_ninety_days_pct": float(buying_policy_table.iloc[0, 6]),
-                    "capex_lead_time_six_months_pct": float(buying_policy_table.iloc[0, 7]),
-                    "capex_lead_time_year_plus_pct": float(buying_policy_table.iloc[0, 8]),
-                    "capex_lead_time_avg": int(buying_policy_table.iloc[0, 9]),
-                    "production_lead_time_hand_to_mouth_pct": float(buying_policy_table.iloc[1, 3]),
-                    "production_lead_time_thirty_days_pct": float(buying_policy_table.iloc[1, 4]),
-                    "production_lead_time_sixty_days_pct": float(buying_policy_table.iloc[1, 5]),
-                    "production_lead_time_ninety_days_pct": float(buying_policy_table.iloc[1, 6]),
-                    "production_lead_time_six_months_pct": float(buying_policy_table.iloc[1, 7]),
-                    "production_lead_time_year_plus_pct": float(buying_policy_table.iloc[1, 8]),
-                    "production_lead_time_avg": int(buying_policy_table.iloc[1, 9]),
-                    "mro_lead_time_hand_to_mouth_pct": float(buying_policy_table.iloc[2, 3]),
-                    "mro_lead_time_thirty_days_pct": float(buying_policy_table.iloc[2, 4]),
-                    "mro_lead_time_sixty_days_pct": float(buying_policy_table.iloc[2, 5]),
-                    "mro_lead_time_ninety_days_pct": float(buying_policy_table.iloc[2, 6]),
-                    "mro_lead_time_six_months_pct": float(buying_policy_table.iloc[2, 7]),
-                    "mro_lead_time_year_plus_pct": float(buying_policy_table.iloc[2, 8]),
-                    "mro_lead_time_avg": int(buying_policy_table.iloc[2, 9]),
-                },
-            )
-        else:
-            full_pmi_table = self.full_pmi_table
-            new_orders_table = self.new_orders_table
-            business_activity_table = self.business_activity_table
-            employment_table = self.employment_table
-            supplier_deliveries_table = self.supplier_deliveries_table
-            inventories_table = self.inventories_table
-            inventory_sentiment_table = self.inventory_sentiment_table
-            prices_table = self.prices_table
-            backlog_orders_table = self.backlog_orders_table
-            export_orders_table = self.export_orders_table
-            imports_table = self.imports_table
-
-            data_row = pd.DataFrame(
-                index=[0],
-                data={
-                    "year": int(self.year),
-                    "month": int(self.month),
-                    "headline": str(self.headline),
-                    "highlights": str(self.highlights),
-                    "overview": str(self.overview),
-                    "comments": str(self.comments),
-                    "commodities_up": str(self.comm_price_up),
-                    "commodities_down": str(self.comm_price_down),
-                    "commodities_short": str(self.comm_supply_short),
-                    "index_summary": str(self.index_summary),
-                    "new_orders": str(self.new_orders_text),
-                    "employment": str(self.employment_text),
-                    "supplier_deliveries": str(self.supplier_deliveries_text),
-                    "inventories": str(self.inventories_text),
-                    "prices": str(self.prices_text),
-                    "backlog_orders": str(self.backlog_orders_text),
-                    "export_orders": str(self.export_orders_text),
-                    "imports": str(self.imports_text),
-                    "business_activity": str(self.business_activity_text),
-                    "inventory_sentiment": str(self.inventory_sentiment_text),
-                    "pmi_index_value": float(full_pmi_table.iloc[0, 0]),
-                    "pmi_direction": str(full_pmi_table.iloc[0, 3]),
-                    "pmi_change_rate": str(full_pmi_table.iloc[0, 4]),
-                    "pmi_trend_months": int(full_pmi_table.iloc[0, 5]),
-                    "business_activity_index_value": float(full_pmi_table.iloc[1, 0]),
-                    "business_activity_direction": str(full_pmi_table.iloc[1, 3]),
-                    "business_activity_change_rate": str(full_pmi_table.iloc[1, 4]),
-                    "business_activity_trend_months": int(full_pmi_table.iloc[1, 5]),
-                    "new_orders_index_value": float(full_pmi_table.iloc[2, 0]),
-                    "new_orders_direction": str(full_pmi_table.iloc[2, 3]),
-                    "new_orders_change_rate": str(full_pmi_table.iloc[2, 4]),
-                    "new_orders_trend_months": int(full_pmi_table.iloc[2, 5]),
-                    "employment_index_value": float(full_pmi_table.iloc[3, 0]),
-                    "employment_direction": str(full_pmi_table.iloc[3, 3]),
-                    "employment_change_rate": str(full_pmi_table.iloc[3, 4]),
-                    "employment_trend_months": int(full_pmi_table.iloc[3, 5]),
-                    "supplier_deliveries_index_value": float(full_pmi_table.iloc[4, 0]),
-                    "supplier_deliveries_direction": str(full_pmi_table.iloc[4, 3]),
-                    "supplier_deliveries_change_rate": str(full_pmi_table.iloc[4, 4]),
-                    "supplier_deliveries_trend_months": int(full_pmi_table.iloc[4, 5]),
-                    "inventories_index_value": float(full_pmi_table.iloc[5, 0]),
-                    "inventories_direction": str(full_pmi_table.iloc[5, 3]),
-                    "inventories_change_rate": str(full_pmi_table.iloc[5, 4]),
-                    "inventories_trend_months": int(full_pmi_table.iloc[5, 5]),
-                    "prices_index_value": float(full_pmi_table.iloc[6, 0]),
-                    "prices_direction": str(full_pmi_table.iloc[6, 3]),
-                    "prices_change_rate": str(full_pmi_table.iloc[6, 4]),
-                    "prices_trend_months": int(full_pmi_table.iloc[6, 5]),
-                    "backlog_orders_index_value": float(full_pmi_table.iloc[7, 0]),
-                    "backlog_orders_direction": str(full_pmi_table.iloc[7, 3]),
-                    "backlog_orders_change_rate": str(full_pmi_table.iloc[7, 4]),
-                    "backlog_orders_trend_months": int(full_pmi_table.iloc[7, 5]),
-                    "export_orders_index_value": float(full_pmi_table.iloc[8, 0]),
-                    "export_orders_direction": str(full_pmi_table.iloc[8, 3]),
-                    "export_orders_change_rate": str(full_pmi_table.iloc[8, 4]),
-                    "export_orders_trend_months": int(full_pmi_table.iloc[8, 5]),
-                    "imports_index_value": float(full_pmi_table.iloc[9, 0]),
-                    "imports_direction": str(full_pmi_table.iloc[9, 3]),
-                    "imports_change_rate": str(full_pmi_table.iloc[9, 4]),
-                    "imports_trend_months": int(full_pmi_table.iloc[9, 5]),
-                    "inventory_sentiment_index_value": float(full_pmi_table.iloc[10, 0]),
-                    "inventory_sentiment_direction": str(full_pmi_table.iloc[10, 3]),
-                    "inventory_sentiment_change_rate": str(full_pmi_table.iloc[10, 4]),
-                    "inventory_sentiment_trend_months": int(full_pmi_table.iloc[10, 5]),
-                    "overall_economy_direction": str(full_pmi_table.iloc[12, 3]),
-                    "overall_economy_change_rate": str(full_pmi_table.iloc[12, 4]),
-                    "overall_economy_trend_months": int(full_pmi_table.iloc[12, 5]),
-                    "services_sector_direction": str(full_pmi_table.iloc[13, 3]),
-                    "services_sector_change_rate": str(full_pmi_table.iloc[13, 4]),
-                    "services_sector_trend_months": int(full_pmi_table.iloc[13, 5]),
-                    "new_orders_higher_pct": float(new_orders_table.iloc[0, 3]),
-                    "new_orders_same_pct": float(new_orders_table.iloc[0, 4]),
-                    "new_orders_lower_pct": float(new_orders_table.iloc[0, 5]),
-                    "business_activity_higher_pct": float(business_activity_table.iloc[0, 3]),
-                    "business_activity_same_pct": float(business_activity_table.iloc[0, 4]),
-                    "business_activity_lower_pct": float(business_activity_table.iloc[0, 5]),
-                    "employment_higher_pct": float(employment_table.iloc[0, 3]),
-                    "employment_same_pct": float(employment_table.iloc[0, 4]),
-                    "employment_lower_pct": float(employment_table.iloc[0, 5]),
-                    "supplier_deliveries_slower_pct": float(supplier_deliveries_table.iloc[0, 3]),
-                    "supplier_deliveries_same_pct": float(supplier_deliveries_table.iloc[0, 4]),
-                    "supplier_deliveries_faster_pct": float(supplier_deliveries_table.iloc[0, 5]),
-                    "inventories_higher_pct": float(inventories_table.iloc[0, 3]),
-                    "inventories_same_pct": float(inventories_table.iloc[0, 4]),
-                    "inventories_lower_pct": float(inventories_table.iloc[0, 5]),
-                    "inventory_sentiment_too_high_pct": float(inventory_sentiment_table.iloc[0, 4]),
-                    "inventory_sentiment_about_right_pct": float(inventory_sentiment_table.iloc[0, 5]),
-                    "inventory_sentiment_too_low_pct": float(inventory_sentiment_table.iloc[0, 6]),
-                    "prices_higher_pct": float(prices_table.iloc[0, 3]),
-                    "prices_same_pct": float(prices_table.iloc[0, 4]),
-                    "prices_lower_pct": float(prices_table.iloc[0, 5]),
-                    "backlog_orders_higher_pct": float(backlog_orders_table.iloc[0, 4]),
-                    "backlog_orders_same_pct": float(backlog_orders_table.iloc[0, 5]),
-                    "backlog_orders_lower_pct": float(backlog_orders_table.iloc[0, 6]),
-                    "export_orders_higher_pct": float(export_orders_table.iloc[0, 4]),
-                    "export_orders_same_pct": float(export_orders_table.iloc[0, 5]),
-                    "export_orders_lower_pct": float(export_orders_table.iloc[0, 6]),
-                    "imports_higher_pct": float(imports_table.iloc[0, 4]),
-                    "imports_same_pct": float(imports_table.iloc[0, 5]),
-                    "imports_lower_pct": float(imports_table.iloc[0, 6]),
-                },
-            )
+    @staticmethod
+    def build_report_rows(reports: Sequence[IsmReport]) -> pd.DataFrame:
+        """
+        Builds database rows for a batch of reports of the same type in one pass, using the report schemas compiled from the
+        html_dictionary mappings. For each report table, all mapped cells are read with a single array lookup; each database
+        column is then cast once (across all reports) to the type declared in US_Man_Pmi_Report or US_Ser_Pmi_Report.
 
-        if data_row.isna().any().any():
+        Args:
+            reports: Sequence[IsmReport]
+            ManufacturingPmi objects or ServicesPmi objects (not mixed), e.g. a backfill of historical reports.
+
+        Returns:
+            data_rows: pd.DataFrame
+            A Pandas DataFrame with one row per report and columns named as in the database table.
+        """
+        if not reports:
+            raise ValueError("No reports received.")
+        report_cls = type(reports[0])
+        if report_cls not in REPORT_SCHEMAS or not all(type(r) is report_cls for r in reports):
+            raise TypeError("Reports must all be ManufacturingPmi objects or all be ServicesPmi objects.")
+        schema = REPORT_SCHEMAS[report_cls]
+
+        data = {col: [getattr(r, f"_{section}", None) for r in reports] for col, section in schema.fields.items()}
+        for section, (rows, cols, col_names) in schema.cells.items():
+            block = np.empty((len(reports), len(col_names)), dtype=object)
+            for i, report in enumerate(reports):
+                try:
+                    block[i] = report._section_array(section)[rows, cols]
+                except (AttributeError, IndexError, TypeError):
+                    raise ValueError(
+                        f"Section '{section}' of the ISM report is missing or incomplete. Cannot proceed with database update."
+                    )
+            data.update(zip(col_names, block.T))
+
+        data_rows = pd.DataFrame(data)
+        text_cols = [col for col, python_type in schema.dtypes.items() if python_type is str]
+        numeric_cols = [col for col in schema.dtypes if col not in text_cols]
+        for col in text_cols:
+            # Missing text (empty cells) stays None and is stored as NULL, rather than the string "nan"
+            data_rows[col] = data_rows[col].map(lambda value: None if pd.isna(value) else str(value)).astype(object)
+        data_rows[numeric_cols] = data_rows[numeric_cols].apply(pd.to_numeric, errors="coerce")
+
+        if data_rows[numeric_cols].isna().any().any():
             raise ValueError("Some sections of the ISM report are missing. Cannot proceed with database update.")
 
-        return data_row
+        int_cols = [col for col, python_type in schema.dtypes.items() if python_type is int]
+        data_rows[int_cols] = data_rows[int_cols].astype("int64")
+        return data_rows[list(schema.dtypes)]
+
+    def _section_array(self, section: str) -> np.ndarray:
+        table = getattr(self, f"_{section}")
+        if section == "buying_policy_table":
+            table = table[table["Month"] == self._month].sort_values("Category")
+        return table.to_numpy(dtype=object)
 
     def _prep_rankings_table(self) -> pd.DataFrame:
         if isinstance(self, ManufacturingPmi):
@@ -735,3 +546,49 @@ class ServicesPmi(IsmReport):
     def __init__(self, sections: dict) -> None:
         set_private_attr(self, sections)
         set_class_prop(self, sections)
+
+
+@dataclass(frozen=True)
+class ReportSchema:
+    """
+    Compiled form of the html_dictionary field and cell mappings for one report type.
+
+    Attributes:
+        fields: Mapping[str, str]
+        Database column names mapped to the report section (attribute) holding the value.
+
+        cells: Mapping[str, tuple[np.ndarray, np.ndarray, tuple[str]]]
+        Report table names mapped to the row positions, column positions and database column names of the mapped cells.
+
+        dtypes: Mapping[str, type]
+        Python types of the mapped database columns, in the order of the database table.
+    """
+
+    fields: Mapping[str, str]
+    cells: Mapping[str, tuple[np.ndarray, np.ndarray, tuple[str]]]
+    dtypes: Mapping[str, type]
+
+    @classmethod
+    def compile(cls, table: type, fields: Mapping[str, str], cells: Mapping[str, tuple]) -> ReportSchema:
+        compiled_cells = {}
+        for section, blocks in cells.items():
+            positions = [(row, col, f"{prefix}_{suffix}") for row, prefix, d in blocks for col, suffix in d.items()]
+            rows, cols, col_names = zip(*positions)
+            compiled_cells[section] = (np.array(rows), np.array(cols), col_names)
+
+        mapped_columns = set(fields).union(*(col_names for _, _, col_names in compiled_cells.values()))
+        table_types = {c.name: c.type.python_type for c in table.__table__.columns}
+        unknown_columns = mapped_columns - table_types.keys()
+        if unknown_columns:
+            raise ValueError(f"Mapped columns not in table {table.name()}:\n{sorted(unknown_columns)}")
+
+        dtypes = {name: typ for name, typ in table_types.items() if name in mapped_columns}
+        return cls(MappingProxyType(dict(fields)), MappingProxyType(compiled_cells), MappingProxyType(dtypes))
+
+
+REPORT_SCHEMAS = MappingProxyType(
+    {
+        ManufacturingPmi: ReportSchema.compile(US_Man_Pmi_Report, ISM_MAN_REPORT_FIELDS, ISM_MAN_REPORT_CELLS),
+        ServicesPmi: ReportSchema.compile(US_Ser_Pmi_Report, ISM_SER_REPORT_FIELDS, ISM_SER_REPORT_CELLS),
+    }
+)
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Any
+
+import sqlalchemy as db
+
+from lisa.common import DBConnection, Maintenance, Metrics, TemplateLogger, WebSession
+from lisa.database_model import (
+    Caixin_PMI,
+    EU_Economic_Sentiment,
+    Release_State,
+    US_Buildings,
+    US_Consumers,
+    US_Man_Pmi_Report,
+    US_Ser_Pmi_Report,
+)
+
+from .caixin_pmi import CaixinPmi
+from .construction_survey import URL_PERMIT, ConstructionSurvey
+from .consumer_survey import URL_INDEX, ConsumerSurvey
+from .euro_survey import URL_EURO, EuroSurvey
+from .ism_report import URL_MAN, URL_SER, IsmReport
+
+logger = TemplateLogger(__name__).logger
+
+
+def _ism_url(base_url: str, year: int | None, month: int | None) -> str | None:
+    # No stored month yet (empty table): None makes IsmReport download the latest report from its default URL.
+    # The URL only names the month, so until the new report is out it serves the report of the same month a year earlier.
+    if year is None:
+        return None
+    return f"{base_url}{date(year, month, 1).strftime('%B').lower()}/"
+
+
+@dataclass(frozen=True)
+class ReleaseSource:
+    """
+    Release calendar entry of a monthly source.
+
+    Attributes:
+        table: type
+        Database model the source loads into (its latest stored year/month determines the next expected release).
+
+        release_lag: int
+        Months between a data month and its release month (e.g. 1 for ISM: March data is released in April).
+
+        release_day: int
+        Day of the release month from which the release is expected.
+
+        probe: Callable[[int, int], str] | None
+        Returns the URL to poll (HEAD, conditional on the last seen ETag/Last-Modified) for the expected data year and month;
+        None if the source has no cheap probe and is fetched whenever due.
+
+        fetch: Callable[[int, int], Any]
+        Downloads the source for the expected data year and month (both None if the table is empty: the latest release);
+        returns an object with load(background=...), or None on failure.
+
+        data_month: Callable[[Any], tuple[int, int]] | None
+        Returns the data year and month of a downloaded object, if the source can tell; a download for another month than
+        expected is then not loaded (e.g. last year's ISM report, still served at the month's URL until the new one is out).
+    """
+
+    table: type
+    release_lag: int
+    release_day: int
+    probe: Callable[[int, int], str] | None
+    fetch: Callable[[int, int], Any]
+    data_month: Callable[[Any], tuple[int, int]] | None = None
+
+    def expected_release(self, year: int, month: int) -> date:
+        """Returns the earliest date on which data for the given year and month is expected."""
+        months = year * 12 + month - 1 + self.release_lag
+        return date(months // 12, months % 12 + 1, self.release_day)
+
+
+RELEASE_CALENDAR = MappingProxyType(
+    {
+        "ism_manufacturing": ReleaseSource(
+            table=US_Man_Pmi_Report,
+            release_lag=1,
+            release_day=1,
+            probe=lambda y, m: _ism_url(URL_MAN, y, m),
+            fetch=lambda y, m: IsmReport.download_manufacturing(_ism_url(URL_MAN, y, m)),
+            data_month=lambda report: (report.year, report.month),
+        ),
+        "ism_services": ReleaseSource(
+            table=US_Ser_Pmi_Report,
+            release_lag=1,
+            release_day=3,
+            probe=lambda y, m: _ism_url(URL_SER, y, m),
+            fetch=lambda y, m: IsmReport.download_services(_ism_url(URL_SER, y, m)),
+            data_month=lambda report: (report.year, report.month),
+        ),
+        "caixin_pmi": ReleaseSource(
+            table=Caixin_PMI,
+            release_lag=1,
+            release_day=3,
+            probe=None,
+            fetch=lambda y, m: CaixinPmi.download(),
+        ),
+        "consumer_survey": ReleaseSource(
+            table=US_Consumers,
+            release_lag=0,
+            release_day=28,
+            probe=lambda y, m: URL_INDEX,
+            fetch=lambda y, m: ConsumerSurvey.download(),
+        ),
+        "construction_survey": ReleaseSource(
+            table=US_Buildings,
+            release_lag=1,
+            release_day=17,
+            probe=lambda y, m: URL_PERMIT,
+            fetch=lambda y, m: ConstructionSurvey.download(),
+        ),
+        "euro_survey": ReleaseSource(
+            table=EU_Economic_Sentiment,
+            release_lag=0,
+            release_day=28,
+            probe=lambda y, m: URL_EURO,
+            fetch=lambda y, m: EuroSurvey.download(),
+        ),
+    }
+)
+
+
+class ReleaseScheduler:
+    """
+    Class for incremental, release-calendar-aware refreshes of the monthly sources.
+    A source is due once the expected release date of the month after its latest stored month has passed. Due sources are first
+    probed with a conditional HEAD request (If-None-Match/If-Modified-Since from the last successful load); only if the probe
+    reports new content is the full download run and loaded. Until the new month appears in the database, the source stays due
+    and is polled again on the next run. Probe validators and outcomes are kept in the Release_State table. Runs that load
+    anything end with database maintenance (Maintenance.run: indexes, statistics, vacuum).
+
+    Methods:
+        due: Returns the sources due on a date, with the data year/month expected from each.
+        run: Probes and loads the due sources; returns the outcome per source.
+    """
+
+    def __init__(self, calendar: Mapping[str, ReleaseSource] = RELEASE_CALENDAR) -> None:
+        self._calendar = calendar
+
+    def due(self, today: date | None = None) -> dict[str, tuple[int, int]]:
+        today = today or date.today()
+        due_sources = {}
+        with DBConnection() as conn:
+            for name, source in self._calendar.items():
+                year, month = self._next_month(conn, source.table)
+                if year is None or today >= source.expected_release(year, month):
+                    due_sources[name] = (year, month)
+        return due_sources
+
+    def run(self, today: date | None = None, force: bool = False) -> dict[str, str]:
+        """
+        Args:
+            today: date | None
+            Date to evaluate the release calendar on; today by default.
+
+            force: bool
+            Whether to skip the probe and download every due source.
+
+        Returns:
+            outcomes: dict[str, str]
+            Per source: "not due", "unchanged" (probe saw no new content), "loaded" (new month stored), "no new data"
+            (downloaded, but the expected month is not out yet) or "failed".
+        """
+        with DBConnection() as conn:
+            conn.ensure_table(Release_State)
+            states = {row.source: row._asdict() for row in conn._connection.execute(db.select(Release_State)).all()}
+
+        due_sources = self.due(today)
+        outcomes = {name: "not due" for name in self._calendar if name not in due_sources}
+        fetched = {}
+        with WebSession() as session:
+            for name, (year, month) in due_sources.items():
+                source = self._calendar[name]
+                state = states.get(name, {})
+                probe_url = source.probe(year, month) if source.probe and year is not None else None
+                validators = {}
+                if probe_url and not force:
+                    changed, validators = self._probe(session, probe_url, state)
+                    if not changed:
+                        Metrics.count("cache_hits", "ReleaseScheduler")
+                        outcomes[name] = "unchanged"
+                        self._save_state(name, probe_url, validators or state, outcomes[name])
+                        continue
+
+                fetched[name] = (self._fetch_and_submit(name, source, year, month), probe_url, validators)
+
+        # Loads are queued on the write-behind loader, so later sources download while earlier ones are written
+        for name, (result, probe_url, validators) in fetched.items():
+            year, month = due_sources[name]
+            outcomes[name] = (
+                result if isinstance(result, str) else self._outcome(name, self._calendar[name], year, month, result)
+            )
+            # Remember what was seen only once it has been loaded, so that failed loads are retried
+            state = states.get(name, {})
+            self._save_state(name, probe_url, state if outcomes[name] == "failed" else validators, outcomes[name])
+
+        logger.info(f"Release scheduler outcomes: {outcomes}")
+        if "loaded" in outcomes.values():
+            try:
+                Maintenance().run(report=False)
+            except Exception:
+                logger.exception("Error in database maintenance after scheduled loads.")
+        return outcomes
+
+    @staticmethod
+    def _next_month(conn: DBConnection, table: type) -> tuple[int | None, int | None]:
+        latest = conn._connection.execute(db.select(db.func.max(table.year * 12 + table.month - 1))).scalar()
+        if latest is None:
+            return None, None
+        return (latest + 1) // 12, (latest + 1) % 12 + 1
+
+    @staticmethod
+    def _probe(session: WebSession, url: str, state: dict[str, str | None]) -> tuple[bool, dict[str, str | None]]:
+        headers = {}
+        if state.get("probe_url") == url:
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+
+        response = session.head(url, headers=headers)
+        if response is None:  # e.g. 404 for a report page that is not published yet
+            return False, {}
+        validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        if response.status_code == 304:
+            return False, {}
+        # Some servers ignore conditional headers on HEAD; compare the validators directly
+        if headers and (validators["etag"], validators["last_modified"]) == (
+            state.get("etag"),
+            state.get("last_modified"),
+        ):
+            return False, validators
+        return True, validators
+
+    def _fetch_and_submit(
+        self, name: str, source: ReleaseSource, year: int | None, month: int | None
+    ) -> str | Future | None:
+        # Returns the outcome if nothing was loaded; otherwise the Future of the queued load (None if written directly)
+        try:
+            data = source.fetch(year, month)
+            if data is None:
+                return "failed"
+            if year is not None and source.data_month is not None and source.data_month(data) != (year, month):
+                logger.info(f"Downloaded {name} data is not for the expected month {year}-{month:02d}; not loaded.")
+                return "no new data"
+            return data.load(background=True)
+        except Exception:
+            logger.exception(f"Error in scheduled download and load of source: {name}")
+            return "failed"
+
+    def _outcome(
+        self, name: str, source: ReleaseSource, year: int | None, month: int | None, load: Future | None
+    ) -> str:
+        if load is not None:
+            try:
+                load.result()
+            except Exception:
+                logger.error(f"Scheduled load of source failed: {name}")  # the exception is logged by the writer
+                return "failed"
+
+        if year is None:
+            return "loaded"
+        with DBConnection() as conn:
+            next_year, next_month = self._next_month(conn, source.table)
+        return "loaded" if (next_year, next_month) > (year, month) else "no new data"
+
+    @staticmethod
+    def _save_state(name: str, probe_url: str | None, validators: dict[str, str | None], outcome: str) -> None:
+        row = {
+            "source": name,
+            "probe_url": probe_url,
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+            "checked_at": datetime.now().isoformat(timespec="seconds"),
+            "outcome": outcome,
+        }
+        with DBConnection() as conn:
+            conn.upsert_rows(Release_State.name(), [row])
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import io
+import os
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
 
 import pandas as pd
 from bs4 import BeautifulSoup
+from requests import Response
 
-from lisa.common import DBConnection, TemplateLogger, WebSession
+from lisa.common import Metrics, Profiler, TableWrite, TemplateLogger, WebSession, write_tables
 from lisa.database_model import Bonds as Bonds_Table
 from lisa.database_model import Commodities as Commodities_Table
 from lisa.database_model import Crypto as Crypto_Table
@@ -33,8 +38,13 @@ class TradingEconomics:
         download_bonds: Fetches bonds data from Trading Economics and returns a Bonds object.
         download_currencies: Fetches currencies data from Trading Economics and returns a Currencies object.
         download_crypto: Fetches crypto data from Trading Economics and returns a Crypto object.
-        _main: Sends GET request to Trading Economics; returns a dictionary of DataFrames using _clean_df and _split_units.
-        load: Uploads data to the database.
+        download_all: Fetches all five asset classes concurrently and parses them in worker processes; returns a dictionary of objects.
+        _main: Sends GET request to Trading Economics; returns a dictionary of DataFrames using _parse_response.
+        _parse_response: Returns the dictionary of DataFrames parsed from a response by _parse_text.
+        _parse_text: Reads the html tables of a page; returns a dictionary of DataFrames using _clean_df and _split_units.
+        load: Uploads data to the database (or queues it with background=True).
+        load_all: Uploads data for several asset classes to the database in a single transaction (or queues them as one batch).
+        _prep_rows: Maps the combined table to database column names; returns the table name and rows.
         _clean_df: Returns a cleaned DataFrame.
         _split_units: For the "commodities" table which has units in the first column, it splits the units out into a separate column.
         _combine_dfs: Concatenates DataFrames.
@@ -42,53 +52,125 @@ class TradingEconomics:
     """
 
     @classmethod
+    @Profiler.profiled
     def download_commodities(cls) -> Commodities | None:
         data_dict = cls._main(url=URL_COMMODITIES)
         return Commodities(data_dict) if data_dict else None
 
     @classmethod
+    @Profiler.profiled
     def download_stocks(cls) -> Stocks | None:
         data_dict = cls._main(url=URL_STOCKS)
         return Stocks(data_dict) if data_dict else None
 
     @classmethod
+    @Profiler.profiled
     def download_bonds(cls) -> Bonds | None:
         data_dict = cls._main(url=URL_BONDS)
         return Bonds(data_dict) if data_dict else None
 
     @classmethod
+    @Profiler.profiled
     def download_currencies(cls) -> Currencies | None:
         data_dict = cls._main(url=URL_CURRENCIES)
         return Currencies(data_dict) if data_dict else None
 
     @classmethod
+    @Profiler.profiled
     def download_crypto(cls) -> Crypto | None:
         data_dict = cls._main(url=URL_CRYPTO)
         return Crypto(data_dict) if data_dict else None
 
+    @classmethod
+    @Profiler.profiled
+    def download_all(cls) -> dict[str, TradingEconomics | None]:
+        """
+        Fetches the pages of all five asset classes concurrently over a single session (I/O, in threads), then parses them in
+        parallel worker processes, since HTML parsing holds the GIL. Scripts calling this on platforms that start processes by
+        spawning (Windows, macOS) need the usual if __name__ == "__main__" guard.
+
+        Returns:
+            assets: dict[str, TradingEconomics | None]
+            A dictionary of Commodities, Stocks, Bonds, Currencies and Crypto objects (None where a download failed).
+        """
+        urls = [url for url, _ in ASSET_CLASSES.values()]
+        with WebSession() as session, ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            responses = list(executor.map(session.get, urls))
+
+        # Only the page text is sent to the workers; a failed download is not parsed
+        texts = {url: response.text for url, response in zip(urls, responses) if response}
+        data_dicts = {}
+        if texts:
+            workers = min(len(texts), os.cpu_count() or 1)
+            with Metrics.stage("parse", "TradingEconomics", workers=workers) as record:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    data_dicts = dict(zip(texts, executor.map(cls._parse_text, texts, texts.values())))
+                record.add(rows=sum(len(d["table"]) for d in data_dicts.values() if d))
+
+        assets = {}
+        for name, (url, asset_cls) in ASSET_CLASSES.items():
+            data_dict = data_dicts.get(url)
+            assets[name] = asset_cls(data_dict) if data_dict else None
+        return assets
+
     @classmethod
     def _main(cls, url: str) -> dict[str, pd.DataFrame] | None:
         with WebSession() as session:
             response = session.get(url)
+        return cls._parse_response(url, response)
+
+    @classmethod
+    @Metrics.timed("parse", rows=lambda data_dict: len(data_dict["table"]))
+    def _parse_response(cls, url: str, response: Response | None) -> dict[str, pd.DataFrame] | None:
         if not response:
             return None
+        return cls._parse_text(url, response.text)
 
+    @classmethod
+    def _parse_text(cls, url: str, text: str) -> dict[str, pd.DataFrame] | None:
         try:
-            dfs = pd.read_html(io.StringIO(response.text))
+            dfs = pd.read_html(io.StringIO(text))
         except (ValueError, TypeError, pd.errors.ParserError):
             logger.exception(f"Error in reading html tables for {url}")
             return None
 
         clean_dfs = [cls._clean_df(df) for df in dfs]
         if "commodities" in url:
-            clean_dfs = cls._split_units(clean_dfs, response.text)
+            clean_dfs = cls._split_units(clean_dfs, text)
 
         category_dict = {df.columns[0].lower().strip(): df for df in clean_dfs}
         category_dict["table"] = cls._combine_dfs(clean_dfs)
 
         return category_dict
 
-    def load(self) -> None:
+    @Profiler.profiled
+    @Metrics.timed("load", none_is_failure=False)
+    def load(self, background: bool = False) -> Future | None:
+        table_name, data_rows = self._prep_rows()
+        return write_tables(TableWrite(table_name, data_rows, delete_first=True, staging=True), background=background)
+
+    @staticmethod
+    @Profiler.profiled
+    @Metrics.timed("load", none_is_failure=False)
+    def load_all(
+        assets: Mapping[str, TradingEconomics | None] | Iterable[TradingEconomics | None], background: bool = False
+    ) -> Future | None:
+        """
+        Uploads several asset classes in one transaction: the dictionary returned by download_all (load_all(download_all())),
+        or any iterable of asset class objects. Failed downloads (None) are skipped; if any table fails, no table is updated.
+        With background=True, the tables are queued as one write-behind batch and its Future is returned.
+        """
+        if isinstance(assets, Mapping):
+            assets = assets.values()
+        writes = [
+            TableWrite(name, rows, delete_first=True, staging=True)
+            for name, rows in (asset._prep_rows() for asset in assets if asset is not None)
+        ]
+        if not writes:
+            return None
+        return write_tables(*writes, background=background)
+
+    def _prep_rows(self) -> tuple[str, list[dict[str, Any]]]:
         if isinstance(self, Commodities):
             column_map = Commodities_Table.column_map()
             table_name = Commodities_Table.name()
@@ -117,8 +199,7 @@ class TradingEconomics:
             raise ValueError(f"No column mapping exists for:\n{new_cols}")
 
         data_rows = df.rename(columns=column_map).to_dict(orient="records")
-        with DBConnection() as conn:
-            conn.upsert_rows(table_name=table_name, data_rows=data_rows, delete_first=True)
+        return table_name, data_rows
 
     @staticmethod
     def _clean_df(df: pd.DataFrame) -> pd.DataFrame:
@@ -234,3 +315,12 @@ class Crypto(TradingEconomics):
     def __init__(self, data: dict) -> None:
         set_private_attr(self, data)
         set_class_prop(self, data)
+
+
+ASSET_CLASSES = {
+    "commodities": (URL_COMMODITIES, Commodities),
+    "stocks": (URL_STOCKS, Stocks),
+    "bonds": (URL_BONDS, Bonds),
+    "currencies": (URL_CURRENCIES, Currencies),
+    "crypto": (URL_CRYPTO, Crypto),
+}
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
 from enum import Enum
 from typing import Any
 
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
 from bs4.element import ResultSet, Tag
@@ -105,6 +107,66 @@ def find_content(html_soup: BeautifulSoup, steps: tuple[bs4_args]) -> Tag | Resu
     return target
 
 
+def _step_kwargs(args: bs4_args) -> dict[str, Any]:
+    return {k: v for k, v in args.__dict__.items() if v != "" and k != "method"}
+
+
+class NavigationPlan:
+    """
+    Compiled form of a report structure from the html_dictionary module (a mapping of section names to bs4_args chains).
+    Chains are merged into a tree so that shared prefixes (e.g. the same <h3> anchor for a section's text and table) form a single node.
+    Key-word arguments and BeautifulSoup methods are resolved once at compile time; when run on a document, each node is evaluated
+    once and its result is reused by every section below it.
+
+    Args:
+        structure: Mapping[str, tuple[bs4_args]]
+        A mapping of section names to a tuple of bs4_args objects, e.g. ISM_MAN_REPORT_STRUCTURE.
+    """
+
+    def __init__(self, structure: Mapping[str, tuple[bs4_args]]) -> None:
+        node_ids: dict[tuple[bs4_args], int] = {}
+        self._nodes: list[tuple[int | None, Callable, dict[str, Any]]] = []
+        self._sections: dict[str, int | None] = {}
+
+        for section_name, steps in structure.items():
+            parent_id = None
+            for depth in range(1, len(steps) + 1):
+                prefix = tuple(steps[:depth])
+                if prefix not in node_ids:
+                    args = prefix[-1]
+                    node_ids[prefix] = len(self._nodes)
+                    self._nodes.append((parent_id, getattr(Tag, args.method), _step_kwargs(args)))
+                parent_id = node_ids[prefix]
+            self._sections[section_name] = parent_id
+
+    def run(self, html_soup: BeautifulSoup) -> dict[str, Tag | ResultSet | None]:
+        """
+        Evaluates every node of the plan once against a document and collects the result for each section.
+
+        Args:
+            html_soup: BeautifulSoup
+            The full HTML content of the webpage as a BeautifulSoup object.
+
+        Returns:
+            sections: dict[str, Tag | ResultSet | None]
+            A dictionary of section names and their relevant Tag or ResultSet objects (None where not found).
+        """
+        results: list[Tag | ResultSet | None] = [None] * len(self._nodes)
+        for node_id, (parent_id, method, kwargs) in enumerate(self._nodes):
+            target = html_soup if parent_id is None else results[parent_id]
+            if isinstance(target, Tag):
+                results[node_id] = method(target, **kwargs)
+
+        sections = {}
+        for section_name, node_id in self._sections.items():
+            target = results[node_id] if node_id is not None else None
+            if not target:
+                logger.error(f"Failed to find section: {section_name}")
+                target = None
+            sections[section_name] = target
+        return sections
+
+
 def p_to_str(html: Tag | ResultSet) -> str:
     """
     Converts a BeautifulSoup Tag or ResultSet object with <p> tags to a string.
@@ -134,11 +196,52 @@ def p_to_str(html: Tag | ResultSet) -> str:
         return None
 
 
+def _row_texts(row: Tag, repeat_spans: bool) -> list[str]:
+    """
+    Returns the stripped text of each <th>/<td> cell in a table row, with asterisks removed and merged cells (colspan) expanded.
+    Header rows repeat the text of a merged cell across its span; body rows keep the text in the first position and pad with "".
+    """
+    texts = []
+    for cell in row.children:
+        if cell.name not in ("th", "td"):
+            continue
+        text = cell.get_text(strip=True).replace("*", "")
+        span = int(cell.get("colspan", 1))
+        texts += [text] * span if repeat_spans else [text] + [""] * (span - 1)
+    return texts
+
+
+def _convert_columns(strings: np.ndarray) -> list[np.ndarray]:
+    """
+    Converts a 2D array of cell texts to floats in a single vectorized call, then picks a representation per column.
+    Columns where every non-empty cell is numeric become float64 (empty cells as NaN); text columns are kept as strings;
+    columns mixing both keep an object dtype with floats where valid. Empty cells of text and mixed columns become None, so
+    that missing text is stored as NULL.
+    """
+    floats = pd.to_numeric(pd.Series(strings.ravel()), errors="coerce").to_numpy(dtype="float64").reshape(strings.shape)
+    non_empty = strings != ""
+    failed = np.isnan(floats) & non_empty
+    n_failed = failed.sum(axis=0)
+
+    columns = []
+    for col in range(strings.shape[1]):
+        if n_failed[col] == 0:
+            columns.append(floats[:, col])
+        elif n_failed[col] == non_empty[:, col].sum():
+            columns.append(np.where(non_empty[:, col], strings[:, col], None))
+        else:
+            columns.append(np.where(failed[:, col], strings[:, col], floats[:, col].astype(object)))
+            columns[-1][~non_empty[:, col]] = None
+    return columns
+
+
 def custom_table_to_df(table_list: ResultSet) -> list[pd.DataFrame]:
     """
     Converts a BeautifulSoup ResultSet object with <Table> tags to a list of Pandas DataFrame objects.
     Asterisks are removed from table axes and numerical values are converted to floats where valid.
     This function is used instead of pandas.read_html() to handle complex tables with dual headers and merged cells.
+    Cell texts are collected into one array and converted in a single vectorized call, so fully numeric columns
+    keep a float64 dtype (with NaN for empty cells) rather than an object dtype.
 
     Args:
         table_list: ResultSet
@@ -158,53 +261,28 @@ def custom_table_to_df(table_list: ResultSet) -> list[pd.DataFrame]:
 
     extracted_tables = []
     for table in table_list:
-        table_data = []
         rows = table.find_all("tr")
         if len(rows) < 1:
             logger.error(f"Empty table encountered.\n{table}")
             return None
 
         # Check for dual headers
-        cells = rows[0].find_all(["th", "td"])
-        any_merged_cells = any([cell.has_attr("colspan") for cell in cells])
+        any_merged_cells = any([cell.has_attr("colspan") for cell in rows[0].find_all(["th", "td"])])
         num_headers = 2 if any_merged_cells else 1
 
         # Extract one or all headers
-        multi_index_arrays = []
-        for row_idx in range(num_headers):
-            cells = rows[row_idx].find_all(["th", "td"])
-            col_names = [cell.get_text(strip=True).replace("*", "") for cell in cells]
-            col_spans = [int(cell.get("colspan", 1)) for cell in cells]
-            header = []
-            for name, span in zip(col_names, col_spans):
-                header += [name] * span
-            multi_index_arrays.append(header)
+        multi_index_arrays = [_row_texts(row, repeat_spans=True) for row in rows[:num_headers]]
         multi_index = pd.MultiIndex.from_arrays(multi_index_arrays)
+        n_cols = len(multi_index)
+
+        # Extract table rows, padded or trimmed to the header width
+        body = [_row_texts(row, repeat_spans=False) for row in rows[num_headers:]]
+        strings = np.array([(row + [""] * n_cols)[:n_cols] for row in body], dtype=object).reshape(len(body), n_cols)
 
-        # Extract table rows
-        for row in rows[row_idx + 1 :]:
-            cells = row.find_all(["th", "td"])
-            merged_cells = int(cells[0].get("colspan", 1)) - 1
-            row_data = (
-                [cells[0].get_text(strip=True)]
-                + [None] * merged_cells
-                + [cell.get_text(strip=True) for cell in cells[1:]]
-            )
-            row_data = [cell.replace("*", "") if cell else "" for cell in row_data]
-            for index, value in enumerate(row_data):
-                try:
-                    row_data[index] = float(value)
-                except ValueError:
-                    pass
-            table_data.append(row_data)
-
-        # Convert to DataFrame
-        df = pd.DataFrame(table_data)
-        df.columns = multi_index
-        df = df.set_index(df.columns[0])
-        if isinstance(df.index.name, tuple):
-            df.index.name = df.index.name[-1]
-        df = df.fillna("")
+        # Convert to DataFrame, with the first column as index
+        index = pd.Index(strings[:, 0], dtype=object, name=multi_index[0][-1])
+        df = pd.DataFrame(dict(enumerate(_convert_columns(strings[:, 1:]))), index=index)
+        df.columns = multi_index[1:]
         extracted_tables.append(df)
 
     return extracted_tables[0]
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import sqlalchemy as db
+
+import lisa.common.db_connection as db_connection
+from lisa.analysis.timeseries import TimeSeriesStore
+from lisa.database_model import EU_Economic_Sentiment, Finviz_Stocks, GICS_Industries, GICS_Sectors
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """An empty SQLite database in place of the project database, for everything opened through DBConnection."""
+    engine = db.create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(db_connection, "ENGINE", engine)
+    monkeypatch.setattr(TimeSeriesStore, "_ordinals", {})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def write_months(engine):
+    """Returns a function upserting seeded random values of every non-key column of a monthly table for the given months."""
+    from lisa.common import DBConnection
+
+    def write(table: type, months: range | list[int], seed: int = 0, **values: float) -> None:
+        rng = np.random.default_rng(seed)
+        rows = []
+        for month in months:
+            row = {"year": month // 12, "month": month % 12 + 1}
+            for column in table.__table__.columns:
+                if column.name in row:
+                    continue
+                if column.name in values:
+                    row[column.name] = values[column.name]
+                elif column.type.python_type is float:
+                    row[column.name] = float(rng.normal(50, 5))
+                elif column.type.python_type is int:
+                    row[column.name] = int(rng.integers(0, 10))
+                else:
+                    row[column.name] = "text"
+            rows.append(row)
+        with DBConnection() as conn:
+            conn.ensure_table(table)
+            conn.upsert_rows(table.name(), rows)
+
+    return write
+
+
+@pytest.fixture
+def stocks(engine):
+    """Finviz_Stocks with 40 tickers of seeded random values, in two sectors and four industries."""
+    metadata = db.MetaData()  # the models have a declarative base each; the foreign keys resolve in one metadata
+    for model in (GICS_Sectors, GICS_Industries, Finviz_Stocks):
+        model.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for i in range(40):
+        row = {"ticker": f"T{i:02d}", "gics_sector_id": i % 2, "gics_industry_id": i % 4}
+        for column in Finviz_Stocks.__table__.columns:
+            if column.name in row:
+                continue
+            if column.type.python_type is float:
+                row[column.name] = float(rng.normal())
+            elif column.type.python_type is int:
+                row[column.name] = int(rng.integers(0, 100))
+            else:
+                row[column.name] = "text"
+        rows.append(row)
+    with engine.begin() as connection:
+        connection.execute(db.insert(Finviz_Stocks.__table__), rows)
+    return engine
+
+
+@pytest.fixture
+def eu_survey(engine):
+    """Returns a function building an EuroSurvey of seeded random values for the given number of months from 2020-01."""
+    import pandas as pd
+
+    from lisa.common import DBConnection
+    from lisa.scrapers import EuroSurvey
+
+    with DBConnection() as conn:
+        conn.ensure_table(EU_Economic_Sentiment)
+
+    def survey(months: int, seed: int = 0) -> EuroSurvey:
+        rng = np.random.default_rng(seed)
+        columns = [c for c in EU_Economic_Sentiment.column_map() if c not in ("Year", "Month")]
+        data = pd.DataFrame(rng.normal(100, 10, (months, len(columns))), columns=columns)
+        data.insert(0, "Year", 2020 + np.arange(months) // 12)
+        data.insert(1, "Month", np.arange(months) % 12 + 1)
+        return EuroSurvey(data)
+
+    return survey
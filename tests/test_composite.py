@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from lisa.analysis import Component, CompositeIndex
+from lisa.common import DBConnection
+from lisa.database_model import Caixin_PMI, US_Consumers, US_Man_Pmi_Report
+
+COMPONENTS = (
+    Component("US_Man_Pmi_Report.new_orders_index_value", weight=2),
+    Component("US_Consumers.expectations_index", lag=3, transform="yoy", invert=True),
+)
+BASE = 2000 * 12
+
+
+def _reference(panel: pd.DataFrame) -> pd.Series:
+    def z(s):
+        return (s - s.expanding().mean()) / s.expanding().std()
+
+    parts = pd.DataFrame(
+        {
+            "a": z(panel["US_Man_Pmi_Report.new_orders_index_value"]),
+            "b": -z(panel["US_Consumers.expectations_index"].pct_change(12, fill_method=None) * 100).shift(3),
+        }
+    )
+    weights = pd.Series({"a": 2.0, "b": 1.0})
+    available = parts.notna()
+    value = (parts.fillna(0) * weights).sum(axis=1) / (available * weights).sum(axis=1)
+    return value[(available * weights).sum(axis=1) / weights.sum() >= 0.5]
+
+
+def test_compute_from_a_month_matches_the_full_history(write_months):
+    write_months(US_Man_Pmi_Report, range(BASE, BASE + 60))
+    write_months(US_Consumers, range(BASE + 5, BASE + 60), seed=1)
+    index = CompositeIndex(components=COMPONENTS)
+
+    full = index.compute()
+    expected = _reference(index.panel.panel)
+    assert (full.index == expected.index).all()
+    assert np.allclose(full["value"], expected)
+
+    tail = index.compute(pd.Period("2003-06", freq="M"))
+    assert tail.index[0] == pd.Period("2003-06", freq="M")
+    assert np.allclose(tail["value"], full.loc[tail.index, "value"])
+
+
+def test_update_writes_the_changed_months_only_when_called(write_months):
+    write_months(US_Man_Pmi_Report, range(BASE, BASE + 36))
+    write_months(US_Consumers, range(BASE, BASE + 36), seed=1)
+    index = CompositeIndex(components=COMPONENTS)
+    assert len(index.update()) == len(index.compute())
+    assert index.update().empty
+
+    write_months(US_Man_Pmi_Report, range(BASE + 36, BASE + 38), seed=2)
+    assert CompositeIndex.read().index[-1] == pd.Period("2002-12", freq="M")  # loads leave the stored index alone
+    written = index.update()
+    assert written[["year", "month"]].values.tolist()[-2:] == [[2003, 1], [2003, 2]]
+    assert np.allclose(CompositeIndex.read()["value"], index.compute()["value"])
+
+
+def test_ensure_table_runs_in_the_callers_transaction(engine):
+    with DBConnection() as conn:
+        conn.ensure_table(US_Consumers)
+        conn.upsert_rows(US_Consumers.name(), [{"year": 2000, "month": 1, "expectations_index": 1.0}])
+        # The pending write holds SQLite's write lock; a table created on another connection would wait for it
+        conn.ensure_table(Caixin_PMI)
+        conn.upsert_rows(Caixin_PMI.name(), [{"year": 2000, "month": 1, "manufacturing_pmi": 50.0}])
+    assert pd.read_sql_table(Caixin_PMI.name(), engine)["manufacturing_pmi"].tolist() == [50.0]
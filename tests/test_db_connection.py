@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+import sqlalchemy as db
+
+from lisa.common import DBConnection
+from lisa.common.db_connection import MAX_STATEMENTS
+from lisa.database_model import US_Consumers
+
+STORED = {"year": 2000, "month": 1, "expectations_index": 1.0, "current_conditions_index": 2.0}
+
+
+@pytest.mark.parametrize("staging", [False, True])
+def test_conflicting_rows_update_only_received_columns(engine, staging):
+    with DBConnection() as conn:
+        conn.ensure_table(US_Consumers)
+        conn.upsert_rows(US_Consumers.name(), [STORED])
+    with DBConnection() as conn:
+        rows = [
+            {"year": 2000, "month": 1, "expectations_index": 3.0},
+            {"year": 2000, "month": 2, "expectations_index": 4.0},
+        ]
+        conn.upsert_rows(US_Consumers.name(), rows, staging=staging)
+
+    df = pd.read_sql_table(US_Consumers.name(), engine)
+    assert df["expectations_index"].tolist() == [3.0, 4.0]
+    assert df["current_conditions_index"].tolist()[0] == 2.0
+    assert pd.isna(df["current_conditions_index"].tolist()[1])
+
+
+@pytest.mark.parametrize("staging", [False, True])
+def test_values_are_converted_by_bind_processors(engine, staging):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE Events (id INTEGER PRIMARY KEY, at DATETIME)")
+    with DBConnection() as conn:
+        conn.upsert_rows("Events", [{"id": 1, "at": datetime(2020, 1, 2, 3, 4, 5)}], staging=staging)
+
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT at FROM Events").scalar() == "2020-01-02 03:04:05.000000"
+
+
+def test_statement_cache_follows_table_schema(engine):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE Schema_Change (id INTEGER PRIMARY KEY, value INTEGER)")
+    with DBConnection() as conn:
+        table = db.Table("Schema_Change", db.MetaData(), autoload_with=conn._connection)
+        first = DBConnection._upsert_statement(table, ["id"], ("id", "value"))
+        assert DBConnection._upsert_statement(table, ["id"], ("id", "value")) is first
+
+        table.append_column(db.Column("extra", db.Text))
+        assert DBConnection._upsert_statement(table, ["id"], ("id", "value")) is not first
+    assert len(DBConnection._upsert_statements) <= MAX_STATEMENTS
+
+
+def test_staged_upsert_deletes_missing_rows(engine):
+    with DBConnection() as conn:
+        conn.ensure_table(US_Consumers)
+        conn.upsert_rows(US_Consumers.name(), [{**STORED, "month": m} for m in (1, 2, 3)])
+    with DBConnection() as conn:
+        rows = [
+            {"year": 2000, "month": 2, "expectations_index": 5.0},
+            {"year": 2000, "month": 4, "expectations_index": 6.0},
+        ]
+        conn.upsert_rows(US_Consumers.name(), rows, staging=True, delete_missing=True)
+
+    df = pd.read_sql_table(US_Consumers.name(), engine).sort_values("month")
+    assert df["month"].tolist() == [2, 4]
+    assert df["expectations_index"].tolist() == [5.0, 6.0]
+    assert df["current_conditions_index"].tolist()[0] == 2.0
+
+
+def test_delete_missing_requires_staging(engine):
+    with DBConnection() as conn:
+        conn.ensure_table(US_Consumers)
+        with pytest.raises(ValueError, match="staging"):
+            conn.upsert_rows(US_Consumers.name(), [STORED], delete_missing=True)
+
+
+def test_invalid_rows_fail_before_any_write(engine):
+    with DBConnection() as conn:
+        conn.ensure_table(US_Consumers)
+    with pytest.raises(ValueError, match="failed validation"):
+        with DBConnection() as conn:
+            conn.upsert_rows(US_Consumers.name(), [STORED, {**STORED, "month": 13}], staging=True)
+    assert pd.read_sql_table(US_Consumers.name(), engine).empty
@@ -0,0 +1,38 @@
+import pytest
+
+from lisa.common import ArrowMirror, DBConnection, DuckDBBackend
+from lisa.database_model import GICS_Sectors
+
+pytest.importorskip("duckdb")
+
+
+@pytest.fixture
+def backend(stocks, tmp_path, monkeypatch):
+    monkeypatch.setattr(ArrowMirror, "available", staticmethod(lambda: False))  # copy from the test database only
+    backend = DuckDBBackend(path=tmp_path / "test.duckdb")
+    backend.sync()
+    yield backend
+    backend.close()
+
+
+def test_stale_copy_falls_back_to_sqlite(backend, monkeypatch):
+    sql = "SELECT COUNT(*) AS n FROM Finviz_Stocks"
+    assert backend.ready(sql)
+    with DBConnection() as conn:
+        conn.upsert_rows(GICS_Sectors.name(), [{"id": 9, "sector": "New"}])
+
+    assert backend.ready(sql)  # the copy of Finviz_Stocks is still current
+    assert not backend.ready("SELECT * FROM GICS_Sectors")
+    assert not backend.ready()
+
+    monkeypatch.setattr(DBConnection, "_analytics_backend", backend)
+    with DBConnection() as conn:
+        assert len(conn.analytical_query("SELECT * FROM GICS_Sectors")) == 1  # the new row, read from SQLite
+    assert backend.sync() == [GICS_Sectors.name()]
+    assert backend.ready()
+
+
+def test_queries_use_a_read_only_connection(backend):
+    assert backend.query("SELECT COUNT(*) AS n FROM Finviz_Stocks")["n"].iloc[0] == 40
+    with pytest.raises(Exception, match="read-only"):
+        backend._connection.execute("DELETE FROM Finviz_Stocks")
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+import sqlalchemy as db
+
+from lisa.analysis.indicators import month_range_clause
+from lisa.common import DBConnection, TableWrite
+from lisa.database_model import EU_Economic_Sentiment, EU_Economic_Sentiment_Long
+from lisa.scrapers import EuroSurvey
+
+
+def test_read_filters_on_the_series_key(eu_survey):
+    eu_survey(24).load(storage="long")
+
+    df = EuroSurvey.read(regions=["DE"], indicators=["esi"], start=(2020, 6), end=(2021, 2), wide=False)
+    assert list(zip(df["year"], df["month"])) == [(2020, m) for m in range(6, 13)] + [(2021, 1), (2021, 2)]
+    assert set(df["region"]) == {"DE"} and set(df["indicator"]) == {"esi"}
+
+    table = EU_Economic_Sentiment_Long
+    stmt = db.select(table.value).where(
+        table.region == "DE", table.indicator == "esi", *month_range_clause(table, (2020, 6), (2021, 2))
+    )
+    with DBConnection() as conn:
+        sql = str(stmt.compile(conn._connection, compile_kwargs={"literal_binds": True}))
+        plan = " ".join(row[-1] for row in conn._connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    assert "USING PRIMARY KEY" in plan
+
+
+def test_both_storages_are_written_in_one_transaction(eu_survey, monkeypatch):
+    survey = eu_survey(3)
+    bad_write = TableWrite(EU_Economic_Sentiment_Long.name(), [{"year": 2020, "value": 1.0}])  # key columns missing
+    monkeypatch.setattr(EuroSurvey, "_long_write", staticmethod(lambda incoming: bad_write))
+
+    with pytest.raises(ValueError):
+        survey.load(storage="both")
+    with DBConnection() as conn:
+        assert conn.df_from_sql(EU_Economic_Sentiment.name()).empty
+
+
+def test_long_and_wide_storages_round_trip(eu_survey):
+    survey = eu_survey(14)
+    survey.load(storage="both")
+
+    with DBConnection() as conn:
+        stored_wide = conn.df_from_sql(EU_Economic_Sentiment.name()).sort_values(["year", "month"], ignore_index=True)
+    read_wide = EuroSurvey.read()
+    pd.testing.assert_frame_equal(read_wide, stored_wide[read_wide.columns], check_dtype=False)
+    assert list(read_wide.columns) == EU_Economic_Sentiment.columns()
+
+    long = EuroSurvey.to_long(stored_wide)
+    pd.testing.assert_frame_equal(EuroSurvey.to_wide(long), read_wide)
+
+
+def test_reload_deletes_values_missing_from_the_download(eu_survey):
+    eu_survey(3).load(storage="long")
+    data = eu_survey(3, seed=1).table
+    data.iloc[1, 2:4] = None  # two values of 2020-02 no longer published
+    EuroSurvey(data).load(storage="long")
+
+    df = EuroSurvey.read(wide=False)
+    n_columns = len(EU_Economic_Sentiment.column_map()) - 2
+    assert len(df) == 3 * n_columns - 2
+    expected = EuroSurvey.to_long(EuroSurvey(data).table.rename(columns=EU_Economic_Sentiment.column_map()))
+    assert sorted(df["value"]) == sorted(expected["value"])
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from lisa.analysis import StockFactors
+from lisa.common.read_cache import table_version
+from lisa.database_model import Finviz_Stocks, Stock_Factors
+
+
+def _stored(engine) -> pd.DataFrame:
+    return pd.read_sql_table(Stock_Factors.name(), engine).sort_values(
+        ["ticker", "peer_group", "metric"], ignore_index=True
+    )
+
+
+def test_refresh_writes_only_changed_rows(stocks):
+    written = StockFactors().refresh()
+    first = _stored(stocks)
+    assert written == len(first) > 0
+
+    with stocks.connect() as connection:
+        version = table_version(connection, Stock_Factors.name())
+    assert StockFactors().refresh() == 0
+    with stocks.connect() as connection:
+        assert table_version(connection, Stock_Factors.name()) == version  # nothing written, nothing to re-export
+
+    with stocks.begin() as connection:
+        connection.exec_driver_sql("DELETE FROM Finviz_Stocks WHERE ticker = 'T00'")
+    assert StockFactors().refresh() > 0
+    after = _stored(stocks)
+    assert "T00" not in set(after["ticker"])
+
+    expected = StockFactors()
+    stock_rows = pd.read_sql_table(Finviz_Stocks.name(), stocks)
+    pct, _ = expected.compute(stock_rows, "sector")
+    stored_pct = after[after["peer_group"] == "sector"].pivot(index="ticker", columns="metric", values="pct_rank")
+    pd.testing.assert_frame_equal(stored_pct, pct[stored_pct.columns].rename_axis(columns="metric"), check_like=True)
@@ -0,0 +1,25 @@
+from lisa.common import DBConnection
+from lisa.database_model import Finviz_Stocks_Description
+from lisa.scrapers import FinvizScreener
+
+
+def test_stock_descriptions_follow_the_stocks_table(stocks, monkeypatch):
+    downloads = []
+
+    def stock_description(tickers):
+        downloads.append(list(tickers))
+        return {t: f"About {t}" for t in tickers if t != "T01"}
+
+    monkeypatch.setattr(FinvizScreener, "stock_description", staticmethod(stock_description))
+    with DBConnection() as conn:
+        conn.ensure_table(Finviz_Stocks_Description)
+        conn.upsert_rows(Finviz_Stocks_Description.name(), [{"ticker": "GONE", "description": "Delisted"}])
+
+    FinvizScreener.load_stock_descriptions()
+    FinvizScreener.load_stock_descriptions()
+
+    with DBConnection() as conn:
+        stored = conn.df_from_sql(Finviz_Stocks_Description.name()).set_index("ticker")["description"]
+    assert sorted(stored.index) == [f"T{i:02d}" for i in range(40)]
+    assert stored.isna().sum() == 1 and stored["T00"] == "About T00"
+    assert len(downloads[0]) == 40 and downloads[1] == ["T01"]  # only the missing description is retried
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from lisa.analysis import IndicatorPanel
+from lisa.analysis.indicators import month_range_clause
+from lisa.common import DBConnection
+from lisa.database_model import US_Buildings, US_Consumers
+
+TABLES = (US_Consumers, US_Buildings)
+BASE = 2000 * 12
+
+
+@pytest.fixture
+def panel(write_months):
+    write_months(US_Consumers, range(BASE, BASE + 24))
+    write_months(US_Buildings, range(BASE, BASE + 24), seed=1)
+    panel = IndicatorPanel(TABLES)
+    panel.zscore()  # cached statistics must follow the refreshed values
+    return panel
+
+
+def _assert_matches_new_panel(panel: IndicatorPanel) -> None:
+    expected = IndicatorPanel(TABLES)
+    pd.testing.assert_frame_equal(panel.panel, expected.panel)
+    pd.testing.assert_frame_equal(panel.zscore(), expected.zscore())
+
+
+def _delete(table: type, month: str) -> None:
+    with DBConnection() as conn:
+        conn._connection.execute(table.__table__.delete().where(*month_range_clause(table, month, month)))
+        conn.mark_changed(table.name())
+
+
+def test_refresh_without_changes(panel):
+    assert panel.refresh() is None
+
+
+def test_refresh_reads_new_months(panel, write_months):
+    write_months(US_Consumers, range(BASE + 24, BASE + 26), seed=2)
+    assert panel.refresh() == pd.Period("2002-01", freq="M")
+    _assert_matches_new_panel(panel)
+
+
+def test_refresh_reads_revisions_without_new_months(panel, write_months):
+    write_months(US_Consumers, [BASE + 22], seed=3)
+    assert panel.refresh() == pd.Period("2001-11", freq="M")
+    _assert_matches_new_panel(panel)
+
+
+def test_refresh_reads_backfills_before_the_last_month(write_months):
+    write_months(US_Consumers, [*range(BASE, BASE + 5), *range(BASE + 6, BASE + 24)])
+    panel = IndicatorPanel((US_Consumers,))
+    assert np.isnan(panel.panel.loc["2000-06", "US_Consumers.expectations_index"])
+
+    write_months(US_Consumers, [BASE + 5], seed=4)
+    assert panel.refresh() == pd.Period("2000-06", freq="M")
+    assert not np.isnan(panel.panel.loc["2000-06", "US_Consumers.expectations_index"])
+
+
+def test_refresh_reads_backfills_before_the_first_month(panel, write_months):
+    write_months(US_Buildings, range(BASE - 3, BASE), seed=5)
+    assert panel.refresh() == pd.Period("1999-10", freq="M")
+    _assert_matches_new_panel(panel)
+
+
+def test_refresh_drops_deleted_months(panel):
+    _delete(US_Consumers, "2000-03")
+    assert panel.refresh() == pd.Period("2000-03", freq="M")
+    assert np.isnan(panel.panel.loc["2000-03", "US_Consumers.expectations_index"])
+    _assert_matches_new_panel(panel)
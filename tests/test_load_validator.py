@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from lisa.common.load_validator import LoadValidator
+from lisa.database_model import US_Consumers
+
+VALID = {"year": 2000, "month": 1, "consumer_sentiment_index": 90.0, "expectations_index": 80}
+
+
+def _checks(rows: list[dict]) -> list[tuple]:
+    report = LoadValidator(US_Consumers.__table__).report(rows)
+    return list(zip(report["row"], report["column"], report["check"]))
+
+
+def test_valid_rows_pass():
+    rows = [VALID, {**VALID, "month": 2, "consumer_sentiment_index": None}]
+    assert _checks(rows) == []
+    LoadValidator(US_Consumers.__table__).validate(rows)
+
+
+def test_types_are_checked_per_column():
+    rows = [VALID, {**VALID, "month": 2, "consumer_sentiment_index": "90"}, {**VALID, "year": 2001, "month": True}]
+    assert _checks(rows) == [(2, "month", "type"), (1, "consumer_sentiment_index", "type")]
+
+
+def test_nulls_are_rejected_in_non_nullable_columns():
+    rows = [VALID, {**VALID, "year": 2001, "month": None}, {**VALID, "year": 2002, "month": np.nan}]
+    assert _checks(rows) == [(1, "month", "null"), (2, "month", "null")]
+
+
+def test_key_columns_must_be_received():
+    report = LoadValidator(US_Consumers.__table__).report([{"year": 2000, "expectations_index": 1.0}])
+    assert report[["column", "check"]].values.tolist() == [["month", "missing"]]
+    assert report["row"].isna().all()
+
+
+def test_duplicate_keys_are_reported_on_every_row():
+    rows = [VALID, {**VALID, "month": 2}, {**VALID, "expectations_index": 1.0}]
+    assert _checks(rows) == [(0, "year, month", "duplicate key"), (2, "year, month", "duplicate key")]
+
+
+def test_values_out_of_range():
+    rows = [
+        {**VALID, "month": 13},
+        {**VALID, "year": 1899},
+        {**VALID, "month": 3, "consumer_sentiment_index": float("inf")},
+    ]
+    assert _checks(rows) == [(1, "year", "range"), (0, "month", "range"), (2, "consumer_sentiment_index", "range")]
+
+
+def test_validate_raises_with_a_summary():
+    with pytest.raises(ValueError, match=r"range \(month\): 1 rows"):
+        LoadValidator(US_Consumers.__table__).validate([{**VALID, "month": 0}])
+
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(ValueError, match="new_column"):
+        LoadValidator(US_Consumers.__table__).report([{**VALID, "new_column": 1}])
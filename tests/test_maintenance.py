@@ -0,0 +1,31 @@
+from lisa.common import DBConnection, Maintenance
+from lisa.database_model import Finviz_Stocks_Description, Stock_Factors
+
+
+def test_ensure_indexes_adds_model_indexes_to_existing_tables(engine):
+    with DBConnection() as conn:
+        conn._connection.exec_driver_sql(
+            'CREATE TABLE "Finviz_Stocks_Description" (ticker TEXT PRIMARY KEY, description TEXT)'
+        )
+        conn.ensure_table(Stock_Factors)  # created with its index
+
+    assert Maintenance().ensure_indexes() == ["ix_Finviz_Stocks_Description_missing"]
+    assert Maintenance().ensure_indexes([Finviz_Stocks_Description.name()]) == []
+
+
+def test_vacuum_converts_only_when_asked(engine):
+    with DBConnection() as conn:
+        conn._connection.exec_driver_sql("CREATE TABLE filler (value TEXT)")
+        conn._connection.exec_driver_sql(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 2000) "
+            "INSERT INTO filler SELECT hex(randomblob(200)) FROM n"
+        )
+    with DBConnection() as conn:
+        conn._connection.exec_driver_sql("DELETE FROM filler")
+
+    def auto_vacuum():
+        with engine.connect() as connection:
+            return connection.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+
+    assert Maintenance().vacuum() == 0 and auto_vacuum() == 0
+    assert Maintenance().vacuum(convert=True) > 0 and auto_vacuum() == 2
@@ -0,0 +1,59 @@
+import json
+from collections import deque
+
+import pandas as pd
+import pytest
+
+import lisa.common.metrics as metrics
+from lisa.common import Metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics(monkeypatch):
+    monkeypatch.setattr(Metrics, "_pending", deque(maxlen=metrics.MAX_PENDING))
+    monkeypatch.setattr(Metrics, "_paths", None)
+    Metrics.reset()
+    yield
+    Metrics.reset()
+
+
+def test_flush_writes_only_once_configured(tmp_path, monkeypatch):
+    at_exit = []
+    monkeypatch.setattr(metrics.atexit, "register", at_exit.append)
+    with Metrics.stage("fetch", "host"):
+        pass
+
+    Metrics.flush()
+    assert len(Metrics._pending) == 1 and not at_exit
+
+    Metrics.configure(tmp_path / "metrics.jsonl", tmp_path / "metrics.prom")
+    Metrics.flush()
+    assert at_exit == [Metrics.flush] and not Metrics._pending
+    assert json.loads((tmp_path / "metrics.jsonl").read_text())["stage"] == "fetch"
+    assert 'lisa_stage_runs_total{source="host",stage="fetch"} 1' in (tmp_path / "metrics.prom").read_text()
+
+
+def test_timed_counts_rows_not_dictionary_keys():
+    @Metrics.timed("parse", source="sections")
+    def sections():
+        return {"a": pd.DataFrame({"x": range(5)}), "b": "text"}
+
+    @Metrics.timed("parse", source="tables", rows=lambda tables: len(tables["table"]))
+    def tables():
+        return {"table": pd.DataFrame({"x": range(5)}), "part": pd.DataFrame({"x": range(2)})}
+
+    sections()
+    tables()
+    summary = Metrics.summary().set_index("source")["rows"]
+    assert summary["sections"] == 0 and summary["tables"] == 5
+
+
+def test_pending_records_are_capped(monkeypatch):
+    monkeypatch.setattr(Metrics, "_pending", deque(maxlen=3))
+    for _ in range(5):
+        with Metrics.stage("fetch", "host"):
+            pass
+
+    assert len(Metrics._pending) == 3
+    assert Metrics._counters[("dropped_records", "Metrics")] == 2
+    assert Metrics.summary()["runs"].sum() == 5  # the aggregates still count every run
@@ -0,0 +1,51 @@
+import sqlalchemy as db
+
+from lisa.common import DBConnection, Metrics
+from lisa.common.read_cache import ReadCache, bump_version, table_version
+from lisa.common.search_index import INDEX_TABLE
+from lisa.database_model import Finviz_Stocks_Description, Table_Versions, US_Consumers
+
+
+def test_versions_table_is_created_by_the_first_bump(engine):
+    with engine.begin() as connection:
+        assert table_version(connection, "Some_Table") == 0
+        bump_version(connection, "Some_Table")
+        bump_version(connection, "Some_Table")
+        assert table_version(connection, "Some_Table") == 2
+    assert db.inspect(engine).has_table(Table_Versions.name())
+
+
+def test_search_index_version_follows_source_writes(engine):
+    Finviz_Stocks_Description.__table__.create(engine)
+    rows = [{"ticker": "AAA", "description": "Makes semiconductors."}]
+    with DBConnection() as conn:
+        conn.upsert_rows(Finviz_Stocks_Description.name(), rows)
+    with engine.connect() as connection:
+        first = table_version(connection, INDEX_TABLE)
+    assert first > 0
+
+    with DBConnection() as conn:
+        conn.upsert_rows(Finviz_Stocks_Description.name(), [{"ticker": "AAA", "description": "Makes tariffs."}])
+        assert conn.search("tariffs")["record_key"].tolist() == ["AAA"]
+    with engine.connect() as connection:
+        assert table_version(connection, INDEX_TABLE) > first
+
+
+def test_cached_result_is_read_again_after_a_write(engine):
+    with DBConnection() as conn:
+        conn.ensure_table(US_Consumers)
+        conn.upsert_rows(US_Consumers.name(), [{"year": 2000, "month": 1, "expectations_index": 1.0}])
+    cache = ReadCache()
+    Metrics.reset()
+
+    assert len(cache.read(engine, US_Consumers.name())) == 1
+    cached = cache.read(engine, US_Consumers.name())
+    cached.loc[0, "expectations_index"] = 9.0  # callers own their copy
+    assert cache.read(engine, US_Consumers.name())["expectations_index"].tolist() == [1.0]
+
+    with DBConnection() as conn:  # a write through another connection bumps the table version
+        conn.upsert_rows(US_Consumers.name(), [{"year": 2000, "month": 2, "expectations_index": 2.0}])
+    assert cache.read(engine, US_Consumers.name())["expectations_index"].tolist() == [1.0, 2.0]
+
+    assert Metrics._counters[("read_cache_misses", US_Consumers.name())] == 2
+    assert Metrics._counters[("read_cache_hits", US_Consumers.name())] == 2
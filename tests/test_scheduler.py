@@ -0,0 +1,62 @@
+from datetime import date
+
+import sqlalchemy as db
+
+import lisa.common.db_connection as db_connection
+import lisa.scrapers.scheduler as scheduler
+from lisa.database_model import US_Man_Pmi_Report
+from lisa.scrapers import IsmReport
+
+
+class _Loaded:
+    def load(self, background: bool = False) -> None:
+        pass
+
+
+def test_empty_ism_table_downloads_latest_report(tmp_path, monkeypatch):
+    engine = db.create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(db_connection, "ENGINE", engine)
+    US_Man_Pmi_Report.__table__.create(engine)
+
+    urls = []
+    monkeypatch.setattr(scheduler.IsmReport, "download_manufacturing", lambda url=None: urls.append(url) or _Loaded())
+    monkeypatch.setattr(scheduler.Maintenance, "run", lambda self, **kwargs: None)
+
+    calendar = {"ism_manufacturing": scheduler.RELEASE_CALENDAR["ism_manufacturing"]}
+    outcomes = scheduler.ReleaseScheduler(calendar).run()
+
+    assert outcomes == {"ism_manufacturing": "loaded"}
+    assert urls == [None]
+
+
+class _Report:
+    def __init__(self, year: int, month: int) -> None:
+        self.year, self.month = year, month
+        self.loaded = False
+
+    def load(self, background: bool = False) -> None:
+        self.loaded = True
+
+
+def test_last_years_ism_report_is_not_loaded(tmp_path, monkeypatch):
+    engine = db.create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(db_connection, "ENGINE", engine)
+    US_Man_Pmi_Report.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(db.insert(US_Man_Pmi_Report.__table__), [{"year": 2025, "month": 2}])
+
+    report = _Report(2024, 3)  # the March page still holds last year's report
+    monkeypatch.setattr(scheduler.IsmReport, "download_manufacturing", lambda url=None: report)
+    monkeypatch.setattr(scheduler.Maintenance, "run", lambda self, **kwargs: None)
+
+    calendar = {"ism_manufacturing": scheduler.RELEASE_CALENDAR["ism_manufacturing"]}
+    outcomes = scheduler.ReleaseScheduler(calendar).run(today=date(2025, 4, 2), force=True)
+
+    assert outcomes == {"ism_manufacturing": "no new data"}
+    assert not report.loaded
+
+
+def test_failed_ism_download_returns_none(monkeypatch):
+    monkeypatch.setattr(IsmReport, "_main", classmethod(lambda cls, url=None: None))
+    assert IsmReport.download_manufacturing("https://www.ismworld.org/report/march/") is None
+    assert IsmReport.download_services() is None
@@ -0,0 +1,20 @@
+import numpy as np
+from bs4 import BeautifulSoup
+
+from lisa.scrapers.utils import custom_table_to_df
+
+TABLE = (
+    "<table><tr><th>Index</th><th>Value</th><th>Direction</th><th>Trend</th></tr>"
+    "<tr><td>PMI*</td><td>48.5</td><td>Growing</td><td>3</td></tr>"
+    "<tr><td>Prices</td><td></td><td></td><td>n/a</td></tr></table>"
+)
+
+
+def test_empty_cells_are_nan_in_numeric_and_none_in_text_columns():
+    df = custom_table_to_df(BeautifulSoup(TABLE, "html.parser").find_all("table"))
+
+    assert list(df.index) == ["PMI", "Prices"]
+    value, direction, trend = (df.iloc[:, i] for i in range(3))
+    assert value.dtype == "float64" and np.isnan(value["Prices"])
+    assert direction.tolist() == ["Growing", None]
+    assert trend.tolist() == [3.0, "n/a"]
@@ -0,0 +1,13 @@
+from lisa.analysis import StockScreener
+from lisa.common import DBConnection
+from lisa.database_model import Finviz_Stocks
+
+
+def test_finviz_stocks_commit_invalidates_screener(stocks):
+    screener = StockScreener()
+    assert screener.count() == 40
+
+    with DBConnection() as conn:
+        conn._connection.exec_driver_sql("DELETE FROM Finviz_Stocks WHERE ticker = 'T00'")
+        conn.mark_changed(Finviz_Stocks.name())
+    assert screener.count() == 39
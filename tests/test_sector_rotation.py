@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sqlalchemy as db
+
+from lisa.analysis import SectorRotation
+from lisa.analysis.sector_rotation import MAN_SECTOR_INDUSTRIES, SER_SECTOR_INDUSTRIES
+from lisa.database_model import (
+    Finviz_Industries,
+    GICS_Industries,
+    GICS_Sectors,
+    Sector_Rotation,
+    US_Man_Industry_Ranking,
+    US_Ser_Industry_Ranking,
+)
+
+BASE = 2015 * 12
+RANKINGS = (US_Man_Industry_Ranking, US_Ser_Industry_Ranking)
+
+
+def _rank_rows(table: type, months: range, rng: np.random.Generator) -> list[dict]:
+    columns = [c for c in table.columns() if c not in ("year", "month")]
+    return [{"year": m // 12, "month": m % 12 + 1, **{c: int(rng.integers(-17, 18)) for c in columns}} for m in months]
+
+
+def _set_performance(engine, value: float) -> None:
+    with engine.begin() as connection:
+        connection.execute(db.update(Finviz_Industries.__table__).values(perf_month_pct=value))
+
+
+@pytest.fixture
+def rankings(engine):
+    metadata = db.MetaData()  # the models have a declarative base each; the foreign keys resolve in one metadata
+    for model in (GICS_Sectors, GICS_Industries, Finviz_Industries, *RANKINGS):
+        model.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+
+    industries = sorted({i for m in (MAN_SECTOR_INDUSTRIES, SER_SECTOR_INDUSTRIES) for v in m.values() for i in v})
+    rng = np.random.default_rng(0)
+    with engine.begin() as connection:
+        connection.execute(db.insert(GICS_Sectors.__table__), [{"id": 1, "sector": "Sector"}])
+        connection.execute(
+            db.insert(GICS_Industries.__table__),
+            [{"id": i + 1, "industry": name, "sector_id": 1} for i, name in enumerate(industries)],
+        )
+        connection.execute(
+            db.insert(Finviz_Industries.__table__), [{"gics_industry_id": i + 1} for i in range(len(industries))]
+        )
+        for table in RANKINGS:
+            connection.execute(db.insert(table.__table__), _rank_rows(table, range(BASE, BASE + 24), rng))
+    return engine
+
+
+def test_performance_is_stored_with_the_latest_month_only(rankings):
+    _set_performance(rankings, 1.0)
+    SectorRotation().refresh()
+    stored = pd.read_sql_table(Sector_Rotation.name(), rankings)
+    latest = (stored["year"] == 2016) & (stored["month"] == 12)
+    assert (stored.loc[latest, "perf_month_pct"] == 1.0).all()
+    assert stored.loc[~latest, "perf_month_pct"].isna().all()
+
+    # A new month takes the new snapshot; the previous latest month keeps its own
+    with rankings.begin() as connection:
+        for table in RANKINGS:
+            connection.execute(db.insert(table.__table__), _rank_rows(table, [BASE + 24], np.random.default_rng(1)))
+    _set_performance(rankings, 2.0)
+    SectorRotation().refresh(full=True)
+    stored = pd.read_sql_table(Sector_Rotation.name(), rankings)
+    by_month = stored.groupby(["year", "month"])["perf_month_pct"].agg(["min", "max"])
+    assert by_month.loc[(2017, 1)].tolist() == [2.0, 2.0]
+    assert by_month.loc[(2016, 12)].tolist() == [1.0, 1.0]
+    assert by_month.drop([(2017, 1), (2016, 12)]).isna().all().all()
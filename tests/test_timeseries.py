@@ -0,0 +1,63 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from lisa.analysis import TimeSeriesStore
+from lisa.common import DBConnection, Metrics
+from lisa.database_model import US_Consumers
+
+BASE = 2000 * 12
+MONTHS = [*range(BASE, BASE + 6), *range(BASE + 9, BASE + 14)]  # 2000-01 to 2000-06, then 2000-10 to 2001-02
+
+
+@pytest.fixture
+def store(write_months):
+    write_months(US_Consumers, MONTHS)
+    return TimeSeriesStore()
+
+
+@pytest.mark.parametrize("start", ["2000-03", (2000, 3), date(2000, 3, 15), pd.Period("2000-03", "M")])
+def test_ranges_are_inclusive_in_any_month_format(store, start):
+    df = store.frame(US_Consumers, start=start, end=(2000, 11))
+    assert df.index.strftime("%Y-%m").tolist() == ["2000-03", "2000-04", "2000-05", "2000-06", "2000-10", "2000-11"]
+
+
+def test_slices_match_the_stored_rows(store):
+    whole = store.frame(US_Consumers.name())
+    assert isinstance(whole.index, pd.PeriodIndex) and len(whole) == len(MONTHS)
+    with DBConnection() as conn:
+        stored = conn.df_from_sql(US_Consumers.name()).sort_values(["year", "month"])
+    assert whole["expectations_index"].tolist() == stored["expectations_index"].tolist()
+
+    series = store.series(US_Consumers, "expectations_index", start="2000-06", end="2000-10")
+    pd.testing.assert_series_equal(series, whole["expectations_index"].loc["2000-06":"2000-10"])
+    assert store.frame(US_Consumers, start="2000-07", end="2000-09").empty
+
+
+def test_timestamps_index(store):
+    index = store.index(US_Consumers, end="2000-02", timestamps=True)
+    assert index.tolist() == [pd.Timestamp("2000-01-01"), pd.Timestamp("2000-02-01")]
+
+
+def test_months_are_decoded_again_after_a_write(store, write_months):
+    Metrics.reset()
+    store.index(US_Consumers)
+    store.index(US_Consumers, start="2000-05")
+    write_months(US_Consumers, [BASE + 7])
+
+    assert store.index(US_Consumers, start="2000-05", end="2000-10").strftime("%Y-%m").tolist() == [
+        "2000-05",
+        "2000-06",
+        "2000-08",
+        "2000-10",
+    ]
+    assert Metrics._counters[("cache_misses", "TimeSeriesStore")] == 2
+    assert Metrics._counters[("cache_hits", "TimeSeriesStore")] == 1
+
+
+def test_unknown_tables_and_columns(store):
+    with pytest.raises(KeyError):
+        store.frame("Finviz_Stocks")
+    with pytest.raises(KeyError):
+        store.frame(US_Consumers, ["no_such_column"])
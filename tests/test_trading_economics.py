@@ -0,0 +1,20 @@
+from types import SimpleNamespace
+
+from lisa.common import WebSession
+from lisa.scrapers import TradingEconomics
+from lisa.scrapers.trading_economics import URL_COMMODITIES
+
+PAGE = "<table><tr><th>Major</th><th>Price</th><th>Day</th><th>%</th></tr><tr><td>AAA</td><td>1,234.5</td><td>1</td><td>0.5%</td></tr></table>"
+
+
+def test_download_all_parses_in_worker_processes(monkeypatch):
+    def get(self, url, headers=None):
+        return None if url == URL_COMMODITIES else SimpleNamespace(text=PAGE, ok=True)
+
+    monkeypatch.setattr(WebSession, "get", get)
+    assets = TradingEconomics.download_all()
+
+    assert assets["commodities"] is None
+    for name in ("stocks", "bonds", "currencies", "crypto"):
+        table = assets[name].table
+        assert table["Price"].tolist() == [1234.5] and table["Day %"].tolist() == [0.5]
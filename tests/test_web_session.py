@@ -0,0 +1,32 @@
+import threading
+from types import SimpleNamespace
+
+import requests
+
+from lisa.common import WebSession
+
+
+def test_renewed_session_closes_after_requests_in_flight(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    closed = []
+
+    def request(self, method, url, headers=None, timeout=None):
+        if url.endswith("/slow"):
+            started.set()
+            release.wait(5)
+        return SimpleNamespace(ok=True, content=b"x", raw=None, status_code=200)
+
+    monkeypatch.setattr(requests.Session, "request", request)
+    monkeypatch.setattr(requests.Session, "close", lambda self: closed.append(self))
+
+    with WebSession(session_renewal_interval=1) as session:
+        first = session._session
+        slow = threading.Thread(target=session.get, args=("https://example.com/slow",))
+        slow.start()
+        started.wait(5)
+        assert session.get("https://example.com/fast") is not None  # renews the session
+        assert session._session is not first and first not in closed  # still used by the slow request
+
+        release.set()
+        slow.join(5)
+        assert closed[0] is first  # (the slow request's own success renews the session again)
@@ -0,0 +1,44 @@
+import pytest
+
+from lisa.common import DBConnection, Metrics, TableWrite, WriteBehindLoader
+from lisa.database_model import EU_Economic_Sentiment, EU_Economic_Sentiment_Long, US_Consumers
+
+
+def test_background_load_is_timed_until_written(eu_survey):
+    Metrics.reset()
+
+    future = eu_survey(3).load(storage="both", background=True)
+    n_rows = future.result()
+    WriteBehindLoader.default().flush()
+
+    n_columns = len(EU_Economic_Sentiment.column_map()) - 2
+    assert n_rows == 3 + 3 * n_columns
+    load = Metrics.summary().set_index(["source", "stage"]).loc[("EuroSurvey", "load")]
+    assert load["runs"] == 1 and load["errors"] == 0 and load["rows"] == n_rows
+    with DBConnection() as conn:
+        assert len(conn.df_from_sql(EU_Economic_Sentiment.name())) == 3
+        assert len(conn.df_from_sql(EU_Economic_Sentiment_Long.name())) == 3 * n_columns
+
+
+def test_failing_batch_is_rolled_back_alone(engine):
+    with DBConnection() as conn:
+        conn.ensure_table(US_Consumers)
+    Metrics.reset()
+    loader = WriteBehindLoader(linger=0.5)  # the three batches are applied in one transaction
+    try:
+        first = loader.submit(TableWrite(US_Consumers.name(), [{"year": 2000, "month": 1, "expectations_index": 1.0}]))
+        bad = loader.submit(
+            TableWrite(US_Consumers.name(), [{"year": 2000, "month": 2, "expectations_index": 2.0}]),
+            TableWrite(US_Consumers.name(), [{"year": 2000, "month": 13, "expectations_index": 3.0}]),
+        )
+        last = loader.submit(TableWrite(US_Consumers.name(), [{"year": 2000, "month": 3, "expectations_index": 4.0}]))
+        loader.flush()
+    finally:
+        loader.close()
+
+    assert first.result() == 1 and last.result() == 1
+    with pytest.raises(ValueError):
+        bad.result()
+    assert Metrics.summary().set_index(["source", "stage"]).loc[("WriteBehindLoader", "write_behind"), "runs"] == 1
+    with DBConnection() as conn:
+        assert conn.df_from_sql(US_Consumers.name())["month"].tolist() == [1, 3]